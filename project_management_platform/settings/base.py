@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -45,11 +46,16 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "task_manager.middleware.MetricsMiddleware",
+    "task_manager.middleware.ServerTimingMiddleware",
+    "task_manager.middleware.ProfilingMiddleware",
+    "task_manager.middleware.NPlusOneMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "task_manager.middleware.TimezoneMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -127,6 +133,75 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 # Assets Management
 ASSETS_ROOT = "/static/assets"
 
+# Cache
+# The default in-memory cache is per process, production uses a cache shared by all server processes
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+PROJECT_STATS_CACHE_TIMEOUT = 60 * 60
+DASHBOARD_CACHE_TIMEOUT = 15 * 60
+DASHBOARD_SECTION_SIZE = 20
+TASK_FACETS_CACHE_TIMEOUT = 60 * 60
+
+# Worker autocomplete
+AUTOCOMPLETE_LIMIT = 20
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+# Worker deactivation
+# Maximum number of rows changed in one transaction, see task_manager.deactivation
+DEACTIVATION_CHUNK_SIZE = 1000
+
+# Task archive, see task_manager.archive
+TASK_ARCHIVE_AFTER_DAYS = 90
+TASK_ARCHIVE_BATCH_SIZE = 1000
+
+# Request instrumentation
+# Share of requests that get Server-Timing measurements, from 0 to 1
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", 0.05))
+# Whether the measurements are sent to every client in the Server-Timing header, staff users always get it
+SERVER_TIMING_HEADER = False
+
+# Prometheus metrics, every server process writes its values to its own file in METRICS_DIR
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(tempfile.gettempdir(), "project_management_platform_metrics"))
+METRICS_FLUSH_INTERVAL = 1
+METRICS_ALLOWED_IPS = os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+# The test runner writes the metrics of the test run to a temporary directory
+TEST_RUNNER = "task_manager.test_runner.TestRunner"
+
+# Request profiles, taken for requests with the PROFILING_TOKEN in the X-Profile-Token header
+# and for a share of all requests, from 0 to 1
+PROFILING_DIR = os.environ.get(
+    "PROFILING_DIR", os.path.join(tempfile.gettempdir(), "project_management_platform_profiles")
+)
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN")
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+PROFILING_TRACEMALLOC = os.environ.get("PROFILING_TRACEMALLOC") == "True"
+PROFILING_TRACEMALLOC_TOP = 20
+PROFILING_MAX_PROFILES = int(os.environ.get("PROFILING_MAX_PROFILES", 1000))
+
+# Detection of statements repeated more than NPLUSONE_THRESHOLD times in a request,
+# reported with the "log", "warn" or "raise" NPLUSONE_MODE, off when empty
+NPLUSONE_MODE = os.environ.get("NPLUSONE_MODE", "")
+NPLUSONE_THRESHOLD = int(os.environ.get("NPLUSONE_THRESHOLD", 5))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "task_manager": {
+            "handlers": ["console"],
+            "level": os.environ.get("TASK_MANAGER_LOG_LEVEL", "WARNING"),
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
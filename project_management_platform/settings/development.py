@@ -11,6 +11,11 @@ DATABASES = {
     }
 }
 
+# Request instrumentation
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", 1))
+SERVER_TIMING_HEADER = True
+NPLUSONE_MODE = os.environ.get("NPLUSONE_MODE", "warn")
+
 # Security
 SECURE_SSL_REDIRECT = False
 SESSION_COOKIE_SECURE = False
@@ -26,6 +26,20 @@ DATABASES = {
     ),
 }
 
+# Cache
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "CACHE_DIR", os.path.join(tempfile.gettempdir(), "project_management_platform_cache")
+        ),
+    }
+}
+
+# Request instrumentation
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", 0.05))
+LOGGING["loggers"]["task_manager"]["level"] = os.environ.get("TASK_MANAGER_LOG_LEVEL", "INFO")
+
 # Security
 SECURE_SSL_REDIRECT = os.environ.get("DJANGO_SECURE_SSL_REDIRECT", default=True)
 SESSION_COOKIE_SECURE = True
@@ -0,0 +1,103 @@
+/*
+ * Worker autocomplete for the <select data-autocomplete-url> pickers rendered by WorkerAutocompleteField.
+ * The select only holds the selected workers and is submitted as is. Other workers are searched
+ * for with the worker-autocomplete endpoint and added to it when picked.
+ */
+"use strict";
+document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("select[data-autocomplete-url]").forEach(function (select) {
+        const url = new URL(select.dataset.autocompleteUrl, window.location.origin);
+        const input = document.createElement("input");
+        const results = document.createElement("div");
+        const selected = document.createElement("div");
+        let timer = null;
+        let next = null;
+
+        input.type = "search";
+        input.className = "form-control";
+        input.placeholder = "Search by name or position";
+        input.autocomplete = "off";
+        results.className = "list-group mt-1";
+        selected.className = "mb-2";
+        select.hidden = true;
+        select.after(selected, input, results);
+
+        function renderSelected() {
+            selected.replaceChildren();
+            Array.from(select.selectedOptions).forEach(function (option) {
+                const badge = document.createElement("button");
+                badge.type = "button";
+                badge.className = "btn btn-sm btn-gray-200 me-2 mb-2";
+                badge.textContent = option.textContent + " ×";
+                badge.addEventListener("click", function () {
+                    option.remove();
+                    renderSelected();
+                });
+                selected.append(badge);
+            });
+        }
+
+        function pick(worker) {
+            if (!select.multiple) {
+                select.replaceChildren();
+            }
+            if (!select.querySelector(`option[value="${worker.id}"]`)) {
+                select.append(new Option(worker.name, worker.id, true, true));
+            }
+            input.value = "";
+            results.replaceChildren();
+            renderSelected();
+        }
+
+        function addResults(page) {
+            page.results.forEach(function (worker) {
+                const item = document.createElement("button");
+                item.type = "button";
+                item.className = "list-group-item list-group-item-action";
+                item.textContent = worker.position ? `${worker.name} · ${worker.position}` : worker.name;
+                item.addEventListener("click", function () {
+                    pick(worker);
+                });
+                results.append(item);
+            });
+            next = page.next;
+        }
+
+        function search(cursor) {
+            const params = new URLSearchParams(url.search);
+            params.set("q", input.value);
+            if (cursor) {
+                params.set("cursor", cursor);
+            }
+            return fetch(`${url.pathname}?${params}`, {credentials: "same-origin"}).then(function (response) {
+                return response.json();
+            });
+        }
+
+        input.addEventListener("input", function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                if (!input.value.trim()) {
+                    results.replaceChildren();
+                    return;
+                }
+                search(null).then(function (page) {
+                    results.replaceChildren();
+                    addResults(page);
+                });
+            }, 200);
+        });
+
+        results.addEventListener("scroll", function () {
+            if (next && results.scrollTop + results.clientHeight >= results.scrollHeight - 10) {
+                const cursor = next;
+                next = null;
+                search(cursor).then(addResults);
+            }
+        });
+        results.style.maxHeight = "15rem";
+        results.style.overflowY = "auto";
+
+        renderSelected();
+    });
+});
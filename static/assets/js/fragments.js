@@ -0,0 +1,29 @@
+/*
+ * On-demand loading of the paginated lists of the detail pages. A [data-fragment-more] element holds
+ * a link to an HTML fragment with the next page of the list and is replaced by it when the link is clicked,
+ * or right away when the element has the data-autoload attribute.
+ */
+"use strict";
+document.addEventListener("DOMContentLoaded", function () {
+    function load(element) {
+        const link = element.querySelector("a");
+        link.classList.add("disabled");
+        fetch(link.href, {credentials: "same-origin"}).then(function (response) {
+            return response.text();
+        }).then(function (html) {
+            const template = document.createElement("template");
+            template.innerHTML = html;
+            element.replaceWith(template.content);
+        });
+    }
+
+    document.addEventListener("click", function (event) {
+        const element = event.target.closest("[data-fragment-more]");
+        if (element && event.target.closest("a")) {
+            event.preventDefault();
+            load(element);
+        }
+    });
+
+    document.querySelectorAll("[data-fragment-more][data-autoload]").forEach(load);
+});
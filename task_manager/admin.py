@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import Group
 
-from task_manager.models import Position, TaskType, Project, Task, Worker
+from task_manager.models import Position, TaskType, Project, Task, Worker, ArchivedTask
 
 admin.site.unregister(Group)
 
@@ -20,6 +20,7 @@ class WorkerAdmin(UserAdmin):
             "Additional info", {
                 "fields": (
                     "position",
+                    "timezone",
                 )
             }
         ),
@@ -58,3 +59,18 @@ class TaskAdmin(admin.ModelAdmin):
     )
     search_fields = ("name", "author", "responsible")
     list_filter = ("is_completed", "status", "task_type")
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "task_type",
+        "status",
+        "closed_time",
+        "archived_time",
+        "author",
+        "responsible"
+    )
+    search_fields = ("name",)
+    list_filter = ("status", "task_type")
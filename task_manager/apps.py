@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class TaskManagerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "task_manager"
+
+    def ready(self):
+        from task_manager import batching, signals  # noqa: F401
+
+        for model_name in ("Worker", "Project", "Task"):
+            batching.install(self.get_model(model_name))
@@ -0,0 +1,104 @@
+"""
+Cold archive of the tasks closed more than TASK_ARCHIVE_AFTER_DAYS days ago.
+
+Archived tasks are moved with their followers from the task tables to ArchivedTask and ArchivedTaskFollower,
+keeping their ids, so the live tables only hold the open and recently closed tasks. Every batch of at most
+`batch_size` tasks is copied and deleted in its own transaction, so an interrupted run is resumed
+by running it again.
+
+Archived tasks are still shown on the task page and found by the task archive search. Project progress and
+project statistics count them, so moving tasks in and out of the archive doesn't change them. A status
+change that re-activates an archived task restores it first, see change_status().
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from task_manager import dashboard, transitions
+from task_manager.deactivation import get_chunks
+from task_manager.models import ArchivedTask, ArchivedTaskFollower, Task
+
+# The columns copied between Task and ArchivedTask, which has all the columns of Task.
+TASK_FIELDS = [field.attname for field in Task._meta.concrete_fields]
+
+
+def get_archivable(days=None):
+    cutoff = timezone.now() - datetime.timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS if days is None else days)
+    return Task.objects.filter(is_completed=True, closed_time__lt=cutoff)
+
+
+def archive(days=None, batch_size=None):
+    """Move the tasks closed more than `days` days ago to the archive. Returns the number of archived tasks."""
+    archivable = get_archivable(days)
+    archived = 0
+    for ids in get_chunks(archivable, batch_size or settings.TASK_ARCHIVE_BATCH_SIZE):
+        archived += archive_batch(archivable.filter(id__in=ids))
+    return archived
+
+
+def archive_batch(tasks):
+    with transaction.atomic():
+        rows = list(tasks.select_for_update().values(*TASK_FIELDS))
+        ids = [row["id"] for row in rows]
+        if not ids:
+            return 0
+        ArchivedTask.objects.bulk_create([ArchivedTask(**row) for row in rows])
+        followings = Task.followers.through.objects.filter(task_id__in=ids)
+        ArchivedTaskFollower.objects.bulk_create([
+            ArchivedTaskFollower(task_id=task_id, worker_id=worker_id)
+            for task_id, worker_id in followings.values_list("task_id", "worker_id")
+        ])
+        # The followed tasks are counted by the task list filters.
+        dashboard.invalidate(followings.values("worker_id"))
+        followings.delete()
+        # The delete signals only clear the cached project statistics and dashboards,
+        # the project progress, which counts the archived tasks, is kept as it is.
+        Task.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def restore(task_ids):
+    """Move the archived tasks back to the task tables. Returns the number of restored tasks."""
+    with transaction.atomic():
+        archived = ArchivedTask.objects.select_for_update().filter(id__in=task_ids)
+        rows = list(archived.values(*TASK_FIELDS))
+        ids = [row["id"] for row in rows]
+        if not ids:
+            return 0
+        Task.objects.bulk_create([Task(**row) for row in rows])
+        # bulk_create() sets the `auto_now_add` creation time to the current time.
+        Task.objects.filter(id__in=ids).update(
+            created_time=Subquery(ArchivedTask.objects.filter(id=OuterRef("id")).values("created_time"))
+        )
+        followings = ArchivedTaskFollower.objects.filter(task_id__in=ids)
+        Task.followers.through.objects.bulk_create([
+            Task.followers.through(task_id=task_id, worker_id=worker_id)
+            for task_id, worker_id in followings.values_list("task_id", "worker_id")
+        ])
+        dashboard.invalidate(followings.values("worker_id"))
+        followings.delete()
+        ArchivedTask.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def change_status(task_id, status, user):
+    """
+    Apply a status transition to the task, live or archived. An archived task is restored first
+    when the worker may make the transition. Returns the number of changed tasks.
+    """
+    tasks = Task.objects.filter(id=task_id)
+    changed = transitions.apply(tasks, status, user)
+    if not changed:
+        archived_task = ArchivedTask.objects.filter(id=task_id).first()
+        if archived_task is not None and transitions.can_change(archived_task, status, user):
+            with transaction.atomic():
+                restore([task_id])
+                changed = transitions.apply(tasks, status, user)
+    return changed
+
+
+def exists(task_id):
+    return Task.objects.filter(id=task_id).exists() or ArchivedTask.objects.filter(id=task_id).exists()
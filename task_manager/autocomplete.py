@@ -0,0 +1,29 @@
+"""
+Prefix search of workers by first name, last name and position name.
+
+Every word of the query has to be a prefix of one of them. A prefix is matched as a range
+[prefix, next prefix) on the lowercased column instead of LIKE, so it's served by the
+Lower() expression indexes of Worker and Position on every database.
+"""
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from task_manager.models import Position
+
+
+def prefix_range(prefix):
+    """Return the half-open range of the strings starting with the prefix."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def search_workers(queryset, query):
+    queryset = queryset.alias(first_name_lower=Lower("first_name"), last_name_lower=Lower("last_name"))
+    for word in query.lower().split():
+        start, end = prefix_range(word)
+        positions = Position.objects.alias(name_lower=Lower("name")).filter(name_lower__gte=start, name_lower__lt=end)
+        queryset = queryset.filter(
+            Q(first_name_lower__gte=start, first_name_lower__lt=end)
+            | Q(last_name_lower__gte=start, last_name_lower__lt=end)
+            | Q(position__in=positions)
+        )
+    return queryset
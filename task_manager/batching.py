@@ -0,0 +1,104 @@
+"""
+Opt-in batch loading of relations, in the style of a dataloader.
+
+The objects of a `queryset.batch_load()` result set know each other. The first time a foreign key
+or a many-to-many relation that wasn't selected or prefetched is read on one of them, the relation
+is prefetched for the whole result set in one query instead of one query per object:
+
+    tasks = Task.objects.filter(followers=user).batch_load()
+    for task in tasks:
+        task.project  # one query for the projects of all tasks, on the first iteration only
+"""
+from django.db.models import QuerySet, prefetch_related_objects
+from django.db.models.fields.related_descriptors import ForwardManyToOneDescriptor, ManyToManyDescriptor
+
+
+class BatchPeers(list):
+    """The objects of a result set, with the names of the relations being loaded for them."""
+
+    def __init__(self, objects):
+        super().__init__(objects)
+        self.loading = set()
+
+    def load(self, name, objects, get_related):
+        """
+        Prefetch the relation for the objects. The loaded related objects become a result set of their own,
+        so relations read on them are batched too.
+        """
+        # prefetch_related_objects() reads the relation of the first object itself, don't load it twice.
+        if name in self.loading or not objects:
+            return
+        self.loading.add(name)
+        try:
+            prefetch_related_objects(objects, name)
+        finally:
+            self.loading.discard(name)
+
+        related = {id(obj): obj for peer in objects for obj in get_related(peer) if obj is not None}
+        mark_peers(related.values())
+
+
+def mark_peers(objects):
+    peers = BatchPeers(objects)
+    if len(peers) > 1:
+        for obj in peers:
+            obj._batch_peers = peers
+
+
+class BatchLoadingQuerySet(QuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._batch_load = False
+
+    def batch_load(self):
+        """Load the relations read on any object of the result set for all of its objects at once."""
+        clone = self._chain()
+        clone._batch_load = True
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._batch_load = self._batch_load
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is None
+        super()._fetch_all()
+        if fetched and self._batch_load:
+            mark_peers(obj for obj in self._result_cache if isinstance(obj, self.model))
+
+
+class BatchLoadingForeignKeyDescriptor(ForwardManyToOneDescriptor):
+    def __get__(self, instance, cls=None):
+        if instance is not None and not self.is_cached(instance):
+            peers = getattr(instance, "_batch_peers", None)
+            if peers:
+                peers.load(
+                    self.field.name,
+                    [peer for peer in peers if not self.is_cached(peer)],
+                    lambda peer: [self.field.get_cached_value(peer, default=None)]
+                )
+        return super().__get__(instance, cls)
+
+
+class BatchLoadingManyToManyDescriptor(ManyToManyDescriptor):
+    def __get__(self, instance, cls=None):
+        if instance is not None:
+            peers = getattr(instance, "_batch_peers", None)
+            name = self.field.name
+            if peers and name not in getattr(instance, "_prefetched_objects_cache", {}):
+                peers.load(
+                    name,
+                    [peer for peer in peers if name not in getattr(peer, "_prefetched_objects_cache", {})],
+                    lambda peer: peer._prefetched_objects_cache[name]
+                )
+        return super().__get__(instance, cls)
+
+
+def install(model):
+    """Replace the descriptors of the forward foreign keys and many-to-many fields of the model."""
+    for field in model._meta.fields:
+        if field.many_to_one:
+            setattr(model, field.name, BatchLoadingForeignKeyDescriptor(field))
+    for field in model._meta.many_to_many:
+        setattr(model, field.name, BatchLoadingManyToManyDescriptor(field.remote_field, reverse=False))
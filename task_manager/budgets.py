@@ -0,0 +1,39 @@
+"""
+Maximum number of SQL queries a single request to a task_manager route may run,
+including the session and user lookups of the authentication middleware.
+Budgets are checked by the benchmark_views command and by tests/test_query_counts.py,
+which also makes sure the counts don't grow with the number of rows. Lower them when a view gets cheaper.
+"""
+
+QUERY_BUDGETS = {
+    "task_manager:index": 8,
+    "task_manager:worker-list": 4,
+    "task_manager:worker-autocomplete": 3,
+    "task_manager:worker-detail": 6,
+    "task_manager:worker-create": 3,
+    "task_manager:worker-update": 3,
+    "task_manager:worker-delete": 3,
+    "task_manager:worker-deactivate": 4,
+    "task_manager:position-list": 4,
+    "task_manager:position-create": 2,
+    "task_manager:position-update": 3,
+    "task_manager:position-delete": 3,
+    "task_manager:task-type-list": 4,
+    "task_manager:task-type-create": 2,
+    "task_manager:task-type-update": 3,
+    "task_manager:task-type-delete": 3,
+    "task_manager:project-list": 3,
+    "task_manager:project-detail": 4,
+    "task_manager:project-participants": 4,
+    "task_manager:project-tasks": 3,
+    "task_manager:project-create": 2,
+    "task_manager:project-update": 5,
+    "task_manager:project-delete": 3,
+    "task_manager:task-list": 4,
+    "task_manager:task-export": 3,
+    "task_manager:task-archive": 3,
+    "task_manager:task-detail": 3,
+    "task_manager:task-followers": 4,
+    "task_manager:task-create": 5,
+    "task_manager:task-update": 9,
+}
@@ -0,0 +1,120 @@
+"""
+Bulk actions on the tasks selected in the task list.
+
+Every action is one set-based statement whatever the number of tasks: an UPDATE of the tasks,
+or one insert into or delete from the followers table. The permission check is a part of the statement,
+so the tasks the worker may not change are skipped instead of being read and checked one by one.
+Bulk statements send no signals, the project progress, the project statistics and the dashboards
+are refreshed here.
+"""
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+
+from task_manager import dashboard, progress, project_stats, transitions
+from task_manager.models import Project, ProjectProgress, Task
+
+
+def get_editable(tasks, user):
+    """The tasks of the queryset the worker may edit: the open tasks they created, as on the task update page."""
+    return tasks.filter(author=user, is_completed=False)
+
+
+def get_project_ids(tasks):
+    return tasks.order_by().values_list("project_id", flat=True).distinct()
+
+
+def change_status(tasks, user, status):
+    return transitions.apply(tasks, status, user)
+
+
+def change_deadline(tasks, user, deadline):
+    with transaction.atomic():
+        changed = get_editable(tasks, user).update(deadline=deadline)
+        if changed:
+            project_stats.invalidate(get_project_ids(tasks))
+            dashboard.invalidate_participants(tasks)
+    return changed
+
+
+def change_responsible(tasks, user, responsible):
+    """Hand the tasks over to the worker. Tasks of projects the worker doesn't take part in are skipped."""
+    with transaction.atomic():
+        # The previous responsibles, before the tasks leave their dashboards.
+        dashboard.invalidate_participants(tasks)
+        changed = get_editable(tasks, user).filter(
+            Exists(Project.assignees.through.objects.filter(project_id=OuterRef("project_id"), worker=responsible))
+        ).update(responsible=responsible)
+        if changed:
+            # The responsible of a task always follows it.
+            follow(
+                (task_id, project_id, responsible.id)
+                for task_id, project_id in tasks.filter(responsible=responsible).values_list("id", "project_id")
+            )
+            progress.recount(tasks, [responsible.id])
+            project_stats.invalidate(get_project_ids(tasks))
+            dashboard.invalidate([responsible.id])
+    return changed
+
+
+def add_followers(tasks, user, workers):
+    """
+    Make the workers follow the tasks, the workers who don't take part in the project of a task are skipped.
+    Returns the number of tasks that got followers.
+    """
+    worker_ids = [worker.id for worker in workers]
+    with transaction.atomic():
+        added = follow(
+            get_editable(tasks, user).filter(project__assignees__in=worker_ids).order_by().values_list(
+                "id", "project_id", "project__assignees"
+            )
+        )
+        if added:
+            progress.recount(tasks, worker_ids)
+            dashboard.invalidate(worker_ids)
+    return added
+
+
+def follow(followings):
+    """
+    Insert the (task id, project id, worker id) followings in one statement, and the missing project
+    progress rows of the workers. Returns the number of tasks.
+    """
+    followings = list(followings)
+    Task.followers.through.objects.bulk_create(
+        [Task.followers.through(task_id=task_id, worker_id=worker_id) for task_id, _, worker_id in followings],
+        ignore_conflicts=True
+    )
+    ProjectProgress.objects.bulk_create(
+        [
+            ProjectProgress(project_id=project_id, worker_id=worker_id)
+            for project_id, worker_id in {(project_id, worker_id) for _, project_id, worker_id in followings}
+        ],
+        ignore_conflicts=True
+    )
+    return len({task_id for task_id, _, _ in followings})
+
+
+def remove_followers(tasks, user, workers):
+    """
+    Make the workers stop following the tasks, the author and the responsible of a task keep following it.
+    Returns the number of removed followings.
+    """
+    worker_ids = [worker.id for worker in workers]
+    with transaction.atomic():
+        removed, _ = Task.followers.through.objects.filter(
+            task__in=get_editable(tasks, user),
+            worker_id__in=worker_ids
+        ).exclude(worker_id=F("task__author_id")).exclude(worker_id=F("task__responsible_id")).delete()
+        if removed:
+            progress.recount(tasks, worker_ids)
+            dashboard.invalidate(worker_ids)
+    return removed
+
+
+ACTIONS = {
+    "status": change_status,
+    "responsible": change_responsible,
+    "deadline": change_deadline,
+    "add_followers": add_followers,
+    "remove_followers": remove_followers,
+}
@@ -0,0 +1,166 @@
+"""
+Cached dashboard of the home page: the open tasks of the worker that are overdue, due later today,
+due this week and due in the next 7 days, and the open tasks created by the worker due today.
+Every section holds at most DASHBOARD_SECTION_SIZE tasks, the numbers of tasks due today are counted
+by one aggregate query.
+
+Days and weeks are computed in the worker's time zone and turned into half-open [start, end)
+datetime ranges, so every section is a range scan on the deadline column of the partial
+(responsible, deadline) and (author, deadline) indexes of open tasks.
+
+The cache key holds the worker's dashboard version, the task type version, the time zone and the local
+date. The versions are kept in the cache too, signals increment the versions of the author, responsible
+and followers when a task changes and the global task type version when a task type changes (see
+task_manager.signals), so stale entries are never read again, and a new day starts with a new key.
+A version starts from the current time, so an evicted version never comes back with the value of
+an entry that is still cached. A cached value also expires when the nearest deadline of
+the tasks due later today passes, so the task moves to the overdue section.
+"""
+import datetime
+import time
+import zoneinfo
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from task_manager.models import Task
+
+DAY = datetime.timedelta(days=1)
+# Task type names are shown on every dashboard and in every task filter, task types change rarely.
+TASK_TYPE_VERSION_KEY = "task_manager:task-type-version"
+
+
+def get_local_now(user):
+    return timezone.localtime(timezone.now(), zoneinfo.ZoneInfo(user.timezone))
+
+
+def get_windows(local_now):
+    """Return the [start, end) datetime ranges of the dashboard sections, in the time zone of `local_now`."""
+    # Adding days to an aware datetime keeps the wall time, so every boundary is a local midnight
+    # even when a DST change falls inside the range.
+    today = datetime.datetime.combine(local_now.date(), datetime.time(), tzinfo=local_now.tzinfo)
+    tomorrow = today + DAY
+    monday = today - local_now.weekday() * DAY
+    return {
+        "today": (today, tomorrow),
+        "this_week": (monday, monday + 7 * DAY),
+        "next_7_days": (tomorrow, tomorrow + 7 * DAY),
+    }
+
+
+def get_section_querysets(user, local_now):
+    """Return the querysets of the dashboard sections, ordered by deadline."""
+    windows = get_windows(local_now)
+    open_tasks = Task.objects.filter(is_completed=False).select_related(
+        "project",
+        "author",
+        "responsible",
+        "task_type"
+    ).order_by("deadline", "id")
+    tasks_to_do = open_tasks.filter(responsible=user)
+
+    def due_in(queryset, window):
+        start, end = windows[window]
+        return queryset.filter(deadline__gte=start, deadline__lt=end)
+
+    return {
+        "overdue_tasks": tasks_to_do.filter(deadline__lt=local_now),
+        # The tasks due today that are overdue already are only in the overdue section.
+        "tasks_to_do": due_in(tasks_to_do, "today").filter(deadline__gte=local_now),
+        "tasks_this_week": due_in(tasks_to_do, "this_week"),
+        "tasks_next_7_days": due_in(tasks_to_do, "next_7_days"),
+        "tasks_created": due_in(open_tasks.filter(author=user), "today"),
+    }
+
+
+def version_key(worker_id):
+    return f"task_manager:dashboard-version:{worker_id}"
+
+
+def get_version(user):
+    return cache.get_or_set(version_key(user.id), time.time_ns, None)
+
+
+def get_task_type_version():
+    return cache.get_or_set(TASK_TYPE_VERSION_KEY, time.time_ns, None)
+
+
+def cache_key(user, day):
+    return (
+        f"task_manager:dashboard:{user.id}:{get_version(user)}:{get_task_type_version()}:"
+        f"{user.timezone}:{day.isoformat()}"
+    )
+
+
+def count_due_today(user, local_now):
+    """Count the tasks due later today of the worker and the tasks due today created by them, in one query."""
+    start, end = get_windows(local_now)["today"]
+    return Task.objects.filter(
+        Q(responsible=user) | Q(author=user),
+        is_completed=False,
+        deadline__gte=start,
+        deadline__lt=end
+    ).aggregate(
+        num_tasks_to_do=Count("id", filter=Q(responsible=user, deadline__gte=local_now)),
+        num_tasks_created=Count("id", filter=Q(author=user)),
+    )
+
+
+def compute(user, local_now):
+    size = settings.DASHBOARD_SECTION_SIZE
+    dashboard = {
+        name: list(queryset[:size])
+        for name, queryset in get_section_querysets(user, local_now).items()
+    }
+    dashboard.update(count_due_today(user, local_now))
+    # The tasks due later today are ordered by deadline, the first one is the next to become overdue.
+    dashboard["next_deadline"] = dashboard["tasks_to_do"][0].deadline if dashboard["tasks_to_do"] else None
+    return dashboard
+
+
+def get_timeout(dashboard, local_now):
+    tomorrow = get_windows(local_now)["today"][1]
+    expires = min(filter(None, (tomorrow, dashboard["next_deadline"])))
+    return min(settings.DASHBOARD_CACHE_TIMEOUT, int((expires - local_now).total_seconds()) + 1)
+
+
+def get_dashboard(user):
+    local_now = get_local_now(user)
+    key = cache_key(user, local_now.date())
+    dashboard = cache.get(key)
+    if dashboard is None or (dashboard["next_deadline"] and dashboard["next_deadline"] <= local_now):
+        dashboard = compute(user, local_now)
+        cache.set(key, dashboard, get_timeout(dashboard, local_now))
+    return dashboard
+
+
+def increment_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The version isn't cached, the next read starts a new one.
+        pass
+
+
+def invalidate(worker_ids):
+    """Make the cached dashboards of the workers stale, `worker_ids` may be a list or a subquery."""
+    for worker_id in get_user_model().objects.filter(id__in=worker_ids).values_list("id", flat=True):
+        increment_version(version_key(worker_id))
+
+
+def invalidate_task_types():
+    """Make the cached dashboards of all workers stale."""
+    increment_version(TASK_TYPE_VERSION_KEY)
+
+
+def invalidate_participants(tasks):
+    """Make the cached dashboards of the authors, responsibles and followers of the tasks of the queryset stale."""
+    followers = Task.followers.through.objects.filter(task__in=tasks).values("worker_id")
+    invalidate(
+        get_user_model().objects.filter(
+            Q(id__in=tasks.values("author_id")) | Q(id__in=tasks.values("responsible_id")) | Q(id__in=followers)
+        ).values("id")
+    )
@@ -0,0 +1,115 @@
+"""
+Deactivation of a worker: their open tasks are handed over to a replacement or to the authors
+of the projects, and they stop following tasks and taking part in projects.
+
+Every step is a set-based UPDATE or DELETE over chunks of at most `chunk_size` rows, each chunk in its own
+transaction, so a worker with many tasks never holds locks for long. Every step only selects the rows left
+to process, so an interrupted deactivation is finished by running it again.
+"""
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from task_manager import dashboard, progress, project_stats
+from task_manager.bulk_actions import follow, get_project_ids
+from task_manager.models import Project, ProjectProgress, Task
+
+
+class DeactivationResult(NamedTuple):
+    reassigned: int
+    unfollowed: int
+    unassigned: int
+
+
+def get_chunks(queryset, chunk_size):
+    """
+    Yield the ids of the rows of the queryset left to process, `chunk_size` at a time.
+    Processing a chunk must take its rows out of the queryset.
+    """
+    while ids := list(queryset.order_by("id").values_list("id", flat=True)[:chunk_size]):
+        yield ids
+
+
+def deactivate(worker, replacement=None, chunk_size=None):
+    """Deactivate the worker and hand their open tasks over to the replacement, or to the authors of the projects."""
+    if replacement is not None and replacement.id == worker.id:
+        raise ValueError("A worker can't replace themselves.")
+    chunk_size = chunk_size or settings.DEACTIVATION_CHUNK_SIZE
+    result = DeactivationResult(
+        reassign_tasks(worker, replacement, chunk_size),
+        unfollow_tasks(worker, chunk_size),
+        leave_projects(worker, chunk_size),
+    )
+    # The worker stays active until the work is done, so the deactivation page
+    # still finishes an interrupted deactivation.
+    worker.is_active = False
+    worker.save(update_fields=["is_active"])
+    dashboard.invalidate([worker.id])
+    return result
+
+
+def reassign_tasks(worker, replacement, chunk_size):
+    """
+    Hand the open tasks of the worker over to the replacement, who joins the projects of the tasks,
+    or to the author of the project of every task. Tasks of projects created by the worker are left
+    to them when there is no replacement.
+    """
+    open_tasks = Task.objects.filter(responsible=worker, is_completed=False)
+    if replacement is None:
+        open_tasks = open_tasks.exclude(project__author=worker)
+        new_responsible = Subquery(Project.objects.filter(id=OuterRef("project_id")).values("author_id"))
+    else:
+        new_responsible = replacement.id
+
+    reassigned = 0
+    for ids in get_chunks(open_tasks, chunk_size):
+        tasks = Task.objects.filter(id__in=ids)
+        with transaction.atomic():
+            reassigned += open_tasks.filter(id__in=ids).update(responsible=new_responsible)
+            if replacement is not None:
+                Project.assignees.through.objects.bulk_create(
+                    [
+                        Project.assignees.through(project_id=project_id, worker_id=replacement.id)
+                        for project_id in get_project_ids(tasks)
+                    ],
+                    ignore_conflicts=True
+                )
+            # The responsible of a task always follows it.
+            follow(tasks.values_list("id", "project_id", "responsible_id"))
+            progress.recount(tasks, tasks.values("responsible_id"))
+            project_stats.invalidate(get_project_ids(tasks))
+            dashboard.invalidate(tasks.values("responsible_id"))
+    return reassigned
+
+
+def unfollow_tasks(worker, chunk_size):
+    """Make the worker stop following tasks, except the ones they still are the author or the responsible of."""
+    followings = Task.followers.through.objects.filter(worker=worker).exclude(
+        task__author=worker
+    ).exclude(task__responsible=worker)
+
+    unfollowed = 0
+    for ids in get_chunks(followings, chunk_size):
+        with transaction.atomic():
+            removed, _ = Task.followers.through.objects.filter(id__in=ids).delete()
+            unfollowed += removed
+
+    progress.recount(
+        Task.objects.filter(project_id__in=ProjectProgress.objects.filter(worker=worker).values("project_id")),
+        [worker.id]
+    )
+    return unfollowed
+
+
+def leave_projects(worker, chunk_size):
+    """Remove the worker from the participants of the projects they didn't create."""
+    memberships = Project.assignees.through.objects.filter(worker=worker).exclude(project__author=worker)
+
+    unassigned = 0
+    for ids in get_chunks(memberships, chunk_size):
+        with transaction.atomic():
+            removed, _ = Project.assignees.through.objects.filter(id__in=ids).delete()
+            unassigned += removed
+    return unassigned
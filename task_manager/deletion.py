@@ -0,0 +1,41 @@
+"""
+Deletion eligibility of objects, computed in the query that loads them.
+
+An object can't be deleted while another row references it through a PROTECT or RESTRICT
+foreign key, and while it is the default value of a SET_DEFAULT foreign key.
+The references are read from the model relations, so new protecting foreign keys are picked up automatically.
+"""
+import operator
+from functools import lru_cache, reduce
+
+from django.db import models
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q, Value
+
+
+@lru_cache
+def deletion_blockers(model):
+    """Conditions that prevent the deletion of an object of the model, each one an Exists subquery or a Q."""
+    blockers = []
+    for relation in model._meta.related_objects:
+        if relation.on_delete in (models.PROTECT, models.RESTRICT):
+            references = relation.related_model._base_manager.filter(**{relation.field.name: OuterRef("pk")})
+            blockers.append(Exists(references))
+        elif relation.on_delete is models.SET_DEFAULT:
+            blockers.append(Q(pk=relation.field.get_default()))
+    return tuple(blockers)
+
+
+def annotate_can_be_deleted(queryset):
+    """Annotate every object of the queryset with a `can_be_deleted` boolean, without extra queries."""
+    blockers = deletion_blockers(queryset.model)
+    if not blockers:
+        return queryset.annotate(can_be_deleted=Value(True))
+    return queryset.annotate(
+        can_be_deleted=ExpressionWrapper(~reduce(operator.or_, map(Q, blockers)), output_field=BooleanField())
+    )
+
+
+def can_be_deleted(obj):
+    """Check a single object that is already loaded, in one query."""
+    queryset = annotate_can_be_deleted(type(obj)._base_manager.filter(pk=obj.pk))
+    return queryset.values_list("can_be_deleted", flat=True).get()
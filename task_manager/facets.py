@@ -0,0 +1,63 @@
+"""
+Facet counts of the task list filters: the number of tasks followed by the worker per task type,
+per completion state and per role of the worker.
+
+All of them are folded from a single GROUP BY query and cached per worker. The cache key holds
+the worker's dashboard version and the task type version, which signals increment when a followed task
+or a task type changes (see task_manager.signals and task_manager.dashboard), so a stale entry is never
+read again.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+
+from task_manager import dashboard
+from task_manager.models import Task
+
+ROLES = ("author", "responsible")
+
+
+def cache_key(user):
+    return f"task_manager:task-facets:{user.id}:{dashboard.get_version(user)}:{dashboard.get_task_type_version()}"
+
+
+def compute(user):
+    groups = (
+        Task.objects.filter(followers=user)
+        .order_by()
+        .annotate(**{
+            f"is_{role}": ExpressionWrapper(Q(**{f"{role}_id": user.id}), output_field=BooleanField())
+            for role in ROLES
+        })
+        .values("task_type_id", "task_type__name", "is_completed", *(f"is_{role}" for role in ROLES))
+        .annotate(count=Count("id"))
+    )
+
+    facets = {"task_type": Counter(), "is_completed": Counter(), "role": Counter()}
+    task_types = {}
+    for group in groups:
+        task_types[group["task_type_id"]] = group["task_type__name"]
+        facets["task_type"][group["task_type_id"]] += group["count"]
+        facets["is_completed"][group["is_completed"]] += group["count"]
+        for role in ROLES:
+            if group[f"is_{role}"]:
+                facets["role"][role] += group["count"]
+
+    facets["task_type_choices"] = sorted(task_types.items(), key=lambda item: item[1])
+    return facets
+
+
+def get_task_facets(user):
+    key = cache_key(user)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute(user)
+        cache.set(key, facets, settings.TASK_FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def label_choices(choices, counts):
+    """Append the count of every choice to its label."""
+    return [(value, f"{label} ({counts.get(value, 0)})") for value, label in choices]
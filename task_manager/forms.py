@@ -1,35 +1,42 @@
-from functools import partial
-from itertools import groupby
-from operator import attrgetter
-
-from django.forms.models import ModelChoiceIterator, ModelMultipleChoiceField
+import zoneinfo
+from urllib.parse import urlencode
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
 from django import forms
+from django.urls import reverse
 
 from task_manager.models import Worker, Position, TaskType, Project, Task
 
 
+def get_timezone_choices():
+    return [(name, name.replace("_", " ")) for name in sorted(zoneinfo.available_timezones())]
+
+
 class WorkerCreationForm(UserCreationForm):
+    timezone = forms.ChoiceField(choices=get_timezone_choices, initial="UTC")
+
     class Meta(UserCreationForm.Meta):
         model = Worker
         fields = UserCreationForm.Meta.fields + (
             "first_name",
             "last_name",
-            "position"
+            "position",
+            "timezone"
         )
 
 
 class WorkerChangeForm(UserChangeForm):
     password = None
+    timezone = forms.ChoiceField(choices=get_timezone_choices)
 
     class Meta(UserChangeForm.Meta):
         model = Worker
         fields = (
             "first_name",
             "last_name",
-            "email"
+            "email",
+            "timezone"
         )
 
 
@@ -45,73 +52,146 @@ class TaskTypeForm(forms.ModelForm):
         fields = "__all__"
 
 
-class GroupedModelChoiceIterator(ModelChoiceIterator):
-    def __init__(self, field, groupby):
-        self.groupby = groupby
-        super().__init__(field)
-
-    def __iter__(self):
-        if self.field.empty_label is not None:
-            yield ("", self.field.empty_label)
-        queryset = self.queryset
-        # Can't use iterator() when queryset uses prefetch_related()
-        if not queryset._prefetch_related_lookups:
-            queryset = queryset.iterator()
-        for group, objs in groupby(queryset, self.groupby):
-            yield (group, [self.choice(obj) for obj in objs])
-
-
-class GroupedModelMultipleChoiceField(ModelMultipleChoiceField):
-    def __init__(self, *args, choices_groupby, **kwargs):
-        if isinstance(choices_groupby, str):
-            choices_groupby = attrgetter(choices_groupby)
-        elif not callable(choices_groupby):
-            raise TypeError('choices_groupby must either be a str or a callable accepting a single argument')
-        self.iterator = partial(GroupedModelChoiceIterator, groupby=choices_groupby)
+class WorkerAutocompleteWidgetMixin:
+    """
+    Render only the selected workers as options, the others are searched for with
+    the worker-autocomplete endpoint by static/assets/js/autocomplete.js.
+    """
+
+    queryset = None
+
+    def optgroups(self, name, value, attrs=None):
+        ids = [int(worker_id) for worker_id in value if str(worker_id).isdigit()]
+        workers = self.queryset.filter(id__in=ids) if ids and self.queryset is not None else []
+        self.choices = [(worker.id, str(worker)) for worker in workers]
+        return super().optgroups(name, value, attrs)
+
+
+class WorkerAutocompleteSelect(WorkerAutocompleteWidgetMixin, forms.Select):
+    pass
+
+
+class WorkerAutocompleteSelectMultiple(WorkerAutocompleteWidgetMixin, forms.SelectMultiple):
+    pass
+
+
+class WorkerAutocompleteField(forms.Field):
+    """
+    A worker picker that only parses the submitted ids.
+    WorkerAutocompleteFormMixin replaces them with workers, loaded for all the fields of the form in one query.
+    """
+
+    default_error_messages = {
+        "invalid_choice": "Select a valid choice. %(value)s is not one of the available choices.",
+    }
+
+    def __init__(self, *, multiple=False, **kwargs):
+        self.multiple = multiple
+        kwargs.setdefault("widget", WorkerAutocompleteSelectMultiple if multiple else WorkerAutocompleteSelect)
+        super().__init__(**kwargs)
+
+    def prepare_value(self, value):
+        if self.multiple:
+            return [getattr(worker, "pk", worker) for worker in value or []]
+        return getattr(value, "pk", value)
+
+    def to_python(self, value):
+        values = value if self.multiple else [value]
+        ids = []
+        for worker_id in values or []:
+            if worker_id in self.empty_values:
+                continue
+            try:
+                ids.append(int(worker_id))
+            except (TypeError, ValueError):
+                raise forms.ValidationError(
+                    self.error_messages["invalid_choice"], code="invalid_choice", params={"value": worker_id}
+                )
+        if self.multiple:
+            return ids
+        return ids[0] if ids else None
+
+
+class WorkerAutocompleteFormMixin:
+    """
+    Form mixin for WorkerAutocompleteField fields. All of them pick from the workers of `get_worker_queryset()`,
+    the autocomplete endpoint is filtered the same way by `autocomplete_params`.
+    """
+
+    autocomplete_params = {}
+
+    def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.worker_queryset = self.get_worker_queryset()
+        url = reverse("task_manager:worker-autocomplete")
+        if self.autocomplete_params:
+            url = f"{url}?{urlencode(self.autocomplete_params)}"
+        for field in self.worker_fields.values():
+            field.widget.queryset = self.worker_queryset
+            field.widget.attrs["data-autocomplete-url"] = url
+
+    def get_worker_queryset(self):
+        return get_user_model().objects.all()
+
+    @property
+    def worker_fields(self):
+        return {name: field for name, field in self.fields.items() if isinstance(field, WorkerAutocompleteField)}
+
+    def clean(self):
+        cleaned_data = super().clean()
+        fields = {name: field for name, field in self.worker_fields.items() if name in cleaned_data}
+        ids = set()
+        for name, field in fields.items():
+            ids.update(cleaned_data[name] if field.multiple else filter(None, [cleaned_data[name]]))
+        workers = self.worker_queryset.in_bulk(ids) if ids else {}
+
+        for name, field in fields.items():
+            field_ids = cleaned_data[name] if field.multiple else [cleaned_data[name]]
+            missing = [worker_id for worker_id in field_ids if worker_id is not None and worker_id not in workers]
+            if missing:
+                self.add_error(name, forms.ValidationError(
+                    field.error_messages["invalid_choice"], code="invalid_choice", params={"value": missing[0]}
+                ))
+            elif field.multiple:
+                cleaned_data[name] = [workers[worker_id] for worker_id in field_ids]
+            else:
+                cleaned_data[name] = workers.get(cleaned_data[name])
+        return cleaned_data
+
+    def _get_validation_exclusions(self):
+        # The workers are already checked against get_worker_queryset() by clean(), skip the foreign key lookups.
+        return super()._get_validation_exclusions() | set(self.worker_fields)
 
 
-class ProjectForm(forms.ModelForm):
+class ProjectForm(WorkerAutocompleteFormMixin, forms.ModelForm):
     def __init__(self, *args, **kwargs):
         self.request = kwargs.pop("request")
+        self.autocomplete_params = {"exclude_self": 1}
         super(ProjectForm, self).__init__(*args, **kwargs)
-        self.fields["assignees"].queryset = get_user_model().objects.exclude(id=self.request.user.id).select_related(
-            "position"
-        )
 
     class Meta:
         model = Project
         fields = ["name", "description", "assignees"]
 
-    assignees = GroupedModelMultipleChoiceField(
-        queryset=get_user_model().objects.all(),
-        choices_groupby="position",
-        widget=forms.CheckboxSelectMultiple,
-    )
+    assignees = WorkerAutocompleteField(multiple=True)
 
+    def get_worker_queryset(self):
+        return get_user_model().objects.exclude(id=self.request.user.id)
 
-class TaskForm(forms.ModelForm):
+
+class TaskForm(WorkerAutocompleteFormMixin, forms.ModelForm):
     def __init__(self, *args, **kwargs):
         self.request = kwargs.pop("request")
         self.project = kwargs.pop("project")
+        self.autocomplete_params = {"project": self.project.id}
         super(TaskForm, self).__init__(*args, **kwargs)
-        parent_project_assignees = get_user_model().objects.filter(all_projects=self.project).select_related("position")
-        self.fields["followers"].queryset = parent_project_assignees
-        self.fields["responsible"].queryset = parent_project_assignees
 
     class Meta:
         model = Task
         fields = ["name", "description", "task_type", "responsible", "deadline", "followers"]
 
-    responsible = forms.ModelChoiceField(
-        queryset=get_user_model().objects.all()
-    )
-    followers = GroupedModelMultipleChoiceField(
-        queryset=get_user_model().objects.all(),
-        choices_groupby="position",
-        widget=forms.CheckboxSelectMultiple,
-        required=False
-    )
+    responsible = WorkerAutocompleteField()
+    followers = WorkerAutocompleteField(multiple=True, required=False)
     deadline = forms.SplitDateTimeField(
         widget=forms.SplitDateTimeWidget(
             date_attrs={"type": "date"},
@@ -121,6 +201,9 @@ class TaskForm(forms.ModelForm):
         )
     )
 
+    def get_worker_queryset(self):
+        return get_user_model().objects.filter(all_projects=self.project)
+
 
 TASK_STATUS_CHOICES = [
     ("new", "To Do"),
@@ -136,3 +219,67 @@ class TaskStatusUpdateForm(forms.ModelForm):
         fields = ["status"]
 
     status = forms.ChoiceField(choices=TASK_STATUS_CHOICES)
+
+
+class TaskBulkActionForm(WorkerAutocompleteFormMixin, forms.Form):
+    ACTION_CHOICES = [
+        ("status", "Change status"),
+        ("responsible", "Change responsible"),
+        ("deadline", "Change deadline"),
+        ("add_followers", "Add followers"),
+        ("remove_followers", "Remove followers"),
+    ]
+    ACTION_FIELDS = {
+        "status": "status",
+        "responsible": "responsible",
+        "deadline": "deadline",
+        "add_followers": "followers",
+        "remove_followers": "followers",
+    }
+
+    tasks = forms.Field(widget=forms.MultipleHiddenInput, error_messages={"required": "Select the tasks."})
+    action = forms.ChoiceField(choices=ACTION_CHOICES)
+    status = forms.ChoiceField(choices=Task.TASK_STATUS_CHOICES, required=False)
+    responsible = WorkerAutocompleteField(required=False)
+    deadline = forms.SplitDateTimeField(
+        required=False,
+        widget=forms.SplitDateTimeWidget(
+            date_attrs={"type": "date"},
+            date_format="%Y-%m-%d",
+            time_attrs={"type": "time"},
+            time_format="%H:%M",
+        )
+    )
+    followers = WorkerAutocompleteField(multiple=True, required=False)
+
+    def clean_tasks(self):
+        try:
+            return [int(task_id) for task_id in self.cleaned_data["tasks"]]
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Select valid tasks.", code="invalid")
+
+    def clean(self):
+        cleaned_data = super().clean()
+        name = self.ACTION_FIELDS.get(cleaned_data.get("action"))
+        if name and name not in self.errors and cleaned_data.get(name) in self.fields[name].empty_values:
+            self.add_error(name, forms.ValidationError(self.fields[name].error_messages["required"], code="required"))
+        return cleaned_data
+
+    @property
+    def value(self):
+        return self.cleaned_data[self.ACTION_FIELDS[self.cleaned_data["action"]]]
+
+
+class WorkerDeactivationForm(WorkerAutocompleteFormMixin, forms.Form):
+    replacement = WorkerAutocompleteField(
+        required=False,
+        help_text="Open tasks are handed over to this user. "
+                  "Leave empty to hand every task over to the author of its project."
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.worker = kwargs.pop("worker")
+        super(WorkerDeactivationForm, self).__init__(*args, **kwargs)
+
+    def get_worker_queryset(self):
+        return get_user_model().objects.filter(is_active=True).exclude(id=self.worker.id)
@@ -0,0 +1,127 @@
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.template.base import Node, TokenType
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+PLACEHOLDER = re.compile(r"%s|\?")
+VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """The statement with its literals and parameters replaced by `?`, so repeated queries look the same."""
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = PLACEHOLDER.sub("?", sql)
+    sql = VALUE_LIST.sub("(...)", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+def format_grouped_queries(statements):
+    """A report of the SQL statements grouped by fingerprint, the most repeated first."""
+    counts = Counter(fingerprint(sql) for sql in statements)
+    return "\n".join(f"{count:>5} x {sql}" for sql, count in counts.most_common())
+
+
+class QueryRecorder:
+    """Connection execute wrapper that counts the executed queries and sums up their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+@contextmanager
+def recording_queries(recorder=None):
+    recorder = recorder or QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        yield recorder
+
+
+class NPlusOneQueries(Exception):
+    pass
+
+
+class NPlusOneWarning(RuntimeWarning):
+    pass
+
+
+def get_python_stack(frame):
+    """`path:line in function` of the project frames that led to the frame, outermost first."""
+    stack = []
+    base_dir = str(settings.BASE_DIR)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(base_dir) and "site-packages" not in path and path != __file__:
+            stack.append(f"{os.path.relpath(path, base_dir)}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return stack[::-1]
+
+
+def get_template_stack(frame):
+    """`template:line {% tag %}` of the template nodes being rendered, outermost first."""
+    stack = []
+    while frame is not None:
+        node = frame.f_locals.get("self")
+        if isinstance(node, Node) and getattr(node, "token", None) and getattr(node, "origin", None):
+            tag = "{{ %s }}" if node.token.token_type == TokenType.VAR else "{%% %s %%}"
+            template_name = node.origin.template_name or node.origin.name
+            line = f"{template_name}:{node.token.lineno} {tag % node.token.contents}"
+            if not stack or stack[-1] != line:
+                stack.append(line)
+        frame = frame.f_back
+    return stack[::-1]
+
+
+class RepeatedQueryDetector:
+    """
+    Connection execute wrapper that counts the queries by fingerprint. The Python and template stacks
+    are only captured when a fingerprint runs more than `threshold` times, so ordinary queries stay cheap.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.examples = {}
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        if self.counts[key] == self.threshold + 1:
+            frame = sys._getframe(1)
+            self.examples[key] = sql
+            self.stacks[key] = (get_python_stack(frame), get_template_stack(frame))
+        return execute(sql, params, many, context)
+
+    def repeated(self):
+        """Fingerprints that ran more than `threshold` times with their count, the most repeated first."""
+        return [(key, count) for key, count in self.counts.most_common() if count > self.threshold]
+
+    def report(self, label):
+        lines = []
+        for key, count in self.repeated():
+            python_stack, template_stack = self.stacks[key]
+            lines.append(f"{count} x {key}")
+            lines.append("  Python stack:")
+            lines.extend(f"    {line}" for line in python_stack or ["(outside the project code)"])
+            if template_stack:
+                lines.append("  Template stack:")
+                lines.extend(f"    {line}" for line in template_stack)
+        return f"Repeated queries in {label}:\n" + "\n".join(lines)
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from task_manager import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the tasks closed more than TASK_ARCHIVE_AFTER_DAYS days ago, with their followers, to the archive "
+        "tables. Every batch is committed on its own, an interrupted run is resumed by running the command again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TASK_ARCHIVE_AFTER_DAYS,
+            help="Archive the tasks closed more than this number of days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_ARCHIVE_BATCH_SIZE,
+            help="Number of tasks moved per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        num_tasks = archive.archive(options["days"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {num_tasks} tasks."))
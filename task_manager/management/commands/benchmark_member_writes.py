@@ -0,0 +1,80 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from task_manager.memberships import apply_members
+from task_manager.models import Project, Task, TaskType
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the database round trips of adding followers one by one "
+        "with applying the member set as a diff. All changes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000],
+            help="Numbers of members to benchmark.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'members':>8} {'write path':<22} {'queries':>8} {'ms':>10}")
+        with transaction.atomic():
+            for size in options["sizes"]:
+                self.benchmark(size)
+            transaction.set_rollback(True)
+
+    def benchmark(self, size):
+        half = size // 2
+        workers = get_user_model().objects.bulk_create([
+            get_user_model()(username=f"benchmark.member.{size}.{number}", password="!")
+            for number in range(size + half)
+        ])
+        worker_ids = [worker.id for worker in workers[:size]]
+        replacement_ids = [worker.id for worker in workers[size:]]
+        author = workers[0]
+        project = Project.objects.create(name=f"Benchmark project ({size} members)", author=author)
+        task_type = TaskType.objects.first() or TaskType.objects.create(name="Benchmark")
+
+        def create_task():
+            return Task.objects.create(
+                name="Benchmark task",
+                project=project,
+                deadline=timezone.now(),
+                description="",
+                author=author,
+                responsible=author,
+                task_type=task_type
+            )
+
+        loop_task = create_task()
+        self.measure(
+            size,
+            "add() per member",
+            lambda: [loop_task.followers.add(worker_id) for worker_id in worker_ids]
+        )
+
+        diff_task = create_task()
+        self.measure(
+            size,
+            "diff, new member set",
+            lambda: apply_members(diff_task, "followers", worker_ids, current_ids=set())
+        )
+
+        changed_ids = worker_ids[half:] + replacement_ids
+        self.measure(size, "diff, changed members", lambda: apply_members(diff_task, "followers", changed_ids))
+
+    def measure(self, size, label, write):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            write()
+            elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(f"{size:>8} {label:<22} {len(queries):>8} {elapsed:>10.1f}")
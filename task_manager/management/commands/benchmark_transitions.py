@@ -0,0 +1,170 @@
+import random
+import statistics
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction, DatabaseError
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from task_manager import progress, transitions
+from task_manager.models import Project, ProjectProgress, Task, TaskType
+
+MODES = ("conditional", "read-modify-write")
+
+
+def change_read_modify_write(task_id, status, user):
+    """The former write path: load the task, change it in Python, save it and shift the counters."""
+    task = Task.objects.get(id=task_id)
+    if not transitions.can_change(task, status, user):
+        return 0
+    was_completed = task.is_completed
+    task.status = status
+    task.is_completed = status in transitions.CLOSED_STATUSES
+    with transaction.atomic():
+        task.save()
+        delta = int(task.is_completed) - int(was_completed)
+        if delta:
+            ProjectProgress.objects.filter(
+                project_id=task.project_id,
+                worker__in=task.followers.values("id")
+            ).update(num_completed_tasks=F("num_completed_tasks") + delta)
+    return 1
+
+
+def change_conditional(task_id, status, user):
+    return transitions.apply(Task.objects.filter(id=task_id), status, user)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent writers completing and re-opening the same tasks, with the conditional UPDATE "
+        "of task_manager.transitions and with the former read-modify-write path. Report throughput, "
+        "latency, rejected transitions and the project progress counters that drifted from the tasks. "
+        "The benchmark data is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4, help="Number of concurrent writers.")
+        parser.add_argument("--operations", type=int, default=200, help="Number of status changes per writer.")
+        parser.add_argument("--tasks", type=int, default=10, help="Number of tasks the writers compete for.")
+        parser.add_argument("--followers", type=int, default=5, help="Number of followers per task.")
+        parser.add_argument("--mode", choices=MODES, action="append", dest="modes", help="Only run the given modes.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the random status changes.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'mode':<18} {'threads':>7} {'changes':>8} {'applied':>8} {'rejected':>8} {'errors':>6} "
+            f"{'per s':>8} {'p50 ms':>8} {'p95 ms':>8} {'drifted':>7}"
+        )
+        for mode in options["modes"] or MODES:
+            self.benchmark(mode, options)
+
+    def benchmark(self, mode, options):
+        author, project, task_ids = self.create_data(options["tasks"], options["followers"])
+        change = change_conditional if mode == "conditional" else change_read_modify_write
+        results = {"applied": 0, "rejected": 0, "errors": 0, "durations": []}
+        lock = threading.Lock()
+        barrier = threading.Barrier(options["threads"])
+
+        def write(number):
+            rng = random.Random(options["seed"] + number)
+            applied = rejected = errors = 0
+            durations = []
+            barrier.wait()
+            for _ in range(options["operations"]):
+                status = rng.choice(("completed", "new"))
+                start = time.perf_counter()
+                try:
+                    if change(rng.choice(task_ids), status, author):
+                        applied += 1
+                    else:
+                        rejected += 1
+                except DatabaseError:
+                    errors += 1
+                durations.append((time.perf_counter() - start) * 1000)
+            with lock:
+                results["applied"] += applied
+                results["rejected"] += rejected
+                results["errors"] += errors
+                results["durations"] += durations
+
+        def run(number):
+            try:
+                write(number)
+            finally:
+                connection.close()
+
+        try:
+            start = time.perf_counter()
+            if options["threads"] == 1:
+                write(0)
+            else:
+                threads = [threading.Thread(target=run, args=(number,)) for number in range(options["threads"])]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            elapsed = time.perf_counter() - start
+            drifted = self.count_drifted(project)
+        finally:
+            self.delete_data(author, project)
+
+        durations = sorted(results["durations"])
+        changes = len(durations)
+        self.stdout.write(
+            f"{mode:<18} {options['threads']:>7} {changes:>8} {results['applied']:>8} {results['rejected']:>8} "
+            f"{results['errors']:>6} {changes / elapsed:>8.0f} {statistics.median(durations):>8.2f} "
+            f"{durations[int(0.95 * (changes - 1))]:>8.2f} {drifted:>7}"
+        )
+
+    def create_data(self, num_tasks, num_followers):
+        suffix = f"{time.time_ns()}"
+        workers = get_user_model().objects.bulk_create([
+            get_user_model()(username=f"benchmark.transitions.{suffix}.{number}", password="!")
+            for number in range(num_followers)
+        ])
+        author = workers[0]
+        project = Project.objects.create(name=f"Benchmark transitions {suffix}", author=author)
+        task_type = TaskType.objects.first() or TaskType.objects.create(name="Benchmark")
+        tasks = Task.objects.bulk_create([
+            Task(
+                name=f"Benchmark task #{number}",
+                project=project,
+                deadline=timezone.now(),
+                description="",
+                author=author,
+                responsible=author,
+                task_type=task_type
+            )
+            for number in range(num_tasks)
+        ])
+        Task.followers.through.objects.bulk_create([
+            Task.followers.through(task_id=task.id, worker_id=worker.id) for task in tasks for worker in workers
+        ])
+        progress.rebuild([project.id])
+        return author, project, [task.id for task in tasks]
+
+    @staticmethod
+    def count_drifted(project):
+        """Count the progress rows of the project whose completed tasks differ from the tasks."""
+        expected = {
+            row["worker_id"]: row["completed"]
+            for row in Task.followers.through.objects.filter(task__project=project).values("worker_id").annotate(
+                completed=Count("id", filter=Q(task__is_completed=True))
+            ).order_by()
+        }
+        return sum(
+            row.num_completed_tasks != expected.get(row.worker_id, 0)
+            for row in ProjectProgress.objects.filter(project=project)
+        )
+
+    @staticmethod
+    def delete_data(author, project):
+        worker_ids = list(project.tasks.values_list("followers", flat=True).distinct()) + [author.id]
+        with transaction.atomic():
+            project.tasks.all().delete()
+            project.delete()
+            get_user_model().objects.filter(id__in=worker_ids).delete()
@@ -0,0 +1,193 @@
+import json
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from task_manager.budgets import QUERY_BUDGETS
+from task_manager.instrumentation import recording_queries
+from task_manager.models import Position, Project, Task, TaskType
+from task_manager.urls import app_name, urlpatterns
+
+# Routes that change data are not benchmarked.
+SKIPPED_ROUTES = {
+    "worker-toggle-is-active",
+    "project-toggle-is-active",
+    "task-status-toggle",
+}
+
+
+def get_host():
+    """A host name the ALLOWED_HOSTS setting accepts, `localhost` is allowed by default in DEBUG mode."""
+    for host in settings.ALLOWED_HOSTS:
+        if host and host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+def percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every task_manager route as an authenticated worker, report latency percentiles, "
+        "SQL query count and SQL time per route, and fail when a route exceeds its query budget "
+        "declared in task_manager.budgets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username of the worker to log in as. Defaults to the first worker.")
+        parser.add_argument("--requests", type=int, default=20, help="Number of measured requests per route.")
+        parser.add_argument("--threads", type=int, default=1, help="Number of concurrent clients per route.")
+        parser.add_argument("--route", action="append", dest="routes", help="Only benchmark the given route names.")
+        parser.add_argument("--output", help="Path of the JSON file to write the results to.")
+        parser.add_argument("--baseline", help="Path of a JSON file of a previous run to compare with.")
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+        route_kwargs = self.get_route_kwargs(user)
+
+        results = {}
+        for pattern in urlpatterns:
+            name = pattern.name
+            if name in SKIPPED_ROUTES or (options["routes"] and name not in options["routes"]):
+                continue
+            url = reverse(f"{app_name}:{name}", kwargs={
+                kwarg: route_kwargs[name].get(kwarg) for kwarg in pattern.pattern.converters
+            } if pattern.pattern.converters else None)
+            results[f"{app_name}:{name}"] = self.benchmark(url, user, options["requests"], options["threads"])
+
+        baseline = {}
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)["routes"]
+
+        over_budget = []
+        self.stdout.write(
+            f"{'route':<40} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'queries':>8} {'budget':>6} {'sql ms':>8}"
+        )
+        for name, result in results.items():
+            budget = QUERY_BUDGETS.get(name)
+            result["query_budget"] = budget
+            line = (
+                f"{name:<40} {result['status']:>6} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['queries']:>8} {budget if budget is not None else '-':>6} "
+                f"{result['sql_ms']:>8.1f}"
+            )
+            if name in baseline:
+                line += f"  p95 {result['p95_ms'] / max(baseline[name]['p95_ms'], 0.001):.2f}x of baseline"
+            if budget is not None and result["queries"] > budget:
+                over_budget.append(name)
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump({
+                    "user": user.username,
+                    "requests": options["requests"],
+                    "threads": options["threads"],
+                    "routes": results,
+                }, file, indent=2)
+
+        if over_budget:
+            raise CommandError(f"Routes over their query budget: {', '.join(over_budget)}")
+
+    def benchmark(self, url, user, requests, threads):
+        samples = []
+        errors = []
+
+        def run(number):
+            client = Client(HTTP_HOST=get_host())
+            client.force_login(user)
+            for _ in range(number):
+                with recording_queries() as queries:
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                    elapsed = time.perf_counter() - start
+                samples.append((elapsed, queries.count, queries.duration, response.status_code))
+
+        def run_in_thread(number):
+            try:
+                run(number)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        run(1)
+        samples.clear()
+        if threads == 1:
+            run(requests)
+        else:
+            workers = [
+                threading.Thread(target=run_in_thread, args=(requests // threads + (index < requests % threads),))
+                for index in range(threads)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            if errors:
+                raise errors[0]
+
+        latencies = sorted(sample[0] * 1000 for sample in samples)
+        return {
+            "url": url,
+            "status": samples[-1][3],
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": statistics.fmean(latencies),
+            "queries": max(sample[1] for sample in samples),
+            "sql_ms": statistics.fmean(sample[2] * 1000 for sample in samples),
+        }
+
+    @staticmethod
+    def get_user(username):
+        workers = get_user_model().objects.order_by("id")
+        user = workers.filter(username=username).first() if username else workers.first()
+        if user is None:
+            raise CommandError("No worker found to log in as. Seed the database first, e.g. with generate_dataset.")
+        return user
+
+    @staticmethod
+    def get_route_kwargs(user):
+        """Pick objects visible to the user to fill in the URL arguments of every route."""
+        project = Project.objects.filter(assignees=user).order_by("id").first()
+        task = Task.objects.filter(followers=user).order_by("id").first()
+        if project is None or task is None:
+            raise CommandError(f"Worker '{user.username}' has to follow at least one task in a project.")
+        worker = task.author if task.author_id != user.id else task.responsible
+        position = Position.objects.order_by("id").first()
+        if position is None:
+            raise CommandError("At least one position is needed for the position pages.")
+        task_type = TaskType.objects.order_by("id").first()
+
+        route_kwargs = {}
+        for pattern in urlpatterns:
+            name = pattern.name
+            if name.startswith("worker-"):
+                pk = worker.pk
+            elif name.startswith("position-"):
+                pk = position.pk
+            elif name.startswith("task-type-"):
+                pk = task_type.pk
+            elif name.startswith("project-") or name == "task-create":
+                pk = project.pk
+            else:
+                pk = task.pk
+            route_kwargs[name] = {"pk": pk, "file_format": "jsonl"}
+        return route_kwargs
@@ -0,0 +1,100 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import FilteredRelation, Q
+
+from task_manager import dashboard
+from task_manager.models import Task, Project, ProjectProgress
+
+FULL_SCAN_PATTERNS = {
+    "postgresql": r"Seq Scan on {table}\b",
+    "sqlite": r"\bSCAN {table}\b(?! USING)",
+}
+
+WATCHED_TABLES = (
+    Task._meta.db_table,
+    Task.followers.through._meta.db_table,
+    ProjectProgress._meta.db_table,
+)
+
+
+def get_hot_queries(user):
+    """
+    Return the querysets of the task_manager hot paths for the given user,
+    built the same way the corresponding views build them.
+    """
+    sections = dashboard.get_section_querysets(user, dashboard.get_local_now(user))
+
+    return {
+        **{f"index: {name.replace('_', ' ')}": queryset for name, queryset in sections.items()},
+        "worker-detail: worker is responsible": Task.objects.filter(
+            author=user,
+            responsible=user,
+            is_completed=False
+        ).order_by("deadline"),
+        "task-list: followed tasks": Task.objects.filter(followers=user).select_related(
+            "project",
+            "author",
+            "responsible",
+            "task_type"
+        ),
+        "task-list: followed open tasks": Task.objects.filter(followers=user, is_completed=False),
+        "project-tasks: followed tasks": Task.objects.filter(
+            project=Project.objects.filter(assignees=user).first(),
+            followers=user
+        ).order_by("deadline", "id"),
+        "project-list: assigned projects": Project.objects.filter(assignees=user).annotate(
+            user_progress=FilteredRelation("worker_progress", condition=Q(worker_progress__worker=user)),
+        ).values("id", "name", "user_progress__num_tasks", "user_progress__num_completed_tasks"),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the queries of the task_manager hot paths "
+        "and fail if any of them falls back to a full table scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Username of the worker to build the queries for. Defaults to the first worker.",
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Print the full query plan of every query.",
+        )
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Query plan checks are not supported for '{connection.vendor}' databases.")
+
+        user = self.get_user(options["user"])
+        full_scan_re = re.compile("|".join(pattern.format(table=re.escape(table)) for table in WATCHED_TABLES))
+
+        failed = []
+        for name, queryset in get_hot_queries(user).items():
+            plan = queryset.explain()
+            if options["verbose_plans"]:
+                self.stdout.write(f"{name}:\n{plan}\n")
+            if full_scan_re.search(plan):
+                failed.append(name)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}"))
+                self.stdout.write(plan)
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK         {name}"))
+
+        if failed:
+            raise CommandError(f"{len(failed)} hot queries fall back to a full scan: {', '.join(failed)}")
+
+    @staticmethod
+    def get_user(username):
+        workers = get_user_model().objects.order_by("id")
+        user = workers.filter(username=username).first() if username else workers.first()
+        if user is None:
+            raise CommandError("No worker found to build the queries for. Seed the database first.")
+        return user
@@ -0,0 +1,195 @@
+import datetime
+import random
+import time
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from task_manager import progress
+from task_manager.models import Position, TaskType, Project, Task
+
+FIRST_NAMES = ["Anna", "Jack", "Erika", "John", "Olena", "Mark", "Sofia", "Taras", "Emma", "Ivan", "Lucy", "Petro"]
+LAST_NAMES = ["Smith", "Doe", "Rogers", "Shevchenko", "Brown", "Kovalenko", "Miller", "Bondar", "Wilson", "Melnyk"]
+
+STATUSES = ["new", "progress", "blocked", "review", "completed", "cancelled"]
+STATUS_WEIGHTS = list(accumulate([12, 12, 3, 5, 60, 8]))
+CLOSED_STATUSES = {"completed", "cancelled"}
+EXTRA_FOLLOWERS = [0, 1, 2, 3, 5, 8]
+EXTRA_FOLLOWER_WEIGHTS = list(accumulate([30, 25, 20, 12, 9, 4]))
+
+
+def zipf_weights(size, exponent):
+    """Cumulative Zipf weights for ranks 1..size, for use as `cum_weights` of Random.choices()."""
+    return list(accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic organization for load testing: positions, task types, "
+        "workers, projects with Zipf-distributed membership and tasks with realistic statuses, "
+        "deadlines and followers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=1, help="Seed of the random generator.")
+        parser.add_argument(
+            "--today",
+            type=datetime.date.fromisoformat,
+            help=(
+                "Day the deadlines are generated around, in the YYYY-MM-DD format, the current day by default. "
+                "A seed and a day always give the same dataset."
+            ),
+        )
+        parser.add_argument("--positions", type=int, default=20)
+        parser.add_argument("--task-types", type=int, default=10)
+        parser.add_argument("--workers", type=int, default=1000)
+        parser.add_argument("--projects", type=int, default=200)
+        parser.add_argument("--tasks", type=int, default=100000)
+        parser.add_argument(
+            "--zipf-exponent",
+            type=float,
+            default=1.1,
+            help="Skew of the project sizes and of the worker activity.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Number of tasks inserted per query.")
+        parser.add_argument(
+            "--prefix",
+            default="load",
+            help="Prefix of the generated usernames and names, so several datasets can coexist.",
+        )
+        parser.add_argument("--password", default="load-test-password", help="Password of all generated workers.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.prefix = options["prefix"]
+        self.exponent = options["zipf_exponent"]
+        today = options["today"] or timezone.localdate()
+        self.today = datetime.datetime.combine(today, datetime.time(), tzinfo=datetime.timezone.utc)
+        self.stdout.write(f"Generating deadlines around {today.isoformat()}")
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            position_ids = self.generate_named(Position, "Position", options["positions"])
+            task_type_ids = self.generate_named(TaskType, "Task type", options["task_types"])
+            worker_ids = self.generate_workers(options["workers"], position_ids, options["password"])
+            project_ids, members = self.generate_projects(options["projects"], worker_ids)
+        self.stdout.write(f"Generated organization in {time.perf_counter() - started:.1f}s")
+
+        self.generate_tasks(options["tasks"], options["batch_size"], project_ids, members, task_type_ids)
+        progress.rebuild(project_ids)
+        self.stdout.write(self.style.SUCCESS(f"Generated dataset in {time.perf_counter() - started:.1f}s"))
+
+    def generate_named(self, model, label, number):
+        objects = model.objects.bulk_create([model(name=f"{self.prefix} {label} {index}") for index in range(number)])
+        return [obj.id for obj in objects]
+
+    def generate_workers(self, number, position_ids, password):
+        password = make_password(password)
+        position_indexes = self.rng.choices(
+            range(len(position_ids)), cum_weights=zipf_weights(len(position_ids), self.exponent), k=number
+        )
+        workers = get_user_model().objects.bulk_create(
+            [
+                get_user_model()(
+                    username=f"{self.prefix}.worker{index}",
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                    password=password,
+                    position_id=position_ids[position_index]
+                )
+                for index, position_index in enumerate(position_indexes)
+            ],
+            batch_size=5000
+        )
+        return [worker.id for worker in workers]
+
+    def generate_projects(self, number, worker_ids):
+        """Project sizes follow Zipf's law: a few company-wide projects and a long tail of small ones."""
+        sizes = [
+            max(2, min(len(worker_ids), int(len(worker_ids) / rank ** self.exponent)))
+            for rank in range(1, number + 1)
+        ]
+        members = [self.rng.sample(worker_ids, min(size, len(worker_ids))) for size in sizes]
+
+        projects = Project.objects.bulk_create([
+            Project(
+                name=f"{self.prefix} Project {index}",
+                author_id=project_members[0],
+                is_active=self.rng.random() < 0.8
+            )
+            for index, project_members in enumerate(members)
+        ])
+        project_ids = [project.id for project in projects]
+
+        Project.assignees.through.objects.bulk_create(
+            [
+                Project.assignees.through(project_id=project_id, worker_id=worker_id)
+                for project_id, project_members in zip(project_ids, members)
+                for worker_id in project_members
+            ],
+            batch_size=10000
+        )
+        return project_ids, members
+
+    def generate_tasks(self, number, batch_size, project_ids, members, task_type_ids):
+        # Bigger projects have more tasks, and earlier members of a project are more active.
+        project_weights = list(accumulate(len(project_members) for project_members in members))
+        member_weights = zipf_weights(max(len(project_members) for project_members in members), self.exponent)
+        started = time.perf_counter()
+
+        for offset in range(0, number, batch_size):
+            size = min(batch_size, number - offset)
+            project_indexes = self.rng.choices(range(len(project_ids)), cum_weights=project_weights, k=size)
+            statuses = self.rng.choices(STATUSES, cum_weights=STATUS_WEIGHTS, k=size)
+            extra_followers = self.rng.choices(EXTRA_FOLLOWERS, cum_weights=EXTRA_FOLLOWER_WEIGHTS, k=size)
+            task_types = self.rng.choices(task_type_ids, k=size)
+
+            tasks = []
+            followers = []
+            for index in range(size):
+                project_members = members[project_indexes[index]]
+                author_id, responsible_id = self.rng.choices(
+                    project_members, cum_weights=member_weights[:len(project_members)], k=2
+                )
+                task_followers = {author_id, responsible_id}
+                task_followers.update(
+                    self.rng.sample(project_members, min(extra_followers[index], len(project_members)))
+                )
+                is_completed = statuses[index] in CLOSED_STATUSES
+                deadline = self.get_deadline(statuses[index])
+                tasks.append(Task(
+                    name=f"{self.prefix} Task {offset + index}",
+                    project_id=project_ids[project_indexes[index]],
+                    status=statuses[index],
+                    is_completed=is_completed,
+                    closed_time=deadline if is_completed else None,
+                    deadline=deadline,
+                    description="Generated for load testing.",
+                    author_id=author_id,
+                    responsible_id=responsible_id,
+                    task_type_id=task_types[index]
+                ))
+                followers.append(task_followers)
+
+            with transaction.atomic():
+                Task.objects.bulk_create(tasks)
+                Task.followers.through.objects.bulk_create([
+                    Task.followers.through(task_id=task.id, worker_id=worker_id)
+                    for task, task_followers in zip(tasks, followers)
+                    for worker_id in task_followers
+                ])
+
+            done = offset + size
+            self.stdout.write(f"Generated {done} tasks ({done / (time.perf_counter() - started):.0f} tasks/s)")
+
+    def get_deadline(self, status):
+        """Closed tasks are due in the past two years, open ones around today, with some of them overdue."""
+        if status in CLOSED_STATUSES:
+            minutes = -self.rng.randrange(0, 730 * 24 * 60)
+        else:
+            minutes = self.rng.randrange(-14 * 24 * 60, 45 * 24 * 60)
+        return self.today + datetime.timedelta(minutes=minutes - minutes % 15)
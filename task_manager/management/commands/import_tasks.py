@@ -0,0 +1,209 @@
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from task_manager import dashboard, progress, project_stats
+from task_manager.models import Project, Task, TaskImport, TaskType
+
+STATUSES = {status for status, _ in Task.TASK_STATUS_CHOICES}
+CLOSED_STATUSES = {"completed", "cancelled"}
+
+
+def read_csv(file):
+    for row in csv.DictReader(file):
+        row["followers"] = [username for username in (row.get("followers") or "").split(";") if username]
+        yield row
+
+
+def read_jsonl(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+READERS = {
+    "csv": read_csv,
+    "jsonl": read_jsonl,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks with their followers and project assignees from a CSV or JSONL stream. "
+        "Each row has the fields name, project, task_type, status, deadline, description, "
+        "author, responsible and followers (usernames, separated by ';' in CSV, a list in JSONL), "
+        "and optionally closed_time, the deadline is taken for closed tasks without one. "
+        "Projects and task types are looked up by name and created when missing, "
+        "workers are looked up by username."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the file to import, '-' to read from stdin.")
+        parser.add_argument(
+            "--format",
+            choices=READERS,
+            help="Input format. Defaults to the extension of the file.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of tasks inserted per transaction.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "Name of the import. The number of imported rows is stored under it with every batch, "
+                "an interrupted import with the same name resumes from it."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or os.path.splitext(options["path"])[1].lstrip(".")
+        if file_format not in READERS:
+            raise CommandError("Can't detect the input format, use --format.")
+
+        self.workers = dict(get_user_model().objects.values_list("username", "id"))
+        self.task_types = dict(TaskType.objects.values_list("name", "id"))
+        self.projects = dict(Project.objects.order_by("-id").values_list("name", "id"))
+        self.assignees = set(Project.assignees.through.objects.values_list("project_id", "worker_id"))
+        self.touched_projects = set()
+        self.touched_workers = set()
+
+        checkpoint = options["checkpoint"]
+        skip = self.read_checkpoint(checkpoint)
+        if skip:
+            self.stdout.write(f"Resuming after {skip} rows.")
+
+        file = sys.stdin if options["path"] == "-" else open(options["path"], newline="", encoding="utf-8")
+        try:
+            rows = islice(READERS[file_format](file), skip, None)
+            imported = self.import_rows(rows, skip, options["batch_size"], checkpoint)
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+        # A resumed import can't tell which projects the interrupted run touched.
+        progress.rebuild(None if skip else self.touched_projects)
+        project_stats.invalidate(None if skip else self.touched_projects)
+        dashboard.invalidate(self.touched_workers)
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} tasks."))
+
+    def import_rows(self, rows, done, batch_size, checkpoint):
+        started = time.perf_counter()
+        imported = 0
+        while batch := list(islice(rows, batch_size)):
+            with transaction.atomic():
+                self.import_batch(batch, done + 1)
+                done += len(batch)
+                self.write_checkpoint(checkpoint, done)
+            imported += len(batch)
+            rate = imported / (time.perf_counter() - started)
+            self.stdout.write(f"Imported {done} rows ({rate:.0f} rows/s)")
+        return imported
+
+    def import_batch(self, batch, first_line):
+        tasks = []
+        followers = []
+        new_assignees = set()
+        for line, row in enumerate(batch, start=first_line):
+            try:
+                task, follower_ids = self.build_task(row)
+            except (KeyError, ValueError) as error:
+                raise CommandError(f"Row {line}: {error}")
+            tasks.append(task)
+            followers.append(follower_ids)
+            for worker_id in follower_ids:
+                if (task.project_id, worker_id) not in self.assignees:
+                    new_assignees.add((task.project_id, worker_id))
+
+        Task.objects.bulk_create(tasks)
+        Task.followers.through.objects.bulk_create([
+            Task.followers.through(task_id=task.id, worker_id=worker_id)
+            for task, follower_ids in zip(tasks, followers)
+            for worker_id in follower_ids
+        ])
+        Project.assignees.through.objects.bulk_create(
+            [Project.assignees.through(project_id=project_id, worker_id=worker_id)
+             for project_id, worker_id in new_assignees],
+            ignore_conflicts=True
+        )
+        self.assignees |= new_assignees
+        self.touched_projects |= {task.project_id for task in tasks}
+        self.touched_workers.update(*followers)
+
+    def build_task(self, row):
+        author_id = self.get_worker_id(row["author"])
+        responsible_id = self.get_worker_id(row["responsible"])
+        follower_ids = {self.get_worker_id(username) for username in row.get("followers") or []}
+        follower_ids |= {author_id, responsible_id}
+
+        status = row.get("status") or "new"
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status '{status}'.")
+
+        deadline = self.parse_time(row, "deadline")
+        closed_time = None
+        if status in CLOSED_STATUSES:
+            # Closed tasks are archived by their closing time, see task_manager.archive.
+            closed_time = self.parse_time(row, "closed_time") if row.get("closed_time") else deadline
+
+        task = Task(
+            name=row["name"],
+            project_id=self.get_project_id(row["project"], author_id),
+            task_type_id=self.get_task_type_id(row["task_type"]),
+            status=status,
+            is_completed=status in CLOSED_STATUSES,
+            closed_time=closed_time,
+            deadline=deadline,
+            description=row.get("description") or "",
+            author_id=author_id,
+            responsible_id=responsible_id
+        )
+        return task, follower_ids
+
+    @staticmethod
+    def parse_time(row, field):
+        value = parse_datetime(row[field])
+        if value is None:
+            raise ValueError(f"Invalid {field} '{row[field]}'.")
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+    def get_worker_id(self, username):
+        try:
+            return self.workers[username]
+        except KeyError:
+            raise ValueError(f"Unknown worker '{username}'.")
+
+    def get_task_type_id(self, name):
+        if name not in self.task_types:
+            self.task_types[name] = TaskType.objects.create(name=name).id
+        return self.task_types[name]
+
+    def get_project_id(self, name, author_id):
+        if name not in self.projects:
+            self.projects[name] = Project.objects.create(name=name, author_id=author_id).id
+        return self.projects[name]
+
+    @staticmethod
+    def read_checkpoint(checkpoint):
+        if not checkpoint:
+            return 0
+        return TaskImport.objects.filter(name=checkpoint).values_list("num_rows", flat=True).first() or 0
+
+    @staticmethod
+    def write_checkpoint(checkpoint, done):
+        # Called in the transaction of the batch, the rows and the checkpoint are committed together.
+        if checkpoint:
+            TaskImport.objects.update_or_create(name=checkpoint, defaults={"num_rows": done})
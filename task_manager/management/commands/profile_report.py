@@ -0,0 +1,90 @@
+import os
+import pstats
+import statistics
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.profiling import load_profiles
+
+SORT_KEYS = {
+    "tottime": 2,
+    "cumtime": 3,
+    "calls": 1,
+}
+
+
+def function_name(function):
+    """`path:line(name)` with the path shortened to the project or to the installed package."""
+    path, line, name = function
+    if path == "~":
+        return name
+    if path.startswith(str(settings.BASE_DIR)):
+        path = os.path.relpath(path, settings.BASE_DIR)
+    elif "site-packages" in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    return f"{path}:{line}({name})"
+
+
+class Command(BaseCommand):
+    help = (
+        "Aggregate the request profiles written by ProfilingMiddleware into a report of the hottest functions, "
+        "ranked by their time summed up over all profiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", help="Directory of the profiles. Defaults to the PROFILING_DIR setting.")
+        parser.add_argument("--view", action="append", dest="views", help="Only aggregate profiles of the URL name.")
+        parser.add_argument("--sort", choices=SORT_KEYS, default="tottime", help="Column to rank the functions by.")
+        parser.add_argument("--limit", type=int, default=30, help="Number of functions in the report.")
+
+    def handle(self, *args, **options):
+        profiles = load_profiles(options["dir"] or settings.PROFILING_DIR, options["views"])
+        if not profiles:
+            raise CommandError("No profiles found.")
+
+        self.write_requests([info for _, info in profiles])
+        stats = pstats.Stats(*[path for path, _ in profiles])
+        self.write_functions(stats, len(profiles), SORT_KEYS[options["sort"]], options["limit"])
+        self.write_allocations([info for _, info in profiles], options["limit"])
+
+    def write_requests(self, infos):
+        by_view = defaultdict(list)
+        for info in infos:
+            by_view[info["view"]].append(info)
+
+        self.stdout.write(f"Aggregated {len(infos)} profiles.\n")
+        self.stdout.write(f"{'view':<40} {'profiles':>8} {'mean ms':>8} {'max ms':>8} {'queries':>8} {'sql ms':>8}")
+        for view, view_infos in sorted(by_view.items(), key=lambda item: -sum(i["total_ms"] for i in item[1])):
+            self.stdout.write(
+                f"{view:<40} {len(view_infos):>8} "
+                f"{statistics.fmean(info['total_ms'] for info in view_infos):>8.1f} "
+                f"{max(info['total_ms'] for info in view_infos):>8.1f} "
+                f"{statistics.fmean(info['db_queries'] for info in view_infos):>8.1f} "
+                f"{statistics.fmean(info['db_ms'] for info in view_infos):>8.1f}"
+            )
+
+    def write_functions(self, stats, number_of_profiles, sort_index, limit):
+        rows = sorted(stats.stats.items(), key=lambda item: -item[1][sort_index])[:limit]
+        self.stdout.write(
+            f"\n{'calls':>10} {'tottime ms':>11} {'cumtime ms':>11} {'cum/profile':>11}  function"
+        )
+        for function, (_, calls, tottime, cumtime, _) in rows:
+            self.stdout.write(
+                f"{calls:>10} {tottime * 1000:>11.1f} {cumtime * 1000:>11.1f} "
+                f"{cumtime * 1000 / number_of_profiles:>11.2f}  {function_name(function)}"
+            )
+
+    def write_allocations(self, infos, limit):
+        allocations = defaultdict(lambda: [0, 0])
+        for info in infos:
+            for allocation in info.get("allocations", []):
+                allocations[allocation["location"]][0] += allocation["size"]
+                allocations[allocation["location"]][1] += allocation["count"]
+        if not allocations:
+            return
+
+        self.stdout.write(f"\n{'size KiB':>10} {'blocks':>10}  allocated at")
+        for location, (size, count) in sorted(allocations.items(), key=lambda item: -item[1][0])[:limit]:
+            self.stdout.write(f"{size / 1024:>10.1f} {count:>10}  {location}")
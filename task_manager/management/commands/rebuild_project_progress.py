@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from task_manager import progress
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-worker project progress counters from the tasks and their followers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=int,
+            action="append",
+            dest="project_ids",
+            help="Id of a project to rebuild. Can be repeated. Defaults to all projects.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of counter rows inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        num_rows = progress.rebuild(options["project_ids"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {num_rows} project progress rows."))
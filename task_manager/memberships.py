@@ -0,0 +1,52 @@
+from django.db import router, transaction
+from django.db.models.signals import m2m_changed
+
+
+def apply_members(instance, field_name, member_ids, current_ids=None):
+    """
+    Make `member_ids` the exact member set of the many-to-many field `field_name` of `instance`.
+    The difference with the current members is applied with one bulk insert and one delete
+    on the through table, and m2m_changed is sent the same way the related manager sends it.
+    Pass `current_ids` when the current members are already known (an empty set for a just
+    created instance) to skip reading them.
+    Returns a tuple of the added and the removed member ids.
+    """
+    manager = getattr(instance, field_name)
+    through = manager.through
+    source_name = manager.source_field_name
+    target_name = manager.target_field_name
+    member_ids = set(member_ids)
+
+    with transaction.atomic():
+        if current_ids is None:
+            current_ids = set(
+                through.objects.filter(**{source_name: instance.pk}).values_list(f"{target_name}_id", flat=True)
+            )
+        added_ids = member_ids - current_ids
+        removed_ids = current_ids - member_ids
+
+        if removed_ids:
+            send_m2m_changed(manager, instance, "pre_remove", removed_ids)
+            through.objects.filter(**{source_name: instance.pk, f"{target_name}__in": removed_ids}).delete()
+            send_m2m_changed(manager, instance, "post_remove", removed_ids)
+        if added_ids:
+            send_m2m_changed(manager, instance, "pre_add", added_ids)
+            through.objects.bulk_create([
+                through(**{f"{source_name}_id": instance.pk, f"{target_name}_id": member_id})
+                for member_id in added_ids
+            ])
+            send_m2m_changed(manager, instance, "post_add", added_ids)
+
+    return added_ids, removed_ids
+
+
+def send_m2m_changed(manager, instance, action, pk_set):
+    m2m_changed.send(
+        sender=manager.through,
+        action=action,
+        instance=instance,
+        reverse=manager.reverse,
+        model=manager.model,
+        pk_set=pk_set,
+        using=router.db_for_write(manager.through, instance=instance),
+    )
@@ -0,0 +1,149 @@
+"""
+Request metrics shared between the processes of a multi-worker server.
+
+Every process keeps its own counters and histograms in memory and writes them,
+at most once per METRICS_FLUSH_INTERVAL seconds, to its own file in METRICS_DIR, named by
+the process id and a random suffix, so a process reusing the id of a stopped one gets a new file.
+The /metrics endpoint sums up the files of all processes and renders them in the
+Prometheus text format. Files of stopped processes are kept, so the totals never
+go down; empty METRICS_DIR when the server is redeployed.
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+METRICS = {
+    "http_requests_total": ("counter", "Number of handled requests.", None),
+    "http_request_errors_total": ("counter", "Number of requests that ended with a server error.", None),
+    "http_request_duration_seconds": ("histogram", "Time spent handling a request.", DURATION_BUCKETS),
+    "db_queries_per_request": ("histogram", "Number of SQL queries run by a request.", QUERY_COUNT_BUCKETS),
+    "db_duration_seconds": ("histogram", "Time a request spent in SQL queries.", DURATION_BUCKETS),
+}
+
+
+class Registry:
+    """Counters and histograms of the current process, keyed by metric name and labels."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.file_name = f"{self.pid}-{uuid.uuid4().hex}.json"
+        self.values = {}
+        self.lock = threading.Lock()
+        self.flushed_at = 0.0
+
+    def increment(self, name, labels, value=1):
+        key = self.key(name, labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.values.setdefault(key, [0] * len(buckets) + [0, 0.0])
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[index] += 1
+            histogram[-2] += 1
+            histogram[-1] += value
+
+    @staticmethod
+    def key(name, labels):
+        return json.dumps([name, sorted(labels.items())])
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.flushed_at < settings.METRICS_FLUSH_INTERVAL:
+            return
+        with self.lock:
+            payload = json.dumps(self.values)
+            self.flushed_at = now
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        path = os.path.join(settings.METRICS_DIR, self.file_name)
+        with open(f"{path}.tmp", "w") as file:
+            file.write(payload)
+        os.replace(f"{path}.tmp", path)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """The registry of the current process. A forked worker starts with an empty one."""
+    global _registry
+    with _registry_lock:
+        if _registry is None or _registry.pid != os.getpid():
+            _registry = Registry()
+            atexit.register(_registry.flush, force=True)
+        return _registry
+
+
+def reset_registry():
+    """Drop the values of the current process without writing them."""
+    global _registry
+    with _registry_lock:
+        if _registry is not None:
+            atexit.unregister(_registry.flush)
+        _registry = None
+
+
+def collect():
+    """Sum up the values written by all processes."""
+    totals = {}
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.json")):
+        try:
+            with open(path) as file:
+                values = json.load(file)
+        except (OSError, ValueError):
+            continue
+        for key, value in values.items():
+            if isinstance(value, list):
+                total = totals.setdefault(key, [0] * len(value))
+                totals[key] = [left + right for left, right in zip(total, value)]
+            else:
+                totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def format_labels(labels, **extra):
+    labels = list(labels) + list(extra.items())
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels) + "}"
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus():
+    get_registry().flush(force=True)
+    series = {}
+    for key, value in collect().items():
+        name, labels = json.loads(key)
+        series.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (metric_type, description, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in sorted(series.get(name, []), key=lambda item: item[0]):
+            if metric_type == "counter":
+                lines.append(f"{name}{format_labels(labels)} {value}")
+                continue
+            for bound, count in zip(buckets, value):
+                lines.append(f"{name}_bucket{format_labels(labels, le=bound)} {count}")
+            lines.append(f'{name}_bucket{format_labels(labels, le="+Inf")} {value[-2]}')
+            lines.append(f"{name}_sum{format_labels(labels)} {value[-1]}")
+            lines.append(f"{name}_count{format_labels(labels)} {value[-2]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,260 @@
+import cProfile
+import hmac
+import json
+import logging
+import random
+import time
+import tracemalloc
+import warnings
+import zoneinfo
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.utils import timezone
+
+from task_manager import metrics, profiling
+from task_manager.instrumentation import NPlusOneQueries, NPlusOneWarning, RepeatedQueryDetector, recording_queries
+
+timing_logger = logging.getLogger("task_manager.timing")
+nplusone_logger = logging.getLogger("task_manager.nplusone")
+
+
+class RequestTiming:
+    """Points in time of a request, filled in by ServerTimingMiddleware."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = None
+        self.view_end = None
+        self.render_end = None
+        self.end = None
+
+    def durations(self):
+        """Durations in milliseconds of the view, of the template rendering and of the whole request."""
+        view_start = self.view_start or self.start
+        view_end = self.view_end or self.end
+        return {
+            "view": (view_end - view_start) * 1000,
+            "render": (self.render_end - view_end) * 1000 if self.render_end else 0.0,
+            "total": (self.end - self.start) * 1000,
+        }
+
+
+class ServerTimingMiddleware:
+    """
+    Measure the SQL time and query count, the view time, the template rendering time
+    and the total time of a sample of requests. The measurements are logged as a JSON line
+    to the `task_manager.timing` logger and sent in the Server-Timing header when
+    SERVER_TIMING_HEADER is set or the user is staff.
+    Only views returning a TemplateResponse have their rendering time measured apart from the view time.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        self.send_header = settings.SERVER_TIMING_HEADER
+
+    def __call__(self, request):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        request.timing = RequestTiming()
+        with recording_queries() as queries:
+            response = self.get_response(request)
+        request.timing.end = time.perf_counter()
+
+        durations = request.timing.durations()
+        user = getattr(request, "user", None)
+        if self.send_header or (user and user.is_staff):
+            metrics = [
+                f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} queries"',
+                f"view;dur={durations['view']:.1f}",
+                f"render;dur={durations['render']:.1f}",
+                f"total;dur={durations['total']:.1f}",
+            ]
+            if response.has_header("Server-Timing"):
+                metrics.insert(0, response["Server-Timing"])
+            response["Server-Timing"] = ", ".join(metrics)
+
+        resolver_match = request.resolver_match
+        timing_logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "view": resolver_match.view_name if resolver_match else None,
+            "status": response.status_code,
+            "user_id": user.id if user and user.is_authenticated else None,
+            "db_queries": queries.count,
+            "db_ms": round(queries.duration * 1000, 2),
+            "view_ms": round(durations["view"], 2),
+            "render_ms": round(durations["render"], 2),
+            "total_ms": round(durations["total"], 2),
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, "timing"):
+            request.timing.view_start = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        if hasattr(request, "timing"):
+            timing = request.timing
+            timing.view_end = time.perf_counter()
+
+            def mark_render_end(rendered_response):
+                timing.render_end = time.perf_counter()
+
+            response.add_post_render_callback(mark_render_end)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Count requests and server errors and observe the latency, the SQL query count and the SQL time
+    of every request, labeled by the resolved URL name. The values are exposed by the /metrics endpoint.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with recording_queries() as queries:
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        resolver_match = request.resolver_match
+        view = resolver_match.view_name if resolver_match else "unresolved"
+        if view == "metrics":
+            return response
+
+        registry = metrics.get_registry()
+        labels = {"view": view}
+        registry.increment(
+            "http_requests_total", {"view": view, "method": request.method, "status": str(response.status_code)}
+        )
+        if response.status_code >= 500:
+            registry.increment("http_request_errors_total", labels)
+        registry.observe("http_request_duration_seconds", labels, duration)
+        registry.observe("db_queries_per_request", labels, queries.count)
+        registry.observe("db_duration_seconds", labels, queries.duration)
+        registry.flush()
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Run cProfile, and tracemalloc when PROFILING_TRACEMALLOC is set, for requests sent with
+    the PROFILING_TOKEN in the X-Profile-Token header and for a PROFILING_SAMPLE_RATE share of all requests.
+    The profile is saved to PROFILING_DIR. Its id is returned in the X-Profile-Id header
+    to the requests with the token and to staff users only.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        has_token = self.has_token(request)
+        if not has_token and not self.is_sampled():
+            return self.get_response(request)
+
+        trace_memory = settings.PROFILING_TRACEMALLOC and profiling.start_tracemalloc()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with recording_queries() as queries:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration = time.perf_counter() - start
+
+        snapshot = None
+        resolver_match = request.resolver_match
+        user = getattr(request, "user", None)
+        info = {
+            "view": resolver_match.view_name if resolver_match else "unresolved",
+            "path": request.get_full_path(),
+            "method": request.method,
+            "status": response.status_code,
+            "user_id": user.id if user and user.is_authenticated else None,
+            "db_queries": queries.count,
+            "db_ms": round(queries.duration * 1000, 2),
+            "total_ms": round(duration * 1000, 2),
+            "created": time.time(),
+        }
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            info["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        profile_id = profiling.save_profile(profiler, info, snapshot)
+        if has_token or (user and user.is_staff):
+            response["X-Profile-Id"] = profile_id
+        return response
+
+    @staticmethod
+    def has_token(request):
+        token = request.headers.get("X-Profile-Token")
+        return bool(token and settings.PROFILING_TOKEN and hmac.compare_digest(token, settings.PROFILING_TOKEN))
+
+    @staticmethod
+    def is_sampled():
+        return bool(settings.PROFILING_SAMPLE_RATE) and random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+class NPlusOneMiddleware:
+    """
+    Report the SQL statements a request runs more than NPLUSONE_THRESHOLD times with different literals,
+    usually a foreign key read in a loop. Depending on NPLUSONE_MODE the report is logged to
+    the `task_manager.nplusone` logger ("log"), issued as an NPlusOneWarning ("warn")
+    or raised as an NPlusOneQueries exception ("raise"). The detector is off when the mode is empty.
+    """
+
+    MODES = ("log", "warn", "raise")
+
+    def __init__(self, get_response):
+        if not settings.NPLUSONE_MODE:
+            raise MiddlewareNotUsed
+        if settings.NPLUSONE_MODE not in self.MODES:
+            raise ImproperlyConfigured(f"NPLUSONE_MODE must be one of {', '.join(self.MODES)}.")
+        self.get_response = get_response
+        self.mode = settings.NPLUSONE_MODE
+        self.threshold = settings.NPLUSONE_THRESHOLD
+
+    def __call__(self, request):
+        detector = RepeatedQueryDetector(self.threshold)
+        with recording_queries(detector):
+            response = self.get_response(request)
+            if response.streaming:
+                return response
+
+        if detector.repeated():
+            resolver_match = request.resolver_match
+            report = detector.report(resolver_match.view_name if resolver_match else request.path)
+            if self.mode == "raise":
+                raise NPlusOneQueries(report)
+            if self.mode == "warn":
+                warnings.warn(report, NPlusOneWarning)
+            else:
+                nplusone_logger.warning(report)
+        return response
+
+
+class TimezoneMiddleware:
+    """
+    Activate the time zone of the signed in worker, so dates are rendered and form input is parsed
+    in the worker's local time. Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.user.is_authenticated:
+            timezone.activate(zoneinfo.ZoneInfo(request.user.timezone))
+        else:
+            timezone.deactivate()
+        try:
+            return self.get_response(request)
+        finally:
+            timezone.deactivate()
@@ -0,0 +1,40 @@
+# Generated by Django 4.1 on 2026-10-18 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("task_manager", "0004_alter_worker_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["deadline", "id"], name="task_deadline_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["responsible", "deadline"],
+                name="task_open_responsible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["author", "deadline"],
+                name="task_open_author_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["author", "responsible", "deadline"],
+                name="task_open_author_resp_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.1 on 2026-10-18 17:53
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def populate_project_progress(apps, schema_editor):
+    Task = apps.get_model("task_manager", "Task")
+    ProjectProgress = apps.get_model("task_manager", "ProjectProgress")
+
+    rows = Task.followers.through.objects.values("task__project_id", "worker_id").annotate(
+        num_tasks=Count("id"),
+        num_completed_tasks=Count("id", filter=Q(task__is_completed=True))
+    ).order_by()
+    ProjectProgress.objects.bulk_create(
+        [
+            ProjectProgress(
+                project_id=row["task__project_id"],
+                worker_id=row["worker_id"],
+                num_tasks=row["num_tasks"],
+                num_completed_tasks=row["num_completed_tasks"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("task_manager", "0005_task_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("num_tasks", models.IntegerField(default=0)),
+                ("num_completed_tasks", models.IntegerField(default=0)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="worker_progress",
+                        to="task_manager.project",
+                    ),
+                ),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="project_progress",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="projectprogress",
+            constraint=models.UniqueConstraint(
+                fields=("project", "worker"), name="unique_project_worker_progress"
+            ),
+        ),
+        migrations.RunPython(populate_project_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.1 on 2026-10-18 18:18
+
+from django.db import migrations
+import task_manager.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0006_project_progress"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="worker",
+            managers=[
+                ("objects", task_manager.models.WorkerManager()),
+            ],
+        ),
+    ]
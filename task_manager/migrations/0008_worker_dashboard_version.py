@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0007_alter_worker_managers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="dashboard_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
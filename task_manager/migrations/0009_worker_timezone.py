@@ -0,0 +1,19 @@
+# Generated by Django 4.1 on 2026-10-18 18:23
+
+from django.db import migrations, models
+import task_manager.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0008_worker_dashboard_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="timezone",
+            field=models.CharField(default="UTC", max_length=63, validators=[task_manager.models.validate_timezone]),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.1 on 2026-10-18 18:30
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0009_worker_timezone"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="position",
+            index=models.Index(django.db.models.functions.text.Lower("name"), name="position_name_lower_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="worker",
+            index=models.Index(django.db.models.functions.text.Lower("first_name"), name="worker_first_name_lower_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="worker",
+            index=models.Index(django.db.models.functions.text.Lower("last_name"), name="worker_last_name_lower_idx"),
+        ),
+    ]
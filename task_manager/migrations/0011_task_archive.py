@@ -0,0 +1,98 @@
+# Generated by Django 4.1 on 2026-10-18 18:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+import django.db.models.deletion
+
+
+def populate_closed_time(apps, schema_editor):
+    # The time tasks were closed at wasn't recorded before, their deadline is the closest estimate.
+    Task = apps.get_model("task_manager", "Task")
+    Task.objects.filter(is_completed=True).update(closed_time=F("deadline"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0010_worker_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=255)),
+                ("is_completed", models.BooleanField(default=True)),
+                ("status", models.CharField(choices=[("new", "New"), ("progress", "In progress"), ("blocked", "Blocked"), ("review", "Under review"), ("completed", "Completed"), ("cancelled", "Cancelled")], max_length=255)),
+                ("created_time", models.DateTimeField()),
+                ("closed_time", models.DateTimeField(blank=True, null=True)),
+                ("archived_time", models.DateTimeField(auto_now_add=True)),
+                ("deadline", models.DateTimeField()),
+                ("description", models.TextField()),
+            ],
+            options={
+                "ordering": ["deadline"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedTaskFollower",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="closed_time",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_closed_time, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(condition=models.Q(("is_completed", True)), fields=["closed_time", "id"], name="task_closed_time_idx"),
+        ),
+        migrations.AddField(
+            model_name="archivedtaskfollower",
+            name="task",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="followings", to="task_manager.archivedtask"),
+        ),
+        migrations.AddField(
+            model_name="archivedtaskfollower",
+            name="worker",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="archived_task_followings", to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="author",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name="created_archived_tasks", to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="followers",
+            field=models.ManyToManyField(related_name="followed_archived_tasks", through="task_manager.ArchivedTaskFollower", to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="project",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name="archived_tasks", to="task_manager.project"),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="responsible",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name="archived_tasks_to_do", to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="task_type",
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.SET_DEFAULT, related_name="archived_tasks", to="task_manager.tasktype"),
+        ),
+        migrations.AddConstraint(
+            model_name="archivedtaskfollower",
+            constraint=models.UniqueConstraint(fields=("task", "worker"), name="unique_archived_task_follower"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["deadline", "id"], name="archived_task_deadline_id_idx"),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def fix_canceled_status(apps, schema_editor):
+    # Task templates used to post the misspelled "canceled" status,
+    # those tasks were closed but never got a closed time.
+    Task = apps.get_model("task_manager", "Task")
+    Task.objects.filter(status="canceled", closed_time__isnull=True).update(closed_time=F("deadline"))
+    Task.objects.filter(status="canceled").update(status="cancelled")
+
+    ArchivedTask = apps.get_model("task_manager", "ArchivedTask")
+    ArchivedTask.objects.filter(status="canceled").update(status="cancelled")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0011_task_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(fix_canceled_status, migrations.RunPython.noop),
+    ]
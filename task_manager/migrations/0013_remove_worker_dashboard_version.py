@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 19:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0012_fix_canceled_task_status"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="worker",
+            name="dashboard_version",
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.1 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0013_remove_worker_dashboard_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskImport",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("num_rows", models.PositiveIntegerField(default=0)),
+                ("updated_time", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
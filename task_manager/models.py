@@ -1,13 +1,22 @@
-from django.contrib.auth.models import AbstractUser
+import zoneinfo
+
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Lower
 from django.urls import reverse
 
+from task_manager import batching
+
 
 class Position(models.Model):
     name = models.CharField(max_length=255, unique=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(Lower("name"), name="position_name_lower_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -31,6 +40,15 @@ class TaskType(models.Model):
         return self._meta.verbose_name
 
 
+def validate_timezone(value):
+    if value not in zoneinfo.available_timezones():
+        raise ValidationError(f"{value} is not a known time zone.")
+
+
+class WorkerManager(UserManager.from_queryset(batching.BatchLoadingQuerySet)):
+    pass
+
+
 class Worker(AbstractUser):
     position = models.ForeignKey(
         Position,
@@ -39,10 +57,18 @@ class Worker(AbstractUser):
         blank=True,
         null=True
     )
+    timezone = models.CharField(max_length=63, default="UTC", validators=[validate_timezone])
+
+    objects = WorkerManager()
 
     class Meta:
         verbose_name = "user"
         ordering = ["position__name", "first_name", "last_name"]
+        # Prefix search of the worker autocomplete, see task_manager.autocomplete.
+        indexes = [
+            models.Index(Lower("first_name"), name="worker_first_name_lower_idx"),
+            models.Index(Lower("last_name"), name="worker_last_name_lower_idx"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -66,6 +92,8 @@ class Project(models.Model):
     assignees = models.ManyToManyField(Worker, related_name="all_projects")
     description = models.TextField(blank=True, null=True)
 
+    objects = batching.BatchLoadingQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -100,6 +128,8 @@ class Task(models.Model):
         default="new"
     )
     created_time = models.DateTimeField(auto_now_add=True)
+    # Set when the task is completed or cancelled, closed tasks are moved to ArchivedTask after a while.
+    closed_time = models.DateTimeField(null=True, blank=True)
     deadline = models.DateTimeField()
     description = models.TextField()
     author = models.ForeignKey(
@@ -120,11 +150,154 @@ class Task(models.Model):
         default=1
     )
 
+    objects = batching.BatchLoadingQuerySet.as_manager()
+
     class Meta:
         ordering = ["deadline"]
+        indexes = [
+            models.Index(fields=["deadline", "id"], name="task_deadline_id_idx"),
+            models.Index(
+                fields=["responsible", "deadline"],
+                name="task_open_responsible_idx",
+                condition=models.Q(is_completed=False),
+            ),
+            models.Index(
+                fields=["author", "deadline"],
+                name="task_open_author_idx",
+                condition=models.Q(is_completed=False),
+            ),
+            models.Index(
+                fields=["author", "responsible", "deadline"],
+                name="task_open_author_resp_idx",
+                condition=models.Q(is_completed=False),
+            ),
+            models.Index(
+                fields=["closed_time", "id"],
+                name="task_closed_time_idx",
+                condition=models.Q(is_completed=True),
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # A task handed over to another author or responsible leaves the dashboard
+        # of the previous one, see task_manager.signals.
+        task.loaded_participants = {task.__dict__.get("author_id"), task.__dict__.get("responsible_id")} - {None}
+        return task
+
     def get_absolute_url(self):
         return reverse("task_manager:task-detail", kwargs={"pk": self.pk})
+
+
+class ProjectProgress(models.Model):
+    """
+    Denormalized number of tasks and completed tasks a worker follows in a project.
+    Maintained by task_manager.progress, rebuilt by the rebuild_project_progress command.
+    """
+
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name="worker_progress"
+    )
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        related_name="project_progress"
+    )
+    num_tasks = models.IntegerField(default=0)
+    num_completed_tasks = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["project", "worker"], name="unique_project_worker_progress"),
+        ]
+
+    def __str__(self):
+        return f"{self.project} - {self.worker}: {self.num_completed_tasks}/{self.num_tasks}"
+
+
+class ArchivedTask(models.Model):
+    """
+    A task closed long ago, moved out of the task table with its followers by task_manager.archive.
+    It keeps the id of the task and is restored when it's re-activated.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=255)
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.PROTECT,
+        related_name="archived_tasks"
+    )
+    is_completed = models.BooleanField(default=True)
+    status = models.CharField(
+        max_length=255,
+        choices=Task.TASK_STATUS_CHOICES
+    )
+    created_time = models.DateTimeField()
+    closed_time = models.DateTimeField(null=True, blank=True)
+    archived_time = models.DateTimeField(auto_now_add=True)
+    deadline = models.DateTimeField()
+    description = models.TextField()
+    author = models.ForeignKey(
+        Worker,
+        on_delete=models.PROTECT,
+        related_name="created_archived_tasks"
+    )
+    responsible = models.ForeignKey(
+        Worker,
+        on_delete=models.PROTECT,
+        related_name="archived_tasks_to_do"
+    )
+    followers = models.ManyToManyField(
+        Worker,
+        through="ArchivedTaskFollower",
+        related_name="followed_archived_tasks"
+    )
+    task_type = models.ForeignKey(
+        TaskType,
+        related_name="archived_tasks",
+        on_delete=models.SET_DEFAULT,
+        default=1
+    )
+
+    class Meta:
+        ordering = ["deadline"]
+        indexes = [
+            models.Index(fields=["deadline", "id"], name="archived_task_deadline_id_idx"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse("task_manager:task-detail", kwargs={"pk": self.pk})
+
+
+class ArchivedTaskFollower(models.Model):
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE, related_name="followings")
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="archived_task_followings")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["task", "worker"], name="unique_archived_task_follower"),
+        ]
+
+
+class TaskImport(models.Model):
+    """
+    Progress of a task import, see the import_tasks command. The number of imported rows is written
+    in the transaction of every batch, so an interrupted import resumes right after the last batch.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    num_rows = models.PositiveIntegerField(default=0)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.num_rows} rows"
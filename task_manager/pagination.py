@@ -0,0 +1,141 @@
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder cuts datetimes to milliseconds, a cursor needs the exact key to seek past it."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPage(Sequence):
+    """
+    A page of results fetched by seeking past a key instead of an OFFSET.
+    Mirrors the parts of django.core.paginator.Page used by the templates.
+    """
+
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<Keyset page of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], "next")
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], "prev")
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking on a unique, ascending key, e.g. ("deadline", "id").
+    Pages are addressed by opaque cursors instead of numbers, so neither an exact
+    total count nor an OFFSET scan is needed.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [queryset.model._meta.get_field(name) for name in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        key = [getattr(obj, field.attname) for field in self.fields]
+        payload = json.dumps([direction, key], cls=CursorEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            direction, key = json.loads(payload)
+            if direction not in ("next", "prev") or len(key) != len(self.fields):
+                raise InvalidCursor("Malformed cursor.")
+            return direction, [field.to_python(value) for field, value in zip(self.fields, key)]
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            raise InvalidCursor("Malformed cursor.")
+
+    def seek_filter(self, key, lookup):
+        """Build (f1 > k1) OR (f1 = k1 AND f2 > k2) OR ... for the given comparison lookup."""
+        condition = Q()
+        for position, field_name in enumerate(self.ordering):
+            step = Q(**{f"{field_name}__{lookup}": key[position]})
+            for previous_name, previous_value in zip(self.ordering[:position], key[:position]):
+                step &= Q(**{previous_name: previous_value})
+            condition |= step
+        return condition
+
+    def page(self, cursor=None):
+        if not cursor:
+            object_list = list(self.queryset.order_by(*self.ordering)[:self.per_page + 1])
+            return KeysetPage(object_list[:self.per_page], self, len(object_list) > self.per_page, False)
+
+        direction, key = self.decode_cursor(cursor)
+        if direction == "next":
+            queryset = self.queryset.filter(self.seek_filter(key, "gt")).order_by(*self.ordering)
+            object_list = list(queryset[:self.per_page + 1])
+            return KeysetPage(object_list[:self.per_page], self, len(object_list) > self.per_page, True)
+
+        descending = [f"-{field_name}" for field_name in self.ordering]
+        queryset = self.queryset.filter(self.seek_filter(key, "lt")).order_by(*descending)
+        object_list = list(queryset[:self.per_page + 1])
+        return KeysetPage(object_list[:self.per_page][::-1], self, True, len(object_list) > self.per_page)
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that replaces page-number pagination with keyset pagination.
+    The page is selected by the opaque `cursor` GET parameter.
+    """
+
+    keyset_ordering = None
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid page cursor.")
+        return paginator, page, page.object_list, page.has_other_pages()
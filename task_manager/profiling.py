@@ -0,0 +1,68 @@
+"""
+Profiles of single requests, written by ProfilingMiddleware and aggregated by the profile_report command.
+
+Every profile is a pair of files in PROFILING_DIR: a `.prof` file in the cProfile format
+and a `.json` file with the URL name, path, query count, user id and durations of the request,
+and the biggest memory allocations when tracemalloc was enabled. Only the PROFILING_MAX_PROFILES
+latest profiles are kept.
+"""
+import glob
+import json
+import os
+import time
+import tracemalloc
+
+from django.conf import settings
+
+
+def save_profile(profiler, info, snapshot=None):
+    """Write the profile of a request and return its id."""
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    profile_id = f"{info['view'].replace(':', '.')}-{time.time_ns()}-{os.getpid()}"
+    path = os.path.join(settings.PROFILING_DIR, profile_id)
+
+    if snapshot is not None:
+        info["allocations"] = [
+            {"location": str(statistic.traceback), "size": statistic.size, "count": statistic.count}
+            for statistic in snapshot.statistics("lineno")[:settings.PROFILING_TRACEMALLOC_TOP]
+        ]
+    profiler.dump_stats(f"{path}.prof")
+    with open(f"{path}.json", "w") as file:
+        json.dump(info, file)
+    prune_profiles(settings.PROFILING_DIR, settings.PROFILING_MAX_PROFILES)
+    return profile_id
+
+
+def prune_profiles(directory, max_profiles):
+    """Delete the oldest profiles of the directory, keeping the `max_profiles` latest ones."""
+    info_paths = sorted(glob.glob(os.path.join(directory, "*.json")), key=os.path.getmtime)
+    for info_path in info_paths[:max(len(info_paths) - max_profiles, 0)]:
+        for path in (info_path, f"{info_path[:-len('.json')]}.prof"):
+            # Another server process may be pruning the same profiles.
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def load_profiles(directory, views=None):
+    """Pairs of the `.prof` path and the request info of the profiles in the directory."""
+    profiles = []
+    for info_path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        profile_path = f"{info_path[:-len('.json')]}.prof"
+        if not os.path.exists(profile_path):
+            continue
+        with open(info_path) as file:
+            info = json.load(file)
+        if views and info["view"] not in views:
+            continue
+        profiles.append((profile_path, info))
+    return profiles
+
+
+def start_tracemalloc():
+    """Start tracing memory allocations, return False when they were already traced by someone else."""
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start()
+    return True
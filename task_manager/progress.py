@@ -0,0 +1,111 @@
+import heapq
+from itertools import groupby, islice
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from task_manager.models import ArchivedTaskFollower, Task, ProjectProgress
+
+
+def add_followers(task, worker_ids):
+    """Count the task in the project progress of the workers who started following it."""
+    worker_ids = set(worker_ids)
+    if not worker_ids:
+        return
+    with transaction.atomic():
+        ProjectProgress.objects.bulk_create(
+            [ProjectProgress(project_id=task.project_id, worker_id=worker_id) for worker_id in worker_ids],
+            ignore_conflicts=True
+        )
+        ProjectProgress.objects.filter(project_id=task.project_id, worker_id__in=worker_ids).update(
+            num_tasks=F("num_tasks") + 1,
+            num_completed_tasks=F("num_completed_tasks") + int(task.is_completed)
+        )
+
+
+def remove_followers(task, worker_ids):
+    """Stop counting the task in the project progress of the workers who unfollowed it."""
+    worker_ids = set(worker_ids)
+    if not worker_ids:
+        return
+    ProjectProgress.objects.filter(project_id=task.project_id, worker_id__in=worker_ids).update(
+        num_tasks=F("num_tasks") - 1,
+        num_completed_tasks=F("num_completed_tasks") - int(task.is_completed)
+    )
+
+
+def count(followings):
+    return Coalesce(Subquery(followings.annotate(count=Count("id")).values("count")), 0)
+
+
+def recount(tasks, worker_ids=None):
+    """
+    Recount the project progress of the workers in the projects of the tasks of the queryset after a bulk
+    change of the tasks or of their followers, of the followers of the tasks by default. The counters
+    are recomputed in SQL from the current state of the tasks, so they stay exact whichever
+    of the tasks were actually changed. Archived tasks are closed and count as completed.
+    """
+    if worker_ids is None:
+        worker_ids = Task.followers.through.objects.filter(task__in=tasks).values("worker_id")
+    followings = Task.followers.through.objects.filter(
+        worker_id=OuterRef("worker_id"),
+        task__project_id=OuterRef("project_id")
+    ).order_by().values("worker_id")
+    archived_followings = ArchivedTaskFollower.objects.filter(
+        worker_id=OuterRef("worker_id"),
+        task__project_id=OuterRef("project_id")
+    ).order_by().values("worker_id")
+    ProjectProgress.objects.filter(
+        project_id__in=tasks.values("project_id"),
+        worker_id__in=worker_ids
+    ).update(
+        num_tasks=count(followings) + count(archived_followings),
+        num_completed_tasks=count(followings.filter(task__is_completed=True)) + count(archived_followings)
+    )
+
+
+def rebuild(project_ids=None, batch_size=1000):
+    """
+    Recompute the project progress from the tasks and the archived tasks and their followers.
+    Returns the number of rows.
+    """
+    followings = Task.followers.through.objects.all()
+    archived_followings = ArchivedTaskFollower.objects.all()
+    existing = ProjectProgress.objects.all()
+    if project_ids is not None:
+        followings = followings.filter(task__project_id__in=project_ids)
+        archived_followings = archived_followings.filter(task__project_id__in=project_ids)
+        existing = existing.filter(project_id__in=project_ids)
+
+    rows = followings.values("worker_id", project_id=F("task__project_id")).annotate(
+        num_tasks=Count("id"),
+        num_completed_tasks=Count("id", filter=Q(task__is_completed=True))
+    ).order_by("project_id", "worker_id")
+    archived_rows = archived_followings.values("worker_id", project_id=F("task__project_id")).annotate(
+        num_tasks=Count("id"),
+        num_completed_tasks=Count("id")
+    ).order_by("project_id", "worker_id")
+
+    total = 0
+    with transaction.atomic():
+        existing.delete()
+        progress = merge_rows(rows.iterator(chunk_size=batch_size), archived_rows.iterator(chunk_size=batch_size))
+        while batch := list(islice(progress, batch_size)):
+            ProjectProgress.objects.bulk_create(batch)
+            total += len(batch)
+    return total
+
+
+def merge_rows(*row_sets):
+    """Sum the counts of the rows of the same project and worker, every row set is ordered by project and worker."""
+    key = itemgetter("project_id", "worker_id")
+    for (project_id, worker_id), group in groupby(heapq.merge(*row_sets, key=key), key=key):
+        group = list(group)
+        yield ProjectProgress(
+            project_id=project_id,
+            worker_id=worker_id,
+            num_tasks=sum(row["num_tasks"] for row in group),
+            num_completed_tasks=sum(row["num_completed_tasks"] for row in group)
+        )
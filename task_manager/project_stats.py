@@ -0,0 +1,108 @@
+"""
+Task statistics of a project: counts per status, per task type and per responsible worker, and the overdue count.
+
+All of them are folded from a single query, the GROUP BY over the tasks united with the one over the archived
+tasks, and cached per project. The cache is cleared when a task of the project is saved or deleted
+(see task_manager.signals) and by the bulk writers through invalidate(). A cached value also expires when
+the nearest deadline of an open task passes, so the overdue count never goes stale.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DateTimeField, Min, Q, Value
+from django.utils import timezone
+
+from task_manager.models import ArchivedTask, Project, Task
+
+
+def cache_key(project_id):
+    return f"task_manager:project-stats:{project_id}"
+
+
+def compute(project_id):
+    now = timezone.now()
+    open_tasks = Q(is_completed=False)
+    fields = (
+        "status",
+        "task_type_id",
+        "task_type__name",
+        "responsible_id",
+        "responsible__first_name",
+        "responsible__last_name",
+    )
+    groups = (
+        Task.objects.filter(project_id=project_id)
+        .order_by()
+        .values(*fields)
+        .annotate(
+            count=Count("id"),
+            overdue=Count("id", filter=open_tasks & Q(deadline__lt=now)),
+            next_deadline=Min("deadline", filter=open_tasks & Q(deadline__gte=now)),
+        )
+    )
+    # Archived tasks are closed, they are never overdue.
+    archived_groups = (
+        ArchivedTask.objects.filter(project_id=project_id)
+        .order_by()
+        .values(*fields)
+        .annotate(
+            count=Count("id"),
+            overdue=Value(0),
+            next_deadline=Value(None, output_field=DateTimeField()),
+        )
+    )
+
+    by_status = {status: 0 for status, _ in Task.TASK_STATUS_CHOICES}
+    by_task_type = {}
+    by_responsible = {}
+    total = overdue = 0
+    next_deadline = None
+    for group in groups.union(archived_groups, all=True):
+        total += group["count"]
+        overdue += group["overdue"]
+        by_status[group["status"]] = by_status.get(group["status"], 0) + group["count"]
+
+        task_type = by_task_type.setdefault(group["task_type_id"], {"name": group["task_type__name"], "count": 0})
+        task_type["count"] += group["count"]
+
+        responsible = by_responsible.setdefault(group["responsible_id"], {
+            "id": group["responsible_id"],
+            "name": f"{group['responsible__first_name']} {group['responsible__last_name']}",
+            "count": 0,
+            "overdue": 0,
+        })
+        responsible["count"] += group["count"]
+        responsible["overdue"] += group["overdue"]
+
+        if group["next_deadline"] and (next_deadline is None or group["next_deadline"] < next_deadline):
+            next_deadline = group["next_deadline"]
+
+    status_labels = dict(Task.TASK_STATUS_CHOICES)
+    return {
+        "total": total,
+        "overdue": overdue,
+        "by_status": [
+            {"status": status, "label": status_labels.get(status, status), "count": count}
+            for status, count in by_status.items()
+        ],
+        "by_task_type": sorted(by_task_type.values(), key=lambda item: (-item["count"], item["name"])),
+        "by_responsible": sorted(by_responsible.values(), key=lambda item: (-item["count"], item["name"])),
+        "next_deadline": next_deadline,
+    }
+
+
+def get_project_stats(project_id):
+    stats = cache.get(cache_key(project_id))
+    if stats is None or (stats["next_deadline"] and stats["next_deadline"] <= timezone.now()):
+        stats = compute(project_id)
+        timeout = settings.PROJECT_STATS_CACHE_TIMEOUT
+        if stats["next_deadline"]:
+            timeout = min(timeout, int((stats["next_deadline"] - timezone.now()).total_seconds()) + 1)
+        cache.set(cache_key(project_id), stats, timeout)
+    return stats
+
+
+def invalidate(project_ids=None):
+    """Clear the cached statistics of the projects, of all projects when `project_ids` is None."""
+    if project_ids is None:
+        project_ids = Project.objects.values_list("id", flat=True)
+    cache.delete_many([cache_key(project_id) for project_id in project_ids])
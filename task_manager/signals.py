@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from task_manager import dashboard, project_stats
+from task_manager.models import Task, TaskType
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_project_stats_of_task(sender, instance, **kwargs):
+    project_stats.invalidate([instance.project_id])
+
+
+@receiver(post_save, sender=TaskType)
+@receiver(post_delete, sender=TaskType)
+def invalidate_project_stats_of_task_type(sender, **kwargs):
+    project_stats.invalidate()
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_project_stats_of_responsible(sender, instance, created, update_fields=None, **kwargs):
+    # Logging in only updates `last_login`, which the statistics don't show.
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    project_stats.invalidate(
+        Task.objects.filter(responsible=instance).order_by().values_list("project_id", flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_dashboards_of_task(sender, instance, **kwargs):
+    # A task handed over to another author or responsible leaves the dashboard of the previous one,
+    # the participants the task was loaded with are kept by Task.from_db().
+    participants = {instance.author_id, instance.responsible_id}
+    previous_participants = getattr(instance, "loaded_participants", set())
+    instance.loaded_participants = participants
+    followers = Task.followers.through.objects.filter(task_id=instance.pk).values("worker_id")
+    dashboard.invalidate(
+        get_user_model().objects.filter(
+            Q(id__in=participants | previous_participants) | Q(id__in=followers)
+        ).values("id")
+    )
+
+
+@receiver(post_save, sender=TaskType)
+@receiver(post_delete, sender=TaskType)
+def invalidate_dashboards_of_task_type(sender, **kwargs):
+    # Task type names are shown on the dashboards and in the task filters, and deleting a task type
+    # moves its tasks to the default one without sending signals.
+    dashboard.invalidate_task_types()
+
+
+@receiver(m2m_changed, sender=Task.followers.through)
+def invalidate_dashboards_of_followers(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        dashboard.invalidate([instance.pk])
+    elif action == "pre_clear":
+        dashboard.invalidate(instance.followers.values("id"))
+    else:
+        dashboard.invalidate(pk_set)
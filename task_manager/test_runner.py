@@ -0,0 +1,22 @@
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from task_manager import metrics
+
+
+class TestRunner(DiscoverRunner):
+    """Test runner writing the request metrics of the test run to a temporary METRICS_DIR."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(METRICS_DIR=self.metrics_dir.name)
+        self.settings_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        metrics.reset_registry()
+        self.settings_override.disable()
+        self.metrics_dir.cleanup()
+        super().teardown_test_environment(**kwargs)
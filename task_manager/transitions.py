@@ -0,0 +1,81 @@
+"""
+Task status transitions.
+
+The allowed transitions are declared over Task.TASK_STATUS_CHOICES together with the roles of the workers
+allowed to make them. A transition is applied as one conditional UPDATE ... WHERE status IN (...) that also
+checks the role, so no task is read and written back: of two concurrent writers moving a task out of
+the same status only the first one changes it, the second one gets 0 affected rows.
+
+UPDATE sends no signals, so the project progress, the project statistics and the dashboards
+of the participants are refreshed here.
+"""
+import operator
+from functools import reduce
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Now
+
+from task_manager import dashboard, progress, project_stats
+
+OPEN_STATUSES = ("new", "progress", "blocked", "review")
+CLOSED_STATUSES = ("completed", "cancelled")
+
+
+class Transition(NamedTuple):
+    sources: tuple
+    target: str
+    roles: tuple
+
+
+TRANSITIONS = (
+    *(Transition(OPEN_STATUSES, status, ("author", "responsible")) for status in OPEN_STATUSES),
+    Transition(OPEN_STATUSES, "completed", ("author", "responsible")),
+    Transition(OPEN_STATUSES, "cancelled", ("author",)),
+    # The author restarts a closed task, the responsible reopens a task they completed.
+    Transition(CLOSED_STATUSES, "new", ("author",)),
+    Transition(("completed",), "progress", ("responsible",)),
+)
+
+
+def get_condition(status, user):
+    """Return the condition of the tasks the worker may move to the status, None when there are none."""
+    conditions = [
+        Q(status__in=transition.sources) & reduce(operator.or_, (Q(**{role: user}) for role in transition.roles))
+        for transition in TRANSITIONS
+        if transition.target == status
+    ]
+    return reduce(operator.or_, conditions) if conditions else None
+
+
+def can_change(task, status, user):
+    """Check a loaded task, e.g. to show the actions available to the worker."""
+    return any(
+        task.status in transition.sources
+        and any(getattr(task, f"{role}_id") == user.id for role in transition.roles)
+        for transition in TRANSITIONS
+        if transition.target == status
+    )
+
+
+def apply(tasks, status, user):
+    """
+    Move the tasks of the queryset the worker is allowed to change to the status, in one UPDATE.
+    Returns the number of changed tasks, the other tasks are left as they are.
+    """
+    condition = get_condition(status, user)
+    if condition is None:
+        return 0
+    with transaction.atomic():
+        is_closed = status in CLOSED_STATUSES
+        changed = tasks.filter(condition).update(
+            status=status,
+            is_completed=is_closed,
+            closed_time=Now() if is_closed else None
+        )
+        if changed:
+            progress.recount(tasks)
+            project_stats.invalidate(tasks.order_by().values_list("project_id", flat=True).distinct())
+            dashboard.invalidate_participants(tasks)
+    return changed
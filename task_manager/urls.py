@@ -2,11 +2,13 @@ from django.urls import path
 
 from task_manager.views import (
     index,
+    worker_autocomplete,
     WorkerListView,
     WorkerDetailView,
     WorkerCreateView,
     WorkerUpdateView,
     WorkerToggleIsActiveView,
+    WorkerDeactivateView,
     WorkerDeleteView,
     PositionListView,
     PositionCreateView,
@@ -18,12 +20,17 @@ from task_manager.views import (
     TaskTypeDeleteView,
     ProjectListView,
     ProjectDetailView,
+    ProjectParticipantListView,
+    ProjectTaskListView,
     ProjectCreateView,
     ProjectUpdateView,
     ProjectDeleteView,
     ProjectToggleIsActiveView,
     TaskListView,
+    TaskExportView,
+    ArchivedTaskListView,
     TaskDetailView,
+    TaskFollowerListView,
     TaskCreateView,
     TaskUpdateView,
     TaskStatusToggleView
@@ -32,6 +39,7 @@ from task_manager.views import (
 urlpatterns = [
     path("", index, name="index"),
     path("workers/", WorkerListView.as_view(), name="worker-list"),
+    path("workers/autocomplete/", worker_autocomplete, name="worker-autocomplete"),
     path("workers/<int:pk>/", WorkerDetailView.as_view(), name="worker-detail"),
     path("workers/create/", WorkerCreateView.as_view(), name="worker-create"),
     path("workers/<int:pk>/update/", WorkerUpdateView.as_view(), name="worker-update"),
@@ -40,6 +48,7 @@ urlpatterns = [
         WorkerToggleIsActiveView.as_view(),
         name="worker-toggle-is-active",
     ),
+    path("workers/<int:pk>/deactivate/", WorkerDeactivateView.as_view(), name="worker-deactivate"),
     path("workers/<int:pk>/delete/", WorkerDeleteView.as_view(), name="worker-delete"),
     path("positions/", PositionListView.as_view(), name="position-list"),
     path("positions/create/", PositionCreateView.as_view(), name="position-create"),
@@ -51,6 +60,8 @@ urlpatterns = [
     path("task_types/<int:pk>/delete/", TaskTypeDeleteView.as_view(), name="task-type-delete"),
     path("projects/", ProjectListView.as_view(), name="project-list"),
     path("projects/<int:pk>/", ProjectDetailView.as_view(), name="project-detail"),
+    path("projects/<int:pk>/participants/", ProjectParticipantListView.as_view(), name="project-participants"),
+    path("projects/<int:pk>/tasks/", ProjectTaskListView.as_view(), name="project-tasks"),
     path("projects/create/", ProjectCreateView.as_view(), name="project-create"),
     path("projects/<int:pk>/update/", ProjectUpdateView.as_view(), name="project-update"),
     path("projects/<int:pk>/delete/", ProjectDeleteView.as_view(), name="project-delete"),
@@ -60,7 +71,10 @@ urlpatterns = [
         name="project-toggle-is-active",
     ),
     path("tasks/", TaskListView.as_view(), name="task-list"),
+    path("tasks/export/<str:file_format>/", TaskExportView.as_view(), name="task-export"),
+    path("tasks/archive/", ArchivedTaskListView.as_view(), name="task-archive"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
+    path("tasks/<int:pk>/followers/", TaskFollowerListView.as_view(), name="task-followers"),
     path("projects/<int:pk>/new_task/", TaskCreateView.as_view(), name="task-create"),
     path("tasks/<int:pk>/update/", TaskUpdateView.as_view(), name="task-update"),
     path("tasks/<int:pk>/status-toggle/<new_status>/", TaskStatusToggleView.as_view(), name="task-status-toggle")
@@ -1,42 +1,87 @@
-import datetime
+import csv
+import json
+from functools import partial
 
 from django_filters import FilterSet, BooleanFilter, ChoiceFilter, views, MultipleChoiceFilter
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count, F, Q, Case, When
+from django.db import transaction
+from django.db.models import Count, F, Q, Case, When, FilteredRelation
+from django.db.models.functions import Coalesce
 from django.forms import RadioSelect, CheckboxSelectMultiple
-from django.http import HttpResponseRedirect
-from django.shortcuts import render, get_object_or_404
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseRedirect, JsonResponse, \
+    StreamingHttpResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
 from django.urls import reverse_lazy, reverse
+from django.utils.functional import cached_property, lazy
 from django.views import generic, View
 
 from task_manager.forms import WorkerCreationForm, WorkerChangeForm, PositionForm, TaskTypeForm, ProjectForm, TaskForm, \
-    TaskStatusUpdateForm
-from task_manager.models import Task, Project, Position, TaskType
+    TaskStatusUpdateForm, TaskBulkActionForm, WorkerDeactivationForm
+from task_manager import archive, autocomplete, bulk_actions, dashboard, deactivation, facets, \
+    metrics as request_metrics, progress, project_stats, transitions
+from task_manager.deletion import annotate_can_be_deleted
+from task_manager.memberships import apply_members
+from task_manager.models import ArchivedTask, Task, Project, Position, TaskType
+from task_manager.pagination import InvalidCursor, KeysetPaginationMixin, KeysetPaginator
 
 
 @login_required
 def index(request):
     """View function for the home page of the site."""
-    today_date = datetime.datetime.today().date()
-    user = request.user
+    context = dashboard.get_dashboard(request.user)
 
-    task_list = Task.objects.filter(deadline__date=today_date, is_completed=False).select_related(
-        "project",
-        "author",
-        "responsible",
-        "task_type"
-    )
-    tasks_to_do = task_list.filter(responsible=user)
-    tasks_created = task_list.filter(author=user)
+    return TemplateResponse(request, "task_manager/index.html", context=context)
 
-    context = {
-        "tasks_to_do": tasks_to_do,
-        "tasks_created": tasks_created,
-    }
 
-    return render(request, "task_manager/index.html", context=context)
+def metrics(request):
+    """View function for the Prometheus metrics of all server processes, only available to the scraping hosts."""
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        raise PermissionDenied
+    return HttpResponse(request_metrics.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@login_required
+def worker_autocomplete(request):
+    """
+    View function for the worker search of the autocomplete widgets. Returns a JSON page of the workers
+    matching the `q` prefixes, optionally only the members of a `project` the user takes part in,
+    and the cursor of the next page.
+    """
+    queryset = get_user_model().objects.select_related("position")
+    if request.GET.get("project"):
+        try:
+            project_id = int(request.GET["project"])
+        except ValueError:
+            return HttpResponseBadRequest("Invalid project id.")
+        # The members of the projects the user doesn't take part in aren't listed.
+        queryset = queryset.filter(all_projects=project_id, all_projects__assignees=request.user)
+    if request.GET.get("exclude_self"):
+        queryset = queryset.exclude(id=request.user.id)
+    queryset = autocomplete.search_workers(queryset, request.GET.get("q", ""))
+
+    try:
+        limit = min(int(request.GET.get("limit", settings.AUTOCOMPLETE_LIMIT)), settings.AUTOCOMPLETE_MAX_LIMIT)
+    except ValueError:
+        limit = settings.AUTOCOMPLETE_LIMIT
+    paginator = KeysetPaginator(queryset, max(limit, 1), ("first_name", "last_name", "id"))
+    try:
+        page = paginator.page(request.GET.get("cursor"))
+    except InvalidCursor:
+        raise Http404("Invalid page cursor.")
+
+    return JsonResponse({
+        "results": [
+            {"id": worker.id, "name": str(worker), "position": worker.position.name if worker.position else None}
+            for worker in page
+        ],
+        "next": page.next_cursor,
+    })
 
 
 class WorkerListView(LoginRequiredMixin, generic.ListView):
@@ -44,7 +89,7 @@ class WorkerListView(LoginRequiredMixin, generic.ListView):
 
     model = get_user_model()
     paginate_by = 20
-    queryset = get_user_model().objects.select_related("position").all()
+    queryset = annotate_can_be_deleted(get_user_model().objects.select_related("position"))
 
 
 class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
@@ -52,6 +97,9 @@ class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
 
     model = get_user_model()
 
+    def get_queryset(self):
+        return annotate_can_be_deleted(super().get_queryset())
+
     def get_context_data(self, **kwargs):
         context = super(WorkerDetailView, self).get_context_data()
         user = self.request.user
@@ -69,18 +117,8 @@ class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
         ).order_by("deadline").select_related("author", "responsible")
         context["tasks_worker_is_author"] = tasks_worker_is_author
 
-        """
-        Code below checks dependencies, that can block the possibility to delete user.
-        'Delete' button in the Detail view will be visible only if User doesn't have such blocking dependencies.
-        """
-
-        context["can_be_deleted"] = False
-        if (
-                not Project.objects.all().filter(author=worker) and
-                not Task.objects.all().filter(author=worker) and
-                not Task.objects.all().filter(responsible=worker)
-        ):
-            context["can_be_deleted"] = True
+        # 'Delete' button is visible only if no project or task references the user as its author or responsible.
+        context["can_be_deleted"] = worker.can_be_deleted
 
         return context
 
@@ -118,13 +156,48 @@ class WorkerDeleteView(LoginRequiredMixin, generic.DeleteView):
 
 class WorkerToggleIsActiveView(LoginRequiredMixin, View):
     @staticmethod
-    def get(request, pk):
+    def post(request, pk):
         user = get_object_or_404(get_user_model(), id=pk)
-        user.is_active = not user.is_active
-        user.save()
+        if user.is_active:
+            # Deactivation hands the open tasks over, it is done on the deactivation page.
+            return HttpResponseRedirect(reverse_lazy("task_manager:worker-deactivate", args=[pk]))
+        user.is_active = True
+        user.save(update_fields=["is_active"])
         return HttpResponseRedirect(reverse_lazy("task_manager:worker-detail", args=[pk]))
 
 
+class WorkerDeactivateView(LoginRequiredMixin, generic.detail.SingleObjectMixin, generic.FormView):
+    """View class for the page for deactivating a worker and handing their open tasks over to another worker."""
+
+    model = get_user_model()
+    queryset = get_user_model().objects.filter(is_active=True)
+    form_class = WorkerDeactivationForm
+    template_name = "task_manager/worker_deactivate.html"
+    context_object_name = "worker"
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return super(WorkerDeactivateView, self).get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return super(WorkerDeactivateView, self).post(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super(WorkerDeactivateView, self).get_context_data(**kwargs)
+        context["num_open_tasks"] = Task.objects.filter(responsible=self.object, is_completed=False).count()
+        return context
+
+    def get_form_kwargs(self):
+        kwargs = super(WorkerDeactivateView, self).get_form_kwargs()
+        kwargs["worker"] = self.object
+        return kwargs
+
+    def form_valid(self, form):
+        deactivation.deactivate(self.object, form.cleaned_data["replacement"])
+        return HttpResponseRedirect(reverse("task_manager:worker-detail", args=[self.object.id]))
+
+
 class PositionListView(LoginRequiredMixin, generic.ListView):
     """
     View class for the page with a list of all positions
@@ -133,7 +206,7 @@ class PositionListView(LoginRequiredMixin, generic.ListView):
 
     model = Position
     paginate_by = 20
-    queryset = Position.objects.annotate(num_workers=Count("workers"))
+    queryset = annotate_can_be_deleted(Position.objects.annotate(num_workers=Count("workers")))
 
 
 class PositionCreateView(LoginRequiredMixin, generic.CreateView):
@@ -177,6 +250,7 @@ class TaskTypeListView(LoginRequiredMixin, generic.ListView):
 
     model = TaskType
     paginate_by = 10
+    queryset = annotate_can_be_deleted(TaskType.objects.all())
     template_name = "task_manager/task_type_list.html"
 
 
@@ -224,25 +298,27 @@ class ProjectFilterSet(FilterSet):
         fields = ["is_active"]
 
 
-class ProjectListView(LoginRequiredMixin, generic.ListView):
+class ProjectListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
     """View class for the page with a list of all projects assigned to the logged-in user."""
 
     model = Project
     paginate_by = 10
+    keyset_ordering = ("name", "id")
     filterset_class = ProjectFilterSet
 
     def get_queryset(self):
         user = self.request.user
         queryset = super().get_queryset().filter(assignees=user).annotate(
-            num_tasks=Count("tasks", filter=Q(tasks__followers=user)),
-            num_completed_tasks=Count("tasks", filter=Q(tasks__is_completed=True, tasks__followers=user)),
+            user_progress=FilteredRelation("worker_progress", condition=Q(worker_progress__worker=user)),
+            num_tasks=Coalesce(F("user_progress__num_tasks"), 0),
+            num_completed_tasks=Coalesce(F("user_progress__num_completed_tasks"), 0),
             progress=Case(
                 When(num_tasks__gt=0, then=F("num_completed_tasks") * 100 / F("num_tasks")),
                 default=0
             )
         )
         self.filterset = self.filterset_class(self.request.GET, queryset=queryset)
-        return self.filterset.qs.distinct()
+        return self.filterset.qs
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -254,26 +330,83 @@ class ProjectDetailView(LoginRequiredMixin, generic.DetailView):
     """View class for the page with the key information about the project."""
     model = Project
 
+    def get_queryset(self):
+        return annotate_can_be_deleted(super().get_queryset()).annotate(num_participants=Count("assignees"))
+
     def get_context_data(self, **kwargs):
-        user = self.request.user
         context = super().get_context_data(**kwargs)
         project_id = context.get("project").id
-        context["participants"] = get_user_model().objects.filter(all_projects=project_id).select_related("position")
+        context["can_be_deleted"] = context.get("project").can_be_deleted
+        context["stats"] = project_stats.get_project_stats(project_id)
+
+        return context
+
+
+class KeysetFragmentView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
+    """
+    Base view class for the HTML fragments with a page of a long list, loaded on demand by a detail page.
+    Every page ends with a link to the next one, see static/assets/js/fragments.js.
+    """
+
+    paginate_by = 20
+    parent_model = None
+    parent_fields = ("id",)
+
+    def get_parent(self):
+        return get_object_or_404(self.parent_model.objects.only(*self.parent_fields), pk=self.kwargs["pk"])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.parent_model is not None:
+            context["parent"] = self.get_parent()
+        return context
+
+
+class ProjectParticipantListView(KeysetFragmentView):
+    """View class for the fragment with a page of the participants of the project."""
+
+    keyset_ordering = ("first_name", "last_name", "id")
+    template_name = "task_manager/project_participant_list.html"
+    parent_model = Project
+    parent_fields = ("id", "author_id")
+
+    def get_queryset(self):
+        return get_user_model().objects.filter(all_projects=self.kwargs["pk"]).select_related("position")
+
 
-        num_tasks = len(Task.objects.filter(project__id=project_id))
-        context["num_tasks"] = num_tasks
+class ProjectTaskListView(KeysetFragmentView):
+    """View class for the fragment with a page of the project tasks followed by the logged-in user."""
 
-        context["can_be_deleted"] = False
-        if num_tasks == 0:
-            context["can_be_deleted"] = True
+    keyset_ordering = ("deadline", "id")
+    template_name = "task_manager/project_task_list.html"
 
-        context["tasks"] = Task.objects.filter(project__id=project_id, followers=user).select_related(
+    def get_queryset(self):
+        return Task.objects.filter(project_id=self.kwargs["pk"], followers=self.request.user).select_related(
             "author",
             "responsible",
             "task_type"
-        )
+        ).batch_load()
 
-        return context
+
+class TaskFollowerListView(KeysetFragmentView):
+    """View class for the fragment with a page of the followers of the task."""
+
+    keyset_ordering = ("first_name", "last_name", "id")
+    template_name = "task_manager/task_follower_list.html"
+    parent_model = Task
+    parent_fields = ("id", "author_id", "responsible_id")
+
+    def get_parent(self):
+        if not hasattr(self, "parent"):
+            try:
+                self.parent = super().get_parent()
+            except Http404:
+                self.parent = get_object_or_404(ArchivedTask.objects.only(*self.parent_fields), pk=self.kwargs["pk"])
+        return self.parent
+
+    def get_queryset(self):
+        relation = "followed_archived_tasks" if isinstance(self.get_parent(), ArchivedTask) else "followed_tasks"
+        return get_user_model().objects.filter(**{relation: self.kwargs["pk"]}).select_related("position")
 
 
 class ProjectCreateView(LoginRequiredMixin, generic.CreateView):
@@ -297,13 +430,12 @@ class ProjectCreateView(LoginRequiredMixin, generic.CreateView):
         name = form.cleaned_data["name"]
         description = form.cleaned_data["description"]
 
-        project = Project.objects.create(name=name, description=description, author=author)
-        project.save()
-
         assignees = form.cleaned_data["assignees"]
-        for assignee in assignees:
-            project.assignees.add(assignee)
-        project.assignees.add(author)
+        assignee_ids = {assignee.id for assignee in assignees} | {author.id}
+
+        with transaction.atomic():
+            project = Project.objects.create(name=name, description=description, author=author)
+            apply_members(project, "assignees", assignee_ids, current_ids=set())
         return HttpResponseRedirect(reverse("task_manager:project-detail", args=[project.id]))
 
 
@@ -324,11 +456,12 @@ class ProjectUpdateView(LoginRequiredMixin, generic.UpdateView):
 
     def form_valid(self, form):
         project = form.save(commit=False)
-        project.assignees.set([project.author])
         assignees = form.cleaned_data["assignees"]
-        for assignee in assignees:
-            project.assignees.add(assignee)
-        project.save()
+        assignee_ids = {assignee.id for assignee in assignees} | {project.author_id}
+
+        with transaction.atomic():
+            project.save()
+            apply_members(project, "assignees", assignee_ids)
         return HttpResponseRedirect(reverse("task_manager:project-detail", args=[project.id]))
 
 
@@ -351,7 +484,9 @@ class ProjectToggleIsActiveView(LoginRequiredMixin, View):
 class TaskFilterSet(FilterSet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.filters["task_type"].extra["choices"] = self.get_task_type_filter_choices()
+        # The facets are loaded when the choices are first read, the export never renders the form.
+        for name in ("task_type", "is_completed", "role"):
+            self.filters[name].extra["choices"] = lazy(partial(self.get_facet_choices, name), list)()
 
     is_completed_choices = (
         (True, "Completed"),
@@ -385,11 +520,16 @@ class TaskFilterSet(FilterSet):
         model = Task
         fields = ["is_completed", "task_type", "role"]
 
-    def get_task_type_filter_choices(self):
-        return (
-            TaskType.objects.filter(tasks__followers=self.request.user)
-                            .values_list("id", "name").distinct()
-        )
+    @cached_property
+    def task_facets(self):
+        return facets.get_task_facets(self.request.user)
+
+    def get_facet_choices(self, name):
+        if name == "task_type":
+            choices = self.task_facets["task_type_choices"]
+        else:
+            choices = getattr(self, f"{name}_choices")
+        return facets.label_choices(choices, self.task_facets[name])
 
     def filter_by_role(self, queryset, name, value):
         if self.request is None:
@@ -402,11 +542,12 @@ class TaskFilterSet(FilterSet):
         return queryset
 
 
-class TaskListView(LoginRequiredMixin, views.FilterView):
+class TaskListView(LoginRequiredMixin, KeysetPaginationMixin, views.FilterView):
     """View class for the page with a list of all tasks assigned to the logged-in user."""
 
     model = Task
     paginate_by = 15
+    keyset_ordering = ("deadline", "id")
     filterset_class = TaskFilterSet
     template_name = "task_manager/task_list.html"
 
@@ -417,41 +558,166 @@ class TaskListView(LoginRequiredMixin, views.FilterView):
             "author",
             "responsible",
             "task_type"
-        )
+        ).batch_load()
         return queryset
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
         context["filterset"] = self.filterset
+        context["bulk_action_form"] = getattr(self, "bulk_action_form", None) or TaskBulkActionForm()
+        return context
+
+    def post(self, request, *args, **kwargs):
+        """Apply a bulk action to the selected tasks, the ones the worker may not change are skipped."""
+        form = TaskBulkActionForm(request.POST)
+        if not form.is_valid():
+            self.bulk_action_form = form
+            response = self.get(request, *args, **kwargs)
+            response.status_code = 400
+            return response
+
+        tasks = Task.objects.filter(id__in=form.cleaned_data["tasks"])
+        bulk_actions.ACTIONS[form.cleaned_data["action"]](tasks, request.user, form.value)
+        return HttpResponseRedirect(request.get_full_path())
+
+
+class ArchivedTaskListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
+    """View class for the page for searching the archived tasks followed by the logged-in user by name."""
+
+    model = ArchivedTask
+    paginate_by = 15
+    keyset_ordering = ("deadline", "id")
+    template_name = "task_manager/archived_task_list.html"
+
+    def get_queryset(self):
+        queryset = ArchivedTask.objects.filter(followers=self.request.user).select_related(
+            "project",
+            "author",
+            "responsible",
+            "task_type"
+        )
+        query = self.request.GET.get("q", "").strip()
+        if query:
+            queryset = queryset.filter(name__icontains=query)
+        return queryset
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.request.GET.get("q", "")
         return context
 
 
+class Echo:
+    """An object that implements just the write method of the file-like interface."""
+
+    def write(self, value):
+        return value
+
+
+class TaskExportView(TaskListView):
+    """View class for streaming the filtered list of tasks assigned to the logged-in user as CSV or JSONL."""
+
+    http_method_names = ["get"]
+    chunk_size = 2000
+    export_fields = (
+        "id",
+        "name",
+        "project",
+        "task_type",
+        "status",
+        "is_completed",
+        "created_time",
+        "deadline",
+        "author",
+        "responsible",
+    )
+    content_types = {
+        "csv": "text/csv",
+        "jsonl": "application/jsonl",
+    }
+
+    def get(self, request, *args, **kwargs):
+        file_format = kwargs["file_format"]
+        if file_format not in self.content_types:
+            raise Http404(f"Unsupported export format: {file_format}")
+
+        filterset = self.get_filterset(self.get_filterset_class())
+        if not filterset.is_bound or filterset.is_valid() or not self.get_strict():
+            queryset = filterset.qs
+        else:
+            queryset = filterset.queryset.none()
+        rows = (self.get_row(task) for task in queryset.order_by("deadline", "id").iterator(self.chunk_size))
+
+        if file_format == "csv":
+            writer = csv.writer(Echo())
+            lines = (writer.writerow(row) for row in self.with_header(rows))
+        else:
+            lines = (json.dumps(dict(zip(self.export_fields, row))) + "\n" for row in rows)
+
+        response = StreamingHttpResponse(lines, content_type=self.content_types[file_format])
+        response["Content-Disposition"] = f'attachment; filename="tasks.{file_format}"'
+        return response
+
+    def with_header(self, rows):
+        yield self.export_fields
+        yield from rows
+
+    @staticmethod
+    def get_row(task):
+        return (
+            task.id,
+            task.name,
+            str(task.project),
+            str(task.task_type),
+            task.status,
+            task.is_completed,
+            task.created_time.isoformat(),
+            task.deadline.isoformat(),
+            str(task.author),
+            str(task.responsible),
+        )
+
+
 class TaskDetailView(LoginRequiredMixin, generic.UpdateView):
     """View class for the page with the key information about the task."""
     model = Task
     form_class = TaskStatusUpdateForm
     template_name = "task_manager/task_detail.html"
+    context_object_name = "task"
+    queryset = Task.objects.select_related("project", "author", "responsible", "task_type").annotate(
+        num_followers=Count("followers")
+    )
+    archived_queryset = ArchivedTask.objects.select_related("project", "author", "responsible", "task_type").annotate(
+        num_followers=Count("followers")
+    )
+
+    def get_object(self, queryset=None):
+        try:
+            return super(TaskDetailView, self).get_object(queryset)
+        except Http404:
+            # Tasks closed long ago are read from the archive, see task_manager.archive.
+            return super(TaskDetailView, self).get_object(self.archived_queryset)
 
     def get_context_data(self, **kwargs):
         context = super(TaskDetailView, self).get_context_data(**kwargs)
         task = context.get("task")
         user = self.request.user
 
-        object = self.get_object()
-        context["object"] = context["task"] = object
-
-        task_id = task.id
-        context["followers"] = get_user_model().objects.filter(followed_tasks=task_id).select_related("position")
-
-        user_can_activate_task = False
-        if task.author == user and task.is_completed:
-            user_can_activate_task = True
-        if task.responsible == user and task.status == "completed":
-            user_can_activate_task = True
-        context["user_can_activate_task"] = user_can_activate_task
+        context["reactivation_status"] = None
+        if task.is_completed:
+            context["reactivation_status"] = next(
+                (status for status in ("new", "progress") if transitions.can_change(task, status, user)), None
+            )
+        context["user_can_cancel_task"] = transitions.can_change(task, "cancelled", user)
+        context["user_can_complete_task"] = transitions.can_change(task, "completed", user)
 
         return context
 
+    def form_valid(self, form):
+        if not archive.change_status(self.object.id, form.cleaned_data["status"], self.request.user):
+            return reject_status_change(self.request, self.object.id)
+        return HttpResponseRedirect(self.get_success_url())
+
 
 class TaskCreateView(LoginRequiredMixin, generic.CreateView):
     """View class for the page for creating a new task."""
@@ -476,24 +742,21 @@ class TaskCreateView(LoginRequiredMixin, generic.CreateView):
         project = Project.objects.get(pk=self.kwargs["pk"])
 
         form_data = form.cleaned_data
-
-        task = Task.objects.create(
-            name=form_data["name"],
-            description=form_data["description"],
-            deadline=form_data["deadline"],
-            responsible=form_data["responsible"],
-            task_type=form_data["task_type"],
-            author=author,
-            project=project
-        )
-        task.save()
-
-        responsible = form_data["responsible"]
         followers = form_data.get("followers", [])
-        for follower in followers:
-            task.followers.add(follower)
-        task.followers.add(author)
-        task.followers.add(responsible)
+        follower_ids = {follower.id for follower in followers} | {author.id, form_data["responsible"].id}
+
+        with transaction.atomic():
+            task = Task.objects.create(
+                name=form_data["name"],
+                description=form_data["description"],
+                deadline=form_data["deadline"],
+                responsible=form_data["responsible"],
+                task_type=form_data["task_type"],
+                author=author,
+                project=project
+            )
+            apply_members(task, "followers", follower_ids, current_ids=set())
+            progress.add_followers(task, follower_ids)
 
         return HttpResponseRedirect(reverse("task_manager:task-detail", args=[task.id]))
 
@@ -517,22 +780,43 @@ class TaskUpdateView(LoginRequiredMixin, generic.UpdateView):
 
     def form_valid(self, form):
         task = form.save(commit=False)
-        task.followers.set([task.author])
         followers = form.cleaned_data["followers"]
-        for follower in followers:
-            task.followers.add(follower)
-        task.save()
+        follower_ids = {follower.id for follower in followers} | {task.author_id, task.responsible_id}
+
+        with transaction.atomic():
+            # The status columns are only changed by transitions.apply(), a full save
+            # would write back the status the form was loaded with.
+            task.save(update_fields=[field for field in form.Meta.fields if field != "followers"])
+            added_ids, removed_ids = apply_members(task, "followers", follower_ids)
+            progress.add_followers(task, added_ids)
+            progress.remove_followers(task, removed_ids)
         return HttpResponseRedirect(reverse("task_manager:task-detail", args=[task.id]))
 
 
+def reject_status_change(request, pk):
+    """
+    Send a browser back to the task page with an error message,
+    other clients get a 409 Conflict response.
+    """
+    message = "The task status can't be changed: you may not change it, or somebody else changed it first."
+    if not request.accepts("text/html"):
+        return HttpResponse(message, status=409)
+    messages.error(request, message)
+    return HttpResponseRedirect(reverse("task_manager:task-detail", args=[pk]))
+
+
 class TaskStatusToggleView(LoginRequiredMixin, View):
+    """
+    View class for changing the status of the task with one of the actions of the task page.
+    Rejects the change when the task is not in a status the worker may change it from,
+    e.g. when somebody else changed it first, see reject_status_change().
+    """
     @staticmethod
-    def get(request, pk, new_status):
-        task = get_object_or_404(Task, id=pk)
-        if new_status == "canceled" or new_status == "completed":
-            task.is_completed = True
-        else:
-            task.is_completed = False
-        task.status = new_status
-        task.save()
+    def post(request, pk, new_status):
+        if new_status not in dict(Task.TASK_STATUS_CHOICES):
+            raise Http404("Unknown task status")
+        if not archive.change_status(pk, new_status, request.user):
+            if not archive.exists(pk):
+                raise Http404("No task found matching the query")
+            return reject_status_change(request, pk)
         return HttpResponseRedirect(reverse_lazy("task_manager:task-detail", args=[pk]))
@@ -0,0 +1,156 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import archive, progress, project_stats
+from task_manager.models import ArchivedTask, Project, ProjectProgress, Task, TaskType
+
+TASK_ARCHIVE_VIEW = reverse("task_manager:task-archive")
+
+
+class TaskArchiveTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.responsible = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.task_type = TaskType.objects.create(name="Marketing")
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.author)
+        cls.project.assignees.add(cls.author, cls.responsible)
+
+        long_ago = timezone.now() - datetime.timedelta(days=365)
+        cls.old_tasks = [
+            cls.create_task("Text for 'About us' page", "completed", long_ago),
+            cls.create_task("Closing documents", "cancelled", long_ago),
+            cls.create_task("Banner for the landing page", "completed", long_ago),
+        ]
+        cls.recent_task = cls.create_task("Release notes", "completed", timezone.now())
+        cls.open_task = cls.create_task("Push notifications", "new", None)
+        progress.rebuild()
+
+    @classmethod
+    def create_task(cls, name, status, closed_time):
+        task = Task.objects.create(
+            name=name,
+            project=cls.project,
+            status=status,
+            is_completed=closed_time is not None,
+            closed_time=closed_time,
+            deadline=timezone.now(),
+            description="",
+            author=cls.author,
+            responsible=cls.responsible,
+            task_type=cls.task_type
+        )
+        task.followers.add(cls.author, cls.responsible)
+        return task
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.responsible)
+
+    def get_progress(self):
+        return sorted(ProjectProgress.objects.values_list("worker_id", "num_tasks", "num_completed_tasks"))
+
+    def test_archive_moves_old_closed_tasks_with_followers(self):
+        old_ids = [task.id for task in self.old_tasks]
+
+        self.assertEqual(archive.archive(days=90), 3)
+
+        self.assertEqual(list(Task.objects.order_by("id")), [self.recent_task, self.open_task])
+        self.assertEqual(list(ArchivedTask.objects.order_by("id").values_list("id", flat=True)), old_ids)
+        self.assertEqual(
+            list(self.responsible.followed_archived_tasks.order_by("id").values_list("id", flat=True)),
+            old_ids
+        )
+        self.assertEqual(ArchivedTask.objects.get(id=old_ids[1]).status, "cancelled")
+
+    def test_archive_keeps_progress_and_stats(self):
+        progress_before = self.get_progress()
+        stats_before = project_stats.compute(self.project.id)
+
+        archive.archive(days=90)
+        progress.rebuild()
+
+        self.assertEqual(self.get_progress(), progress_before)
+        self.assertEqual(project_stats.compute(self.project.id), stats_before)
+
+    def test_archive_is_resumed_in_batches(self):
+        archive.archive_batch(Task.objects.filter(id=self.old_tasks[0].id))
+
+        self.assertEqual(archive.archive(days=90, batch_size=1), 2)
+        self.assertEqual(ArchivedTask.objects.count(), 3)
+
+    def test_archived_task_pages(self):
+        task = self.old_tasks[0]
+        archive.archive(days=90)
+
+        response = self.client.get(reverse("task_manager:task-detail", args=[task.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["task"].num_followers, 2)
+        self.assertContains(response, "Archived on")
+
+        response = self.client.get(reverse("task_manager:task-followers", args=[task.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["object_list"]), 2)
+
+    def test_archive_search(self):
+        archive.archive(days=90)
+
+        response = self.client.get(TASK_ARCHIVE_VIEW, {"q": "about"})
+
+        self.assertEqual([task.id for task in response.context["archivedtask_list"]], [self.old_tasks[0].id])
+
+    def test_reactivation_restores_archived_task(self):
+        task = self.old_tasks[0]
+        archive.archive(days=90)
+
+        self.client.post(reverse("task_manager:task-status-toggle", args=[task.id, "progress"]))
+
+        restored = Task.objects.get(id=task.id)
+        self.assertEqual(restored.status, "progress")
+        self.assertIsNone(restored.closed_time)
+        self.assertEqual(restored.created_time, task.created_time)
+        self.assertEqual(restored.followers.count(), 2)
+        self.assertFalse(ArchivedTask.objects.filter(id=task.id).exists())
+
+    def test_rejected_reactivation_keeps_task_archived(self):
+        task = self.old_tasks[1]
+        archive.archive(days=90)
+
+        response = self.client.post(
+            reverse("task_manager:task-status-toggle", args=[task.id, "new"]),
+            HTTP_ACCEPT="application/json"
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(ArchivedTask.objects.filter(id=task.id).exists())
+
+    def test_transitions_set_closed_time(self):
+        self.client.post(reverse("task_manager:task-status-toggle", args=[self.open_task.id, "completed"]))
+        self.assertIsNotNone(Task.objects.get(id=self.open_task.id).closed_time)
+
+        self.client.force_login(self.author)
+        self.client.post(reverse("task_manager:task-status-toggle", args=[self.open_task.id, "new"]))
+        self.assertIsNone(Task.objects.get(id=self.open_task.id).closed_time)
+
+    def test_archive_tasks_command(self):
+        out = StringIO()
+        call_command("archive_tasks", "--days", 90, "--batch-size", 2, stdout=out)
+
+        self.assertIn("Archived 3 tasks.", out.getvalue())
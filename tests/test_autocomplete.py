@@ -0,0 +1,138 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.forms import TaskForm
+from task_manager.models import Position, Project, TaskType
+
+AUTOCOMPLETE_VIEW = reverse("task_manager:worker-autocomplete")
+
+
+class WorkerAutocompleteTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        developer = Position.objects.create(name="Developer")
+        designer = Position.objects.create(name="Designer")
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi",
+            position=developer
+        )
+        cls.jack = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH",
+            position=designer
+        )
+        cls.erika = get_user_model().objects.create_user(
+            username="erika.rogers",
+            first_name="Erika",
+            last_name="Rogers",
+            password="vkrCHt7eTUMxh7",
+            position=developer
+        )
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.user)
+        cls.project.assignees.add(cls.user, cls.jack)
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def search(self, **params):
+        response = self.client.get(AUTOCOMPLETE_VIEW, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def get_names(self, **params):
+        return [worker["name"] for worker in self.search(**params)["results"]]
+
+    def test_search_by_name_prefixes(self):
+        self.assertEqual(self.get_names(q="rog"), ["Erika Rogers", "Jack Rogers"])
+        self.assertEqual(self.get_names(q="ja ROG"), ["Jack Rogers"])
+
+    def test_search_by_position_prefix(self):
+        self.assertEqual(self.get_names(q="dev"), ["Erika Rogers", "John Doe"])
+
+    def test_search_in_project_members(self):
+        self.assertEqual(self.get_names(project=self.project.id, exclude_self=1), ["Jack Rogers"])
+
+    def test_project_members_are_listed_to_the_project_participants_only(self):
+        private_project = Project.objects.create(name="Mate Academy - Website", author=self.jack)
+        private_project.assignees.add(self.jack, self.erika)
+
+        self.assertEqual(self.get_names(project=private_project.id), [])
+
+    def test_invalid_project_is_rejected(self):
+        self.assertEqual(self.client.get(AUTOCOMPLETE_VIEW, {"project": "abc"}).status_code, 400)
+
+    def test_limit_and_cursor(self):
+        page = self.search(limit=2)
+        self.assertEqual([worker["name"] for worker in page["results"]], ["Erika Rogers", "Jack Rogers"])
+
+        self.assertEqual(self.get_names(limit=2, cursor=page["next"]), ["John Doe"])
+
+
+class WorkerAutocompleteFieldTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.outsider = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.user)
+        cls.project.assignees.add(cls.user)
+        cls.task_type = TaskType.objects.create(name="Marketing")
+
+    def get_form(self, responsible, followers):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return TaskForm(
+            {
+                "name": "Write texts",
+                "description": "Description",
+                "task_type": self.task_type.id,
+                "responsible": responsible.id,
+                "deadline_0": "2023-12-15",
+                "deadline_1": "14:00",
+                "followers": [follower.id for follower in followers],
+            },
+            request=request,
+            project=self.project
+        )
+
+    def test_workers_are_validated_in_one_query(self):
+        form = self.get_form(self.user, [self.user])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(form.is_valid())
+
+        worker_queries = [query for query in queries.captured_queries if "task_manager_worker" in query["sql"]]
+        self.assertEqual(len(worker_queries), 1)
+        self.assertEqual(form.cleaned_data["responsible"], self.user)
+        self.assertEqual(form.cleaned_data["followers"], [self.user])
+
+    def test_workers_outside_the_project_are_rejected(self):
+        form = self.get_form(self.user, [self.outsider])
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("followers", form.errors)
+
+    def test_only_selected_workers_are_rendered(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("task_manager:task-create", args=[self.project.id]))
+
+        self.assertNotContains(response, "Jack Rogers")
+        self.assertContains(response, "data-autocomplete-url")
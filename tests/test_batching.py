@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from task_manager.models import Position, Project, Task, TaskType
+
+
+class BatchLoadingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name="Project manager")
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi",
+            position=position
+        )
+        task_type = TaskType.objects.create(name="Marketing")
+        for number in range(5):
+            project = Project.objects.create(name=f"Project #{number}", author=cls.user)
+            project.assignees.add(cls.user)
+            task = Task.objects.create(
+                name=f"Task #{number}",
+                project=project,
+                deadline=timezone.now(),
+                description="",
+                author=cls.user,
+                responsible=cls.user,
+                task_type=task_type
+            )
+            task.followers.add(cls.user)
+
+    def test_foreign_key_is_loaded_for_the_whole_result_set(self):
+        tasks = Task.objects.order_by("id").batch_load()
+        with self.assertNumQueries(2):
+            projects = [task.project.name for task in tasks]
+        self.assertEqual(projects, [f"Project #{number}" for number in range(5)])
+
+    def test_many_to_many_is_loaded_for_the_whole_result_set(self):
+        with self.assertNumQueries(2):
+            followers = [list(task.followers.all()) for task in Task.objects.batch_load()]
+        self.assertEqual(followers, [[self.user]] * 5)
+
+    def test_relations_of_loaded_relations_are_batched_too(self):
+        for number, project in enumerate(Project.objects.order_by("id")):
+            project.author = get_user_model().objects.create_user(
+                username=f"author{number}",
+                password="xgE7YjV4DBzrRH",
+                position=Position.objects.create(name=f"Position #{number}")
+            )
+            project.save()
+
+        with self.assertNumQueries(3):
+            positions = [project.author.position.name for project in Project.objects.order_by("id").batch_load()]
+        self.assertEqual(positions, [f"Position #{number}" for number in range(5)])
+
+    def test_querysets_without_batch_load_query_per_object(self):
+        with self.assertNumQueries(6):
+            for task in Task.objects.all():
+                task.project
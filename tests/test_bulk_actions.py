@@ -0,0 +1,135 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import bulk_actions, progress
+from task_manager.models import Project, ProjectProgress, Task, TaskType
+
+TASK_LIST_VIEW = reverse("task_manager:task-list")
+
+
+class TaskBulkActionsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.worker = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.other = get_user_model().objects.create_user(
+            username="erika.rogers",
+            first_name="Erika",
+            last_name="Rogers",
+            password="vkrCHt7eTUMxh7"
+        )
+        cls.task_type = TaskType.objects.create(name="Marketing")
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.author)
+        cls.project.assignees.add(cls.author, cls.worker, cls.other)
+        cls.private_project = Project.objects.create(name="Mate Academy - Website", author=cls.author)
+        cls.private_project.assignees.add(cls.author)
+
+        cls.tasks = [cls.create_task(f"Task #{number}", cls.project, cls.author) for number in range(3)]
+        cls.private_task = cls.create_task("Private task", cls.private_project, cls.author)
+        cls.foreign_task = cls.create_task("Foreign task", cls.project, cls.other)
+        progress.rebuild()
+
+    @classmethod
+    def create_task(cls, name, project, author):
+        task = Task.objects.create(
+            name=name,
+            project=project,
+            deadline=timezone.now(),
+            description="",
+            author=author,
+            responsible=author,
+            task_type=cls.task_type
+        )
+        task.followers.add(author)
+        return task
+
+    def setUp(self) -> None:
+        self.client.force_login(self.author)
+
+    def post(self, action, tasks, **data):
+        return self.client.post(TASK_LIST_VIEW, {"action": action, "tasks": [task.id for task in tasks], **data})
+
+    def get_progress(self, project, worker):
+        row = ProjectProgress.objects.filter(project=project, worker=worker).first()
+        return (row.num_tasks, row.num_completed_tasks) if row else None
+
+    def test_change_status(self):
+        response = self.post("status", self.tasks[:2] + [self.foreign_task], status="completed")
+
+        self.assertRedirects(response, TASK_LIST_VIEW)
+        self.assertEqual(
+            list(Task.objects.filter(is_completed=True).order_by("id")),
+            self.tasks[:2]
+        )
+        self.assertEqual(self.get_progress(self.project, self.author), (3, 2))
+
+    def test_change_responsible(self):
+        self.post("responsible", self.tasks + [self.private_task, self.foreign_task], responsible=self.worker.id)
+
+        self.assertEqual(list(Task.objects.filter(responsible=self.worker).order_by("id")), self.tasks)
+        self.assertEqual(list(self.worker.followed_tasks.order_by("id")), self.tasks)
+        self.assertEqual(self.get_progress(self.project, self.worker), (3, 0))
+        self.assertIsNone(self.get_progress(self.private_project, self.worker))
+
+    def test_change_deadline(self):
+        self.post(
+            "deadline",
+            [self.tasks[0], self.foreign_task],
+            deadline_0="2030-01-15",
+            deadline_1="10:00"
+        )
+
+        self.assertEqual(Task.objects.get(id=self.tasks[0].id).deadline.date(), datetime.date(2030, 1, 15))
+        self.assertLess(Task.objects.get(id=self.foreign_task.id).deadline.year, 2030)
+
+    def test_add_and_remove_followers(self):
+        self.post("add_followers", self.tasks + [self.private_task], followers=[self.worker.id, self.other.id])
+
+        self.assertEqual(list(self.worker.followed_tasks.order_by("id")), self.tasks)
+        self.assertEqual(self.get_progress(self.project, self.worker), (3, 0))
+        self.assertEqual(self.get_progress(self.project, self.other), (4, 0))
+
+        self.post("remove_followers", self.tasks[:2] + [self.foreign_task], followers=[self.other.id, self.author.id])
+
+        self.assertEqual(list(self.other.followed_tasks.order_by("id")), [self.tasks[2], self.foreign_task])
+        self.assertEqual(self.author.followed_tasks.count(), 4)
+        self.assertEqual(self.get_progress(self.project, self.other), (2, 0))
+
+    def test_action_value_is_required(self):
+        response = self.post("responsible", self.tasks)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("responsible", response.context["bulk_action_form"].errors)
+        self.assertFalse(Task.objects.filter(responsible=self.worker).exists())
+
+    def test_actions_run_the_same_statements_for_any_number_of_tasks(self):
+        def count_writes(tasks, action, value):
+            queryset = Task.objects.filter(id__in=[task.id for task in tasks])
+            with CaptureQueriesContext(connection) as queries:
+                bulk_actions.ACTIONS[action](queryset, self.author, value)
+            return len(queries)
+
+        self.assertEqual(
+            count_writes(self.tasks[:1], "add_followers", [self.worker]),
+            count_writes(self.tasks, "add_followers", [self.other])
+        )
+        self.assertEqual(
+            count_writes(self.tasks[:1], "status", "blocked"),
+            count_writes(self.tasks, "status", "review")
+        )
@@ -0,0 +1,331 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.budgets import QUERY_BUDGETS
+from task_manager.models import Task, Project, TaskType, ProjectProgress, Position, TaskImport
+
+
+class ExplainHotQueriesCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        project_manager = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        project = Project.objects.create(
+            name="Mate Academy - Android App",
+            author=project_manager
+        )
+        project.assignees.add(project_manager)
+        task_type = TaskType.objects.create(name="Marketing")
+        for number in range(20):
+            task = Task.objects.create(
+                name=f"Task #{number}",
+                project=project,
+                deadline=timezone.now(),
+                description="",
+                author=project_manager,
+                responsible=project_manager,
+                task_type=task_type
+            )
+            task.followers.add(project_manager)
+
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command("explain_hot_queries", "--verbose-plans", stdout=out)
+        self.assertNotIn("FULL SCAN", out.getvalue())
+
+
+class ImportTasksCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for username in ("john.doe", "jack.smith", "erika.rogers"):
+            get_user_model().objects.create_user(username=username, password="C3MhYzYotrurMi")
+        TaskType.objects.create(name="Copywriting")
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_import_csv_creates_tasks_and_memberships(self):
+        path = self.write_file("tasks.csv", (
+            "name,project,task_type,status,deadline,description,author,responsible,followers\n"
+            "Text for 'About us',Website,Copywriting,new,2023-12-15 14:00,,john.doe,jack.smith,erika.rogers\n"
+            "Closing documents,Website,Legal,completed,2023-12-16 10:00,,erika.rogers,john.doe,\n"
+        ))
+
+        call_command("import_tasks", path, "--batch-size", "1", stdout=StringIO())
+
+        project = Project.objects.get(name="Website")
+        task = Task.objects.get(name="Text for 'About us'")
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertTrue(Task.objects.get(name="Closing documents").is_completed)
+        self.assertEqual(
+            set(task.followers.values_list("username", flat=True)),
+            {"john.doe", "jack.smith", "erika.rogers"}
+        )
+        self.assertEqual(project.assignees.count(), 3)
+        self.assertEqual(ProjectProgress.objects.get(project=project, worker__username="john.doe").num_tasks, 2)
+
+    def test_import_jsonl_resumes_from_checkpoint(self):
+        rows = [
+            {
+                "name": f"Task #{number}",
+                "project": "Website",
+                "task_type": "Copywriting",
+                "deadline": "2023-12-15T14:00:00+00:00",
+                "author": "john.doe",
+                "responsible": "jack.smith",
+                "followers": [],
+            }
+            for number in range(5)
+        ]
+        path = self.write_file("tasks.jsonl", "\n".join(json.dumps(row) for row in rows))
+        TaskImport.objects.create(name="tasks", num_rows=3)
+
+        call_command("import_tasks", path, "--checkpoint", "tasks", stdout=StringIO())
+
+        self.assertEqual(list(Task.objects.values_list("name", flat=True)), ["Task #3", "Task #4"])
+        self.assertEqual(TaskImport.objects.get(name="tasks").num_rows, 5)
+
+    def test_failed_batch_keeps_the_checkpoint(self):
+        rows = [
+            {
+                "name": f"Task #{number}",
+                "project": "Website",
+                "task_type": "Copywriting",
+                "deadline": "2023-12-15T14:00:00+00:00",
+                "author": "john.doe" if number < 3 else "nobody",
+                "responsible": "jack.smith",
+            }
+            for number in range(4)
+        ]
+        path = self.write_file("tasks.jsonl", "\n".join(json.dumps(row) for row in rows))
+
+        with self.assertRaises(CommandError):
+            call_command("import_tasks", path, "--checkpoint", "tasks", "--batch-size", 2, stdout=StringIO())
+
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertEqual(TaskImport.objects.get(name="tasks").num_rows, 2)
+
+    def test_import_takes_close_time_from_the_row_or_the_deadline(self):
+        row = {
+            "project": "Website",
+            "task_type": "Copywriting",
+            "status": "completed",
+            "deadline": "2021-12-15T14:00:00+00:00",
+            "author": "john.doe",
+            "responsible": "jack.smith",
+        }
+        path = self.write_file("tasks.jsonl", "\n".join([
+            json.dumps({**row, "name": "Closed on deadline"}),
+            json.dumps({**row, "name": "Closed late", "closed_time": "2022-01-10T09:00:00+00:00"}),
+            json.dumps({**row, "name": "Open", "status": "new"}),
+        ]))
+
+        call_command("import_tasks", path, stdout=StringIO())
+
+        closed_times = dict(Task.objects.values_list("name", "closed_time"))
+        self.assertEqual(closed_times["Closed on deadline"].isoformat(), "2021-12-15T14:00:00+00:00")
+        self.assertEqual(closed_times["Closed late"].isoformat(), "2022-01-10T09:00:00+00:00")
+        self.assertIsNone(closed_times["Open"])
+
+    def test_import_fails_on_unknown_worker(self):
+        path = self.write_file("tasks.jsonl", json.dumps({
+            "name": "Task",
+            "project": "Website",
+            "task_type": "Copywriting",
+            "deadline": "2023-12-15T14:00:00+00:00",
+            "author": "nobody",
+            "responsible": "jack.smith",
+        }))
+
+        with self.assertRaisesMessage(CommandError, "Row 1: Unknown worker 'nobody'."):
+            call_command("import_tasks", path, stdout=StringIO())
+
+
+class GenerateDatasetCommandTest(TestCase):
+    def generate(self, prefix, seed=1, workers=30, today="2026-01-05"):
+        call_command(
+            "generate_dataset",
+            "--seed", seed,
+            "--today", today,
+            "--prefix", prefix,
+            "--positions", 3,
+            "--task-types", 2,
+            "--workers", workers,
+            "--projects", 5,
+            "--tasks", 120,
+            "--batch-size", 50,
+            stdout=StringIO()
+        )
+        tasks = Task.objects.filter(name__startswith=f"{prefix} ").order_by("id")
+        return [
+            (
+                task.name.removeprefix(prefix),
+                task.project.name.removeprefix(prefix),
+                task.status,
+                task.deadline,
+                task.author.username.removeprefix(prefix),
+                task.followers.count(),
+            )
+            for task in tasks
+        ]
+
+    def test_generates_requested_number_of_objects(self):
+        self.generate("first")
+
+        self.assertEqual(get_user_model().objects.count(), 30)
+        self.assertEqual(Project.objects.count(), 5)
+        self.assertEqual(Task.objects.count(), 120)
+        for task in Task.objects.all():
+            self.assertEqual(task.is_completed, task.status in ("completed", "cancelled"))
+        self.assertEqual(
+            ProjectProgress.objects.aggregate(total=Sum("num_tasks"))["total"],
+            Task.followers.through.objects.count()
+        )
+
+    def test_generation_is_deterministic_for_a_seed(self):
+        first = self.generate("first")
+        self.assertEqual(first, self.generate("second"))
+        self.assertNotEqual(first, self.generate("third", seed=2))
+
+    def test_generation_does_not_depend_on_the_current_day(self):
+        first = self.generate("first")
+        with mock.patch("django.utils.timezone.now", return_value=timezone.now() + datetime.timedelta(days=3)):
+            self.assertEqual(first, self.generate("second"))
+        self.assertNotEqual(first, self.generate("third", today="2026-01-08"))
+
+    def test_deadlines_are_generated_around_the_current_day_by_default(self):
+        out = StringIO()
+        call_command("generate_dataset", "--workers", 3, "--projects", 1, "--tasks", 0, stdout=out)
+
+        self.assertIn(f"Generating deadlines around {timezone.localdate().isoformat()}", out.getvalue())
+
+    def test_generates_projects_with_fewer_workers_than_members(self):
+        self.generate("first", workers=1)
+
+        self.assertEqual(Project.objects.get(name="first Project 0").assignees.count(), 1)
+
+
+class BenchmarkViewsCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name="Project manager")
+        project_manager = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi",
+            position=position
+        )
+        copywriter = get_user_model().objects.create_user(
+            username="jack.smith",
+            first_name="Jack",
+            last_name="Smith",
+            password="6NdqA6xsfBCcdG",
+            position=position
+        )
+        project = Project.objects.create(name="Mate Academy - Android App", author=project_manager)
+        project.assignees.add(project_manager, copywriter)
+        task = Task.objects.create(
+            name="Discuss case for our website with the client",
+            project=project,
+            deadline=timezone.now(),
+            description="",
+            author=project_manager,
+            responsible=copywriter,
+            task_type=TaskType.objects.create(name="Marketing")
+        )
+        task.followers.add(project_manager, copywriter)
+
+    def test_benchmark_writes_results_for_every_route(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            call_command("benchmark_views", "--requests", 2, "--output", output, stdout=StringIO())
+            with open(output) as file:
+                results = json.load(file)
+
+        self.assertEqual(results["user"], "john.doe")
+        self.assertIn("task_manager:task-list", results["routes"])
+        self.assertNotIn("task_manager:task-status-toggle", results["routes"])
+        for result in results["routes"].values():
+            self.assertEqual(result["status"], 200)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertLessEqual(result["queries"], result["query_budget"])
+
+    def test_benchmark_fails_over_query_budget(self):
+        with mock.patch.dict(QUERY_BUDGETS, {"task_manager:task-list": 1}):
+            with self.assertRaisesMessage(CommandError, "task_manager:task-list"):
+                call_command(
+                    "benchmark_views", "--requests", 1, "--route", "task-list", stdout=StringIO()
+                )
+
+    def test_benchmark_fails_without_positions(self):
+        get_user_model().objects.update(position=None)
+        Position.objects.all().delete()
+
+        with self.assertRaisesMessage(CommandError, "At least one position"):
+            call_command("benchmark_views", "--requests", 1, stdout=StringIO())
+
+
+class BenchmarkTransitionsCommandTest(TestCase):
+    def test_conditional_transitions_keep_progress_exact(self):
+        out = StringIO()
+        call_command("benchmark_transitions", "--threads", 1, "--operations", 20, stdout=out)
+
+        rows = {line.split()[0]: line.split() for line in out.getvalue().splitlines()[1:]}
+        self.assertEqual(set(rows), {"conditional", "read-modify-write"})
+        self.assertEqual(rows["conditional"][-1], "0")
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(get_user_model().objects.exists())
+
+
+class ProfileReportCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+
+    def test_report_ranks_functions_of_all_profiles(self):
+        self.client.force_login(self.user)
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(PROFILING_DIR=directory, PROFILING_SAMPLE_RATE=1):
+            self.client.get(reverse("task_manager:task-list"))
+            self.client.get(reverse("task_manager:project-list"))
+            out = StringIO()
+            call_command("profile_report", "--view", "task_manager:task-list", "--limit", "5", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("Aggregated 1 profiles.", output)
+        self.assertIn("task_manager:task-list", output)
+        self.assertNotIn("task_manager:project-list", output)
+        self.assertEqual(len(output.split("cum/profile  function\n")[1].strip().splitlines()), 5)
+
+    def test_report_fails_without_profiles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(CommandError):
+                call_command("profile_report", "--dir", directory, stdout=StringIO())
@@ -0,0 +1,177 @@
+import datetime
+import zoneinfo
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import dashboard
+from task_manager.models import Project, Task, TaskType
+
+INDEX_VIEW = reverse("task_manager:index")
+
+
+class DashboardCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.responsible = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.follower = get_user_model().objects.create_user(
+            username="erika.rogers",
+            first_name="Erika",
+            last_name="Rogers",
+            password="vkrCHt7eTUMxh7"
+        )
+        project = Project.objects.create(name="Mate Academy - Android app", author=cls.author)
+        project.assignees.add(cls.author, cls.responsible, cls.follower)
+        cls.task = Task.objects.create(
+            name="Write texts",
+            project=project,
+            deadline=timezone.now(),
+            description="",
+            author=cls.author,
+            responsible=cls.responsible,
+            task_type=TaskType.objects.create(name="Marketing")
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.author)
+
+    def test_dashboard_is_served_from_cache(self):
+        response = self.client.get(INDEX_VIEW)
+        self.assertEqual(response.context["tasks_created"], [self.task])
+
+        with self.assertNumQueries(2):
+            self.client.get(INDEX_VIEW)
+
+    def test_task_change_invalidates_dashboards_of_participants(self):
+        self.client.get(INDEX_VIEW)
+
+        self.client.force_login(self.responsible)
+        self.client.post(reverse("task_manager:task-status-toggle", args=[self.task.id, "completed"]))
+
+        self.client.force_login(self.author)
+        self.assertEqual(self.client.get(INDEX_VIEW).context["tasks_created"], [])
+
+    def test_follower_changes_invalidate_dashboards_of_followers(self):
+        version = dashboard.get_version(self.follower)
+
+        self.task.followers.add(self.follower)
+        self.assertEqual(dashboard.get_version(self.follower), version + 1)
+
+        self.follower.followed_tasks.clear()
+        self.assertEqual(dashboard.get_version(self.follower), version + 2)
+
+    def test_handing_a_task_over_invalidates_the_previous_responsible(self):
+        task = Task.objects.get(id=self.task.id)
+        version = dashboard.get_version(self.responsible)
+
+        task.responsible = self.follower
+        with CaptureQueriesContext(connection) as queries:
+            task.save()
+
+        self.assertEqual(dashboard.get_version(self.responsible), version + 1)
+        self.assertFalse([query for query in queries if 'FROM "task_manager_task" ' in query["sql"]])
+
+    def test_dashboard_version_is_not_reused_after_eviction(self):
+        version = dashboard.get_version(self.author)
+
+        cache.delete(dashboard.version_key(self.author.id))
+
+        self.assertGreater(dashboard.get_version(self.author), version)
+
+    def test_dashboard_rolls_over_at_the_day_boundary(self):
+        self.client.get(INDEX_VIEW)
+
+        with mock.patch("django.utils.timezone.now", return_value=timezone.now() + datetime.timedelta(days=1)):
+            response = self.client.get(INDEX_VIEW)
+
+        self.assertEqual(response.context["tasks_created"], [])
+
+
+class DashboardSectionsTest(TestCase):
+    # Wednesday, October 14, 2026, 15:00 in New York
+    NOW = datetime.datetime(2026, 10, 14, 19, 0, tzinfo=datetime.timezone.utc)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi",
+            timezone="America/New_York"
+        )
+        project = Project.objects.create(name="Mate Academy - Android app", author=cls.user)
+        task_type = TaskType.objects.create(name="Marketing")
+        new_york = zoneinfo.ZoneInfo("America/New_York")
+
+        def create_task(name, *deadline):
+            return Task.objects.create(
+                name=name,
+                project=project,
+                deadline=datetime.datetime(*deadline, tzinfo=new_york),
+                description="",
+                author=cls.user,
+                responsible=cls.user,
+                task_type=task_type
+            )
+
+        cls.overdue = create_task("Overdue", 2026, 10, 14, 10, 0)
+        cls.late_today = create_task("Late today", 2026, 10, 14, 23, 30)
+        cls.tomorrow = create_task("Tomorrow", 2026, 10, 15, 0, 0)
+        cls.sunday = create_task("Sunday", 2026, 10, 18, 12, 0)
+        cls.next_monday = create_task("Next Monday", 2026, 10, 19, 9, 0)
+        cls.in_8_days = create_task("In 8 days", 2026, 10, 22, 0, 0)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def get_dashboard(self, now=NOW):
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            return self.client.get(INDEX_VIEW)
+
+    def test_sections_use_days_of_the_worker_time_zone(self):
+        context = self.get_dashboard().context
+
+        self.assertEqual(context["overdue_tasks"], [self.overdue])
+        self.assertEqual(context["tasks_to_do"], [self.late_today])
+        self.assertEqual(context["tasks_created"], [self.overdue, self.late_today])
+        self.assertEqual(context["tasks_this_week"], [self.overdue, self.late_today, self.tomorrow, self.sunday])
+        self.assertEqual(context["tasks_next_7_days"], [self.tomorrow, self.sunday, self.next_monday])
+
+    @override_settings(DASHBOARD_SECTION_SIZE=1)
+    def test_tasks_due_today_are_counted_past_the_section_size(self):
+        response = self.get_dashboard(self.NOW - datetime.timedelta(hours=6))
+
+        self.assertEqual(response.context["tasks_created"], [self.overdue])
+        self.assertContains(response, "You have 2 tasks to complete due later today.")
+        self.assertContains(response, "2 tasks created by you are due today.")
+
+    def test_deadlines_are_rendered_in_the_worker_time_zone(self):
+        self.assertContains(self.get_dashboard(), "11:30 p.m.")
+
+    def test_cached_dashboard_expires_when_a_deadline_passes(self):
+        self.get_dashboard()
+
+        response = self.get_dashboard(self.NOW + datetime.timedelta(hours=8, minutes=45))
+
+        self.assertEqual(response.context["overdue_tasks"], [self.overdue, self.late_today])
+        self.assertEqual(response.context["tasks_to_do"], [])
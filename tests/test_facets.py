@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import facets
+from task_manager.models import Project, Task, TaskType
+
+TASK_LIST_VIEW = reverse("task_manager:task-list")
+
+
+class TaskFacetsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.other = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.user)
+        cls.marketing = TaskType.objects.create(name="Marketing")
+        cls.design = TaskType.objects.create(name="Design")
+        cls.tasks = [
+            cls.create_task("Write texts", cls.marketing, cls.user, cls.other, is_completed=True),
+            cls.create_task("Draw banners", cls.design, cls.other, cls.user),
+            cls.create_task("Draw icons", cls.design, cls.user, cls.user),
+        ]
+        for task in cls.tasks:
+            task.followers.add(cls.user)
+
+    @classmethod
+    def create_task(cls, name, task_type, author, responsible, is_completed=False):
+        return Task.objects.create(
+            name=name,
+            project=cls.project,
+            deadline=timezone.now(),
+            description="",
+            author=author,
+            responsible=responsible,
+            task_type=task_type,
+            is_completed=is_completed
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def get_choices(self, name):
+        form = self.client.get(TASK_LIST_VIEW).context["filterset"].form
+        return [choice for choice in form.fields[name].choices if choice[0] != ""]
+
+    def test_filter_choices_show_task_counts(self):
+        self.assertEqual(
+            self.get_choices("task_type"),
+            [(self.design.id, "Design (2)"), (self.marketing.id, "Marketing (1)")]
+        )
+        self.assertEqual(self.get_choices("is_completed"), [(True, "Completed (1)"), (False, "Active (2)")])
+        self.assertEqual(self.get_choices("role"), [("author", "Author (2)"), ("responsible", "Responsible (2)")])
+
+    def test_facets_are_served_from_cache(self):
+        facets.get_task_facets(self.user)
+
+        with self.assertNumQueries(0):
+            facets.get_task_facets(self.user)
+
+    def test_followed_task_changes_invalidate_facets(self):
+        self.get_choices("task_type")
+
+        self.tasks[0].followers.remove(self.user)
+
+        self.assertEqual(self.get_choices("task_type"), [(self.design.id, "Design (2)")])
+
+    def test_task_type_changes_invalidate_facets(self):
+        self.get_choices("task_type")
+
+        self.marketing.name = "Promotion"
+        self.marketing.save()
+
+        self.assertIn((self.marketing.id, "Promotion (1)"), self.get_choices("task_type"))
+
+    def test_task_type_changes_do_not_touch_workers(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.design.save()
+
+        self.assertFalse([query for query in queries if "task_manager_worker" in query["sql"]])
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from task_manager.memberships import apply_members
+from task_manager.models import Project
+
+
+class ApplyMembersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.workers = get_user_model().objects.bulk_create([
+            get_user_model()(username=f"worker.{number}", password="!")
+            for number in range(60)
+        ])
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.workers[0])
+
+    def test_member_set_is_applied_as_a_diff(self):
+        self.project.assignees.add(*self.workers[:10])
+        member_ids = {worker.id for worker in self.workers[5:15]}
+
+        added_ids, removed_ids = apply_members(self.project, "assignees", member_ids)
+
+        self.assertEqual(added_ids, {worker.id for worker in self.workers[10:15]})
+        self.assertEqual(removed_ids, {worker.id for worker in self.workers[:5]})
+        self.assertEqual(set(self.project.assignees.values_list("id", flat=True)), member_ids)
+
+    def test_number_of_queries_does_not_depend_on_number_of_members(self):
+        for size in (5, 50):
+            project = Project.objects.create(name=f"Project with {size} members", author=self.workers[0])
+            project.assignees.add(*self.workers[size // 2:size])
+            # savepoint, select, delete, insert, release savepoint
+            with self.assertNumQueries(5):
+                apply_members(project, "assignees", [worker.id for worker in self.workers[:size // 2]])
@@ -0,0 +1,254 @@
+import json
+import os
+import tempfile
+import time
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import metrics
+from task_manager.instrumentation import NPlusOneQueries, NPlusOneWarning
+from task_manager.middleware import NPlusOneMiddleware
+from task_manager.models import Project, Task, TaskType
+
+
+class ServerTimingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1, SERVER_TIMING_HEADER=True)
+    def test_sampled_request_has_server_timing_header(self):
+        with self.assertLogs("task_manager.timing", level="INFO") as logs:
+            response = self.client.get(reverse("task_manager:task-list"))
+
+        metrics = [metric.split(";")[0] for metric in response["Server-Timing"].split(", ")]
+        self.assertEqual(metrics, ["db", "view", "render", "total"])
+        self.assertIn("queries", response["Server-Timing"])
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["view"], "task_manager:task-list")
+        self.assertEqual(line["user_id"], self.user.id)
+        self.assertGreater(line["db_queries"], 0)
+        self.assertGreater(line["render_ms"], 0)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_not_sampled_request_has_no_server_timing_header(self):
+        response = self.client.get(reverse("task_manager:task-list"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1, SERVER_TIMING_HEADER=False)
+    def test_server_timing_header_is_only_sent_to_staff_when_disabled(self):
+        with self.assertLogs("task_manager.timing", level="INFO"):
+            response = self.client.get(reverse("task_manager:task-list"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+        self.user.is_staff = True
+        self.user.save(update_fields=["is_staff"])
+        with self.assertLogs("task_manager.timing", level="INFO"):
+            response = self.client.get(reverse("task_manager:task-list"))
+        self.assertTrue(response.has_header("Server-Timing"))
+
+
+class MetricsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.metrics_dir = directory.name
+        settings_override = override_settings(METRICS_DIR=self.metrics_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        metrics.reset_registry()
+
+    def test_metrics_are_labeled_by_url_name(self):
+        self.client.get(reverse("task_manager:task-list"))
+        self.client.get(reverse("task_manager:task-list"))
+
+        response = self.client.get(reverse("metrics"))
+        body = response.content.decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'http_requests_total{method="GET",status="200",view="task_manager:task-list"} 2', body
+        )
+        self.assertIn('http_request_duration_seconds_count{view="task_manager:task-list"} 2', body)
+        self.assertIn('db_queries_per_request_bucket{view="task_manager:task-list",le="+Inf"} 2', body)
+        self.assertNotIn('view="metrics"', body)
+
+    def test_metrics_of_all_processes_are_summed_up(self):
+        self.client.get(reverse("task_manager:task-list"))
+        # A process reusing the id of a stopped one writes to a file of its own.
+        other_process = metrics.Registry()
+        other_process.increment(
+            "http_requests_total", {"view": "task_manager:task-list", "method": "GET", "status": "200"}, 4
+        )
+        other_process.increment("http_request_errors_total", {"view": "task_manager:task-list"})
+        other_process.flush(force=True)
+
+        body = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn(
+            'http_requests_total{method="GET",status="200",view="task_manager:task-list"} 5', body
+        )
+        self.assertIn('http_request_errors_total{view="task_manager:task-list"} 1', body)
+        self.assertEqual(len(os.listdir(self.metrics_dir)), 2)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_metrics_are_forbidden_to_other_hosts(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 403)
+
+
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.profiling_dir = directory.name
+        settings_override = override_settings(
+            PROFILING_DIR=self.profiling_dir, PROFILING_TOKEN="secret", PROFILING_SAMPLE_RATE=0
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_request_with_token_is_profiled(self):
+        response = self.client.get(reverse("task_manager:task-list"), HTTP_X_PROFILE_TOKEN="secret")
+
+        profile_id = response["X-Profile-Id"]
+        self.assertTrue(os.path.exists(os.path.join(self.profiling_dir, f"{profile_id}.prof")))
+        with open(os.path.join(self.profiling_dir, f"{profile_id}.json")) as file:
+            info = json.load(file)
+        self.assertEqual(info["view"], "task_manager:task-list")
+        self.assertEqual(info["user_id"], self.user.id)
+        self.assertGreater(info["db_queries"], 0)
+
+    @override_settings(PROFILING_TRACEMALLOC=True)
+    def test_profile_lists_allocations_with_tracemalloc(self):
+        response = self.client.get(reverse("task_manager:task-list"), HTTP_X_PROFILE_TOKEN="secret")
+
+        with open(os.path.join(self.profiling_dir, f"{response['X-Profile-Id']}.json")) as file:
+            info = json.load(file)
+        self.assertGreater(info["peak_memory"], 0)
+        self.assertTrue(info["allocations"])
+
+    @override_settings(PROFILING_SAMPLE_RATE=1)
+    def test_profile_id_of_sampled_request_is_only_returned_to_staff(self):
+        response = self.client.get(reverse("task_manager:task-list"))
+
+        self.assertFalse(response.has_header("X-Profile-Id"))
+        self.assertEqual(len(os.listdir(self.profiling_dir)), 2)
+
+        get_user_model().objects.filter(id=self.user.id).update(is_staff=True)
+        response = self.client.get(reverse("task_manager:task-list"))
+
+        self.assertTrue(response.has_header("X-Profile-Id"))
+
+    @override_settings(PROFILING_MAX_PROFILES=2)
+    def test_only_the_latest_profiles_are_kept(self):
+        profile_ids = []
+        for _ in range(3):
+            response = self.client.get(reverse("task_manager:task-list"), HTTP_X_PROFILE_TOKEN="secret")
+            profile_ids.append(response["X-Profile-Id"])
+            # Keep the modification times of the profiles apart.
+            time.sleep(0.01)
+
+        self.assertEqual(
+            sorted(os.listdir(self.profiling_dir)),
+            sorted(f"{profile_id}{extension}" for profile_id in profile_ids[1:] for extension in (".json", ".prof"))
+        )
+
+    def test_request_with_wrong_token_is_not_profiled(self):
+        response = self.client.get(reverse("task_manager:task-list"), HTTP_X_PROFILE_TOKEN="guess")
+
+        self.assertFalse(response.has_header("X-Profile-Id"))
+        self.assertEqual(os.listdir(self.profiling_dir), [])
+
+
+class NPlusOneMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        task_type = TaskType.objects.create(name="Marketing")
+        for number in range(3):
+            project = Project.objects.create(name=f"Project #{number}", author=user)
+            Task.objects.create(
+                name=f"Task #{number}",
+                project=project,
+                deadline=timezone.now(),
+                description="",
+                author=user,
+                responsible=user,
+                task_type=task_type
+            )
+
+    @staticmethod
+    def render_projects_of_tasks(request):
+        template = Template("{% for task in tasks %}{{ task.project }}{% endfor %}")
+        return HttpResponse(template.render(Context({"tasks": Task.objects.all()})))
+
+    def get_response(self, mode):
+        with override_settings(NPLUSONE_MODE=mode, NPLUSONE_THRESHOLD=2):
+            middleware = NPlusOneMiddleware(self.render_projects_of_tasks)
+            return middleware(RequestFactory().get("/tasks/"))
+
+    def test_raise_mode_reports_statement_and_stacks(self):
+        with self.assertRaises(NPlusOneQueries) as error:
+            self.get_response("raise")
+
+        report = str(error.exception)
+        self.assertIn('3 x SELECT "task_manager_project"', report)
+        self.assertIn("tests/test_middleware.py", report)
+        self.assertIn("<unknown source>:1 {% for task in tasks %}", report)
+        self.assertIn("<unknown source>:1 {{ task.project }}", report)
+
+    def test_log_mode_logs_the_report(self):
+        with self.assertLogs("task_manager.nplusone", level="WARNING") as logs:
+            response = self.get_response("log")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Repeated queries in /tasks/", logs.output[0])
+
+    def test_warn_mode_warns(self):
+        with self.assertWarns(NPlusOneWarning):
+            self.get_response("warn")
+
+    def test_queries_under_threshold_are_not_reported(self):
+        with override_settings(NPLUSONE_MODE="raise", NPLUSONE_THRESHOLD=3):
+            response = NPlusOneMiddleware(self.render_projects_of_tasks)(RequestFactory().get("/tasks/"))
+        self.assertEqual(response.status_code, 200)
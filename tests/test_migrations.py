@@ -0,0 +1,69 @@
+import datetime
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+
+class CanceledStatusMigrationTest(TransactionTestCase):
+    migrate_from = [("task_manager", "0011_task_archive")]
+    migrate_to = [("task_manager", "0012_fix_canceled_task_status")]
+
+    def setUp(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+
+        Worker = apps.get_model("task_manager", "Worker")
+        Project = apps.get_model("task_manager", "Project")
+        TaskType = apps.get_model("task_manager", "TaskType")
+        Task = apps.get_model("task_manager", "Task")
+
+        author = Worker.objects.create(username="john.doe", first_name="John", last_name="Doe")
+        project = Project.objects.create(name="Mate Academy - Android app", author=author)
+        task_type = TaskType.objects.create(name="Marketing")
+        self.deadline = timezone.now() - datetime.timedelta(days=3)
+        self.closed_time = timezone.now() - datetime.timedelta(days=1)
+
+        def create_task(name, status, is_completed, closed_time):
+            return Task.objects.create(
+                name=name,
+                project=project,
+                status=status,
+                is_completed=is_completed,
+                closed_time=closed_time,
+                deadline=self.deadline,
+                description="",
+                author=author,
+                responsible=author,
+                task_type=task_type
+            ).id
+
+        self.canceled_id = create_task("Closing documents", "canceled", True, None)
+        self.closed_canceled_id = create_task("Banner for the landing page", "canceled", True, self.closed_time)
+        self.open_id = create_task("Push notifications", "new", False, None)
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+        self.apps = executor.loader.project_state(self.migrate_to).apps
+
+    def tearDown(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_canceled_tasks_become_cancelled_with_closed_time(self):
+        Task = self.apps.get_model("task_manager", "Task")
+
+        canceled = Task.objects.get(id=self.canceled_id)
+        self.assertEqual(canceled.status, "cancelled")
+        self.assertEqual(canceled.closed_time, self.deadline)
+
+        closed_canceled = Task.objects.get(id=self.closed_canceled_id)
+        self.assertEqual(closed_canceled.status, "cancelled")
+        self.assertEqual(closed_canceled.closed_time, self.closed_time)
+
+        open_task = Task.objects.get(id=self.open_id)
+        self.assertEqual(open_task.status, "new")
+        self.assertIsNone(open_task.closed_time)
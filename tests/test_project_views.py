@@ -1,8 +1,16 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 
-from task_manager.models import Project
+from task_manager import project_stats
+from task_manager.models import Project, ProjectProgress, Task, TaskType
 
 PROJECT_LIST_VIEW = "/projects/"
 PROJECT_CREATE_VIEW = "/projects/create/"
@@ -165,3 +173,264 @@ class PrivateProjectTests(TestCase):
             list(response.context["project_list"]),
             list(expected_queryset)
         )
+
+
+class ProjectListPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        for number in range(25):
+            project = Project.objects.create(name=f"Project #{number % 12}", author=user)
+            project.assignees.add(user)
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.get(username="john.doe")
+        self.client.force_login(self.user)
+
+    def test_projects_are_paginated_by_name_and_id(self):
+        projects = []
+        response = self.client.get(PROJECT_LIST_VIEW)
+        projects += response.context["project_list"]
+        while response.context["page_obj"].has_next():
+            response = self.client.get(f"{PROJECT_LIST_VIEW}?cursor={response.context['page_obj'].next_cursor}")
+            projects += response.context["project_list"]
+
+        self.assertEqual(projects, list(Project.objects.filter(assignees=self.user).order_by("name", "id")))
+
+
+class ProjectProgressTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.responsible = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.lawyer = get_user_model().objects.create_user(
+            username="erika.rogers",
+            first_name="Erika",
+            last_name="Rogers",
+            password="vkrCHt7eTUMxh7"
+        )
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.author)
+        cls.project.assignees.add(cls.author, cls.responsible, cls.lawyer)
+        cls.task_type = TaskType.objects.create(name="Marketing")
+
+    def setUp(self) -> None:
+        self.client.force_login(self.author)
+
+    def create_task(self, name, followers=()):
+        self.client.post(
+            reverse("task_manager:task-create", args=[self.project.id]),
+            {
+                "name": name,
+                "description": "Description",
+                "task_type": self.task_type.id,
+                "responsible": self.responsible.id,
+                "deadline_0": "2023-12-15",
+                "deadline_1": "14:00",
+                "followers": [follower.id for follower in followers],
+            }
+        )
+        return Task.objects.get(name=name)
+
+    def get_listed_project(self):
+        response = self.client.get(PROJECT_LIST_VIEW)
+        return response.context["project_list"][0]
+
+    def test_counters_follow_task_creation_and_status_changes(self):
+        task = self.create_task("Write texts")
+        self.create_task("Review texts")
+        self.client.post(reverse("task_manager:task-status-toggle", args=[task.id, "completed"]))
+
+        project = self.get_listed_project()
+
+        self.assertEqual(project.num_tasks, 2)
+        self.assertEqual(project.num_completed_tasks, 1)
+        self.assertEqual(project.progress, 50)
+
+    def test_counters_follow_follower_changes(self):
+        task = self.create_task("Write texts", followers=[self.lawyer])
+        self.client.post(
+            reverse("task_manager:task-update", args=[task.id]),
+            {
+                "name": task.name,
+                "description": task.description,
+                "task_type": self.task_type.id,
+                "responsible": self.responsible.id,
+                "deadline_0": "2023-12-15",
+                "deadline_1": "14:00",
+                "followers": [],
+            }
+        )
+
+        lawyer_progress = ProjectProgress.objects.get(project=self.project, worker=self.lawyer)
+        responsible_progress = ProjectProgress.objects.get(project=self.project, worker=self.responsible)
+        self.assertEqual(lawyer_progress.num_tasks, 0)
+        self.assertEqual(responsible_progress.num_tasks, 1)
+        self.assertEqual(self.get_listed_project().num_tasks, 1)
+
+    def test_rebuild_repairs_drifted_counters(self):
+        self.create_task("Write texts")
+        ProjectProgress.objects.update(num_tasks=10, num_completed_tasks=7)
+
+        call_command("rebuild_project_progress", stdout=StringIO())
+
+        project = self.get_listed_project()
+        self.assertEqual(project.num_tasks, 1)
+        self.assertEqual(project.num_completed_tasks, 0)
+
+
+class ProjectStatsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.responsible = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.author)
+        cls.project.assignees.add(cls.author, cls.responsible)
+        marketing = TaskType.objects.create(name="Marketing")
+        bug_fix = TaskType.objects.create(name="Bug fix")
+        now = timezone.now()
+        for name, status, task_type, responsible, deadline in [
+            ("Write texts", "new", marketing, cls.responsible, now - datetime.timedelta(days=1)),
+            ("Review texts", "review", marketing, cls.author, now + datetime.timedelta(days=1)),
+            ("Fix login", "completed", bug_fix, cls.responsible, now - datetime.timedelta(days=2)),
+        ]:
+            Task.objects.create(
+                name=name,
+                project=cls.project,
+                status=status,
+                is_completed=status == "completed",
+                deadline=deadline,
+                description="",
+                author=cls.author,
+                responsible=responsible,
+                task_type=task_type
+            )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.author)
+
+    def test_stats_are_counted_in_one_query(self):
+        with self.assertNumQueries(1):
+            stats = project_stats.get_project_stats(self.project.id)
+
+        self.assertEqual(stats["total"], 3)
+        self.assertEqual(stats["overdue"], 1)
+        self.assertEqual(
+            {status["status"]: status["count"] for status in stats["by_status"]},
+            {"new": 1, "progress": 0, "blocked": 0, "review": 1, "completed": 1, "cancelled": 0}
+        )
+        self.assertEqual(
+            [(task_type["name"], task_type["count"]) for task_type in stats["by_task_type"]],
+            [("Marketing", 2), ("Bug fix", 1)]
+        )
+        self.assertEqual(
+            [(responsible["name"], responsible["count"], responsible["overdue"])
+             for responsible in stats["by_responsible"]],
+            [("Jack Rogers", 2, 1), ("John Doe", 1, 0)]
+        )
+
+    def test_stats_are_cached_until_a_task_changes(self):
+        self.client.get(reverse("task_manager:project-detail", args=[self.project.id]))
+        with self.assertNumQueries(0):
+            project_stats.get_project_stats(self.project.id)
+
+        task = Task.objects.get(name="Write texts")
+        self.client.post(reverse("task_manager:task-status-toggle", args=[task.id, "completed"]))
+
+        response = self.client.get(reverse("task_manager:project-detail", args=[self.project.id]))
+        self.assertEqual(response.context["stats"]["overdue"], 0)
+
+    def test_cached_stats_expire_when_a_deadline_passes(self):
+        project_stats.get_project_stats(self.project.id)
+
+        with mock.patch("django.utils.timezone.now", return_value=timezone.now() + datetime.timedelta(days=2)):
+            stats = project_stats.get_project_stats(self.project.id)
+
+        self.assertEqual(stats["overdue"], 2)
+
+
+class ProjectFragmentsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.user)
+        workers = get_user_model().objects.bulk_create([
+            get_user_model()(username=f"worker{number}", first_name="Jack", last_name=f"Rogers {number:02}")
+            for number in range(25)
+        ])
+        cls.project.assignees.add(cls.user, *workers)
+        task_type = TaskType.objects.create(name="Marketing")
+        for number in range(25):
+            task = Task.objects.create(
+                name=f"Task #{number}",
+                project=cls.project,
+                deadline=timezone.now() + datetime.timedelta(days=number % 5),
+                description="",
+                author=cls.user,
+                responsible=cls.user,
+                task_type=task_type
+            )
+            task.followers.add(cls.user)
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def get_all_pages(self, route, context_name):
+        objects = []
+        response = self.client.get(reverse(route, args=[self.project.id]))
+        objects += response.context[context_name]
+        while response.context["page_obj"].has_next():
+            cursor = response.context["page_obj"].next_cursor
+            response = self.client.get(reverse(route, args=[self.project.id]), {"cursor": cursor})
+            objects += response.context[context_name]
+        return objects
+
+    def test_detail_page_shows_participant_count_and_loads_lists_on_demand(self):
+        response = self.client.get(reverse("task_manager:project-detail", args=[self.project.id]))
+
+        self.assertContains(response, "Participants (26)")
+        self.assertContains(response, reverse("task_manager:project-participants", args=[self.project.id]))
+        self.assertNotContains(response, "Rogers 00")
+
+    def test_participants_are_paginated(self):
+        participants = self.get_all_pages("task_manager:project-participants", "worker_list")
+
+        self.assertEqual(
+            participants,
+            list(get_user_model().objects.filter(all_projects=self.project).order_by("first_name", "last_name", "id"))
+        )
+
+    def test_followed_tasks_are_paginated(self):
+        tasks = self.get_all_pages("task_manager:project-tasks", "task_list")
+
+        self.assertEqual(tasks, list(Task.objects.filter(project=self.project).order_by("deadline", "id")))
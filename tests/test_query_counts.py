@@ -0,0 +1,142 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import progress
+from task_manager.budgets import QUERY_BUDGETS
+from task_manager.instrumentation import format_grouped_queries
+from task_manager.management.commands.benchmark_views import SKIPPED_ROUTES, Command as BenchmarkViewsCommand
+from task_manager.models import Position, Project, Task, TaskType
+from task_manager.urls import app_name, urlpatterns
+
+SIZES = (1, 10, 1000)
+
+
+class QueryCountTest(TestCase):
+    """
+    Request every route with 1, 10 and 1000 related rows of each kind and check that
+    the number of queries stays within the budget of the route and doesn't grow with the data.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.project = Project.objects.create(name="Mate Academy - Android App", author=cls.user)
+        cls.project.assignees.add(cls.user)
+        cls.password = make_password("xgE7YjV4DBzrRH")
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+        self.workers = []
+        self.first_task = None
+
+    def seed(self, size):
+        """Grow every relation the views render to `size` rows."""
+        number = size - len(self.workers)
+        offset = len(self.workers)
+        positions = Position.objects.bulk_create([Position(name=f"Position {offset + i}") for i in range(number)])
+        task_types = TaskType.objects.bulk_create([TaskType(name=f"Task type {offset + i}") for i in range(number)])
+        workers = get_user_model().objects.bulk_create([
+            get_user_model()(
+                username=f"worker{offset + i}",
+                first_name="Jack",
+                last_name=f"Rogers {offset + i}",
+                password=self.password,
+                position=positions[i]
+            )
+            for i in range(number)
+        ])
+        self.workers += workers
+        projects = Project.objects.bulk_create(
+            [Project(name=f"Project {offset + i}", author=self.user) for i in range(number)]
+        )
+        Project.assignees.through.objects.bulk_create(
+            [Project.assignees.through(project_id=project.id, worker_id=self.user.id) for project in projects]
+            + [Project.assignees.through(project_id=self.project.id, worker_id=worker.id) for worker in workers]
+        )
+
+        # Tasks alternate between the user and the first worker as author and responsible,
+        # so the worker page lists them too.
+        main_worker = self.workers[0]
+        tasks = []
+        for i in range(number):
+            author, responsible = [
+                (self.user, main_worker), (main_worker, self.user), (self.user, workers[i])
+            ][(offset + i) % 3]
+            tasks.append(Task(
+                name=f"Task {offset + i}",
+                project=self.project,
+                deadline=timezone.now(),
+                description="Description",
+                author=author,
+                responsible=responsible,
+                task_type=task_types[i]
+            ))
+        Task.objects.bulk_create(tasks)
+        self.first_task = self.first_task or tasks[0]
+        followers = {
+            (task.id, worker_id)
+            for task in tasks
+            for worker_id in (task.author_id, task.responsible_id, self.user.id)
+        }
+        followers |= {(self.first_task.id, worker.id) for worker in workers}
+        Task.followers.through.objects.bulk_create(
+            [Task.followers.through(task_id=task_id, worker_id=worker_id) for task_id, worker_id in followers],
+            ignore_conflicts=True
+        )
+        progress.rebuild([self.project.id])
+
+    def get_urls(self):
+        route_kwargs = BenchmarkViewsCommand.get_route_kwargs(self.user)
+        urls = {}
+        for pattern in urlpatterns:
+            if pattern.name in SKIPPED_ROUTES:
+                continue
+            kwargs = {kwarg: route_kwargs[pattern.name][kwarg] for kwarg in pattern.pattern.converters}
+            urls[f"{app_name}:{pattern.name}"] = reverse(f"{app_name}:{pattern.name}", kwargs=kwargs or None)
+        return urls
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        return [query["sql"] for query in queries.captured_queries]
+
+    def test_every_route_has_a_budget(self):
+        self.seed(1)
+        self.assertEqual(set(self.get_urls()) - set(QUERY_BUDGETS), set())
+
+    def test_query_count_does_not_grow_with_rows(self):
+        counts = {}
+        for size in SIZES:
+            self.seed(size)
+            for name, url in self.get_urls().items():
+                statements = self.count_queries(url)
+                counts.setdefault(name, {})[size] = len(statements)
+                with self.subTest(route=name, size=size):
+                    self.assertLessEqual(
+                        len(statements),
+                        QUERY_BUDGETS[name],
+                        f"{name} with {size} rows ran {len(statements)} queries:\n"
+                        f"{format_grouped_queries(statements)}"
+                    )
+                    if size != SIZES[0]:
+                        self.assertEqual(
+                            len(statements),
+                            counts[name][SIZES[0]],
+                            f"{name} ran {counts[name]} queries for {SIZES} rows, with {size} rows:\n"
+                            f"{format_grouped_queries(statements)}"
+                        )
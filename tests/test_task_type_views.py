@@ -92,3 +92,10 @@ class PrivateTaskTypeTests(TestCase):
             reverse("task_manager:task-type-delete", args=[1])
         )
         self.assertEqual(response.status_code, 200)
+
+    def test_default_task_type_can_not_be_deleted(self):
+        response = self.client.get(TASK_TYPE_LIST_VIEW)
+        self.assertEqual(
+            {task_type.id: task_type.can_be_deleted for task_type in response.context["tasktype_list"]},
+            {1: False, 2: True}
+        )
@@ -1,8 +1,14 @@
+import csv
+import datetime
+import json
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 
 from task_manager.models import Task, Project, TaskType, Position
+from task_manager.views import TaskUpdateView
 
 TASK_LIST_VIEW = "/tasks/"
 TASK_CREATE_VIEW = "/projects/1/new_task/"
@@ -180,6 +186,28 @@ class PrivateTaskTests(TestCase):
         response = self.client.get(reverse("task_manager:task-update", args=[1]))
         self.assertEqual(response.status_code, 200)
 
+    # Test if updating a task keeps a status changed since the task was loaded
+    def test_task_update_keeps_concurrent_status_change(self):
+        task = Task.objects.get(id=1)
+        task.project.assignees.add(task.author, task.responsible)
+        Task.objects.filter(id=task.id).update(status="completed", is_completed=True)
+
+        with mock.patch.object(TaskUpdateView, "get_object", return_value=task):
+            response = self.client.post(TASK_UPDATE_VIEW, {
+                "name": "Info for 'Prices' page",
+                "description": "Explain the new laws in simple words.",
+                "task_type": task.task_type_id,
+                "responsible": task.responsible_id,
+                "deadline_0": "2023-11-15",
+                "deadline_1": "10:00",
+            })
+
+        self.assertRedirects(response, TASK_DETAIL_VIEW)
+        task = Task.objects.get(id=1)
+        self.assertEqual(task.description, "Explain the new laws in simple words.")
+        self.assertEqual(task.status, "completed")
+        self.assertTrue(task.is_completed)
+
     # Test if user can see only the tasks he is assigned to
     def test_retrieve_task_list_if_user_is_assigned_to_task(self):
         response = self.client.get(TASK_LIST_VIEW)
@@ -246,3 +274,197 @@ class PrivateTaskTests(TestCase):
             list(response.context["task_list"]),
             list(expected_queryset)
         )
+
+
+class TaskListPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        project_manager = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        project = Project.objects.create(
+            name="Mate Academy - Android App",
+            author=project_manager
+        )
+        task_type = TaskType.objects.create(name="Marketing")
+        for number in range(40):
+            task = Task.objects.create(
+                name=f"Task #{number}",
+                project=project,
+                deadline=f"2023-12-{number // 3 + 1:02d} 10:00:00",
+                description="",
+                author=project_manager,
+                responsible=project_manager,
+                task_type=task_type,
+                is_completed=number % 4 == 0
+            )
+            task.followers.add(project_manager)
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.get(username="john.doe")
+        self.client.force_login(self.user)
+
+    def walk_pages(self, query=""):
+        pages = []
+        response = self.client.get(f"{TASK_LIST_VIEW}?{query}")
+        pages.append(list(response.context["task_list"]))
+        while response.context["page_obj"].has_next():
+            cursor = response.context["page_obj"].next_cursor
+            response = self.client.get(f"{TASK_LIST_VIEW}?{query}&cursor={cursor}")
+            pages.append(list(response.context["task_list"]))
+        return pages, response
+
+    def test_pages_cover_the_list_in_order_without_duplicates(self):
+        pages, _ = self.walk_pages()
+
+        self.assertEqual([len(page) for page in pages], [15, 15, 10])
+        self.assertEqual(
+            [task for page in pages for task in page],
+            list(Task.objects.filter(followers=self.user).order_by("deadline", "id"))
+        )
+
+    def test_previous_cursor_returns_the_previous_page(self):
+        pages, response = self.walk_pages()
+        cursor = response.context["page_obj"].previous_cursor
+
+        response = self.client.get(f"{TASK_LIST_VIEW}?cursor={cursor}")
+
+        self.assertEqual(list(response.context["task_list"]), pages[1])
+
+    def test_pagination_keeps_filters(self):
+        pages, _ = self.walk_pages("is_completed=False")
+
+        self.assertEqual(
+            [task for page in pages for task in page],
+            list(Task.objects.filter(followers=self.user, is_completed=False).order_by("deadline", "id"))
+        )
+
+    def test_cursor_keeps_microseconds_of_datetime_keys(self):
+        # All deadlines fall within the same millisecond.
+        for number, task in enumerate(Task.objects.order_by("id")):
+            Task.objects.filter(id=task.id).update(
+                deadline=datetime.datetime(2023, 12, 1, 10, 0, 0, 40 - number, tzinfo=datetime.timezone.utc)
+            )
+
+        response = self.client.get(TASK_LIST_VIEW)
+        first_page = list(response.context["task_list"])
+        response = self.client.get(f"{TASK_LIST_VIEW}?cursor={response.context['page_obj'].next_cursor}")
+
+        self.assertEqual(
+            first_page + list(response.context["task_list"]),
+            list(Task.objects.filter(followers=self.user).order_by("deadline", "id")[:30])
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(f"{TASK_LIST_VIEW}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskFollowerListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        project = Project.objects.create(name="Mate Academy - Android App", author=cls.user)
+        cls.task = Task.objects.create(
+            name="Write texts",
+            project=project,
+            deadline="2023-12-15 10:00:00",
+            description="",
+            author=cls.user,
+            responsible=cls.user,
+            task_type=TaskType.objects.create(name="Marketing")
+        )
+        workers = get_user_model().objects.bulk_create([
+            get_user_model()(username=f"worker{number}", first_name="Jack", last_name=f"Rogers {number:02}")
+            for number in range(24)
+        ])
+        cls.task.followers.add(cls.user, *workers)
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def test_detail_page_shows_follower_count(self):
+        response = self.client.get(reverse("task_manager:task-detail", args=[self.task.id]))
+
+        self.assertContains(response, "Followers (25)")
+        self.assertNotContains(response, "Rogers 00")
+
+    def test_followers_are_paginated(self):
+        url = reverse("task_manager:task-followers", args=[self.task.id])
+        response = self.client.get(url)
+        followers = list(response.context["worker_list"])
+
+        response = self.client.get(url, {"cursor": response.context["page_obj"].next_cursor})
+        followers += response.context["worker_list"]
+
+        self.assertContains(response, "(<u>Responsible</u>)")
+
+        self.assertFalse(response.context["page_obj"].has_next())
+        self.assertEqual(followers, list(self.task.followers.order_by("first_name", "last_name", "id")))
+
+
+class TaskExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        project_manager = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        project = Project.objects.create(
+            name="Mate Academy - Android App",
+            author=project_manager
+        )
+        task_type = TaskType.objects.create(name="Marketing")
+        for number in range(5):
+            task = Task.objects.create(
+                name=f"Task #{number}",
+                project=project,
+                deadline=f"2023-12-{number + 1:02d} 10:00:00+00:00",
+                description="",
+                author=project_manager,
+                responsible=project_manager,
+                task_type=task_type,
+                is_completed=number < 2
+            )
+            task.followers.add(project_manager)
+        Task.objects.create(
+            name="Not followed task",
+            project=project,
+            deadline="2023-12-01 10:00:00+00:00",
+            description="",
+            author=project_manager,
+            responsible=project_manager,
+            task_type=task_type
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(get_user_model().objects.get(username="john.doe"))
+
+    def test_export_csv_streams_followed_tasks(self):
+        response = self.client.get(reverse("task_manager:task-export", args=["csv"]))
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(rows[0][:2], ["id", "name"])
+        self.assertEqual([row[1] for row in rows[1:]], [f"Task #{number}" for number in range(5)])
+
+    def test_export_jsonl_honors_filters(self):
+        response = self.client.get(reverse("task_manager:task-export", args=["jsonl"]) + "?is_completed=False")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        self.assertEqual([row["name"] for row in rows], ["Task #2", "Task #3", "Task #4"])
+        self.assertFalse(any(row["is_completed"] for row in rows))
+
+    def test_export_unknown_format_returns_404(self):
+        response = self.client.get(reverse("task_manager:task-export", args=["xlsx"]))
+        self.assertEqual(response.status_code, 404)
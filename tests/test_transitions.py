@@ -0,0 +1,134 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import progress, transitions
+from task_manager.models import Project, ProjectProgress, Task, TaskType
+
+
+API_HEADERS = {"HTTP_ACCEPT": "application/json"}
+
+
+def status_toggle_url(task, status):
+    return reverse("task_manager:task-status-toggle", args=[task.id, status])
+
+
+class TaskTransitionsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.responsible = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.follower = get_user_model().objects.create_user(
+            username="erika.rogers",
+            first_name="Erika",
+            last_name="Rogers",
+            password="vkrCHt7eTUMxh7"
+        )
+        cls.project = Project.objects.create(name="Mate Academy - Android app", author=cls.author)
+        cls.task = Task.objects.create(
+            name="Write texts",
+            project=cls.project,
+            deadline=timezone.now(),
+            description="",
+            author=cls.author,
+            responsible=cls.responsible,
+            task_type=TaskType.objects.create(name="Marketing")
+        )
+        cls.task.followers.add(cls.author, cls.responsible, cls.follower)
+        progress.rebuild()
+
+    def get_task(self):
+        return Task.objects.get(id=self.task.id)
+
+    def get_completed_counts(self):
+        return sorted(ProjectProgress.objects.values_list("num_completed_tasks", flat=True))
+
+    def test_transitions_cover_task_statuses(self):
+        statuses = {status for status, _ in Task.TASK_STATUS_CHOICES}
+
+        self.assertEqual(set(transitions.OPEN_STATUSES + transitions.CLOSED_STATUSES), statuses)
+        for transition in transitions.TRANSITIONS:
+            self.assertLessEqual(set(transition.sources) | {transition.target}, statuses)
+
+    def test_responsible_completes_task(self):
+        self.client.force_login(self.responsible)
+        response = self.client.post(status_toggle_url(self.task, "completed"))
+
+        self.assertRedirects(response, reverse("task_manager:task-detail", args=[self.task.id]))
+        task = self.get_task()
+        self.assertEqual(task.status, "completed")
+        self.assertTrue(task.is_completed)
+        self.assertEqual(self.get_completed_counts(), [1, 1, 1])
+
+    def test_repeated_transition_is_rejected(self):
+        self.client.force_login(self.responsible)
+        self.client.post(status_toggle_url(self.task, "completed"))
+        response = self.client.post(status_toggle_url(self.task, "completed"), **API_HEADERS)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.get_completed_counts(), [1, 1, 1])
+
+    def test_rejected_transition_sends_browser_back_with_error(self):
+        self.client.force_login(self.follower)
+        response = self.client.post(status_toggle_url(self.task, "completed"), follow=True)
+
+        self.assertRedirects(response, reverse("task_manager:task-detail", args=[self.task.id]))
+        self.assertContains(response, "The task status can&#x27;t be changed")
+
+    def test_only_author_cancels_task(self):
+        self.client.force_login(self.responsible)
+        self.assertEqual(self.client.post(status_toggle_url(self.task, "cancelled"), **API_HEADERS).status_code, 409)
+        self.assertEqual(self.get_task().status, "new")
+
+        self.client.force_login(self.author)
+        self.client.post(status_toggle_url(self.task, "cancelled"))
+        self.assertEqual(self.get_task().status, "cancelled")
+
+    def test_follower_cannot_change_status(self):
+        self.client.force_login(self.follower)
+        response = self.client.post(self.task.get_absolute_url(), {"status": "review"}, **API_HEADERS)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.get_task().status, "new")
+
+    def test_reactivation(self):
+        Task.objects.filter(id=self.task.id).update(status="cancelled", is_completed=True)
+        self.client.force_login(self.responsible)
+        self.assertEqual(self.client.post(status_toggle_url(self.task, "progress"), **API_HEADERS).status_code, 409)
+
+        self.client.force_login(self.author)
+        self.assertEqual(self.client.get(self.task.get_absolute_url()).context["reactivation_status"], "new")
+        self.client.post(status_toggle_url(self.task, "new"))
+
+        task = self.get_task()
+        self.assertEqual(task.status, "new")
+        self.assertFalse(task.is_completed)
+
+    def test_status_toggle_requires_post(self):
+        self.client.force_login(self.author)
+
+        self.assertEqual(self.client.get(status_toggle_url(self.task, "completed")).status_code, 405)
+        self.assertEqual(self.client.post(status_toggle_url(self.task, "canceled")).status_code, 404)
+        self.assertEqual(self.get_task().status, "new")
+
+    def test_transition_is_one_conditional_update(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(transitions.apply(Task.objects.filter(id=self.task.id), "archived", self.author), 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(transitions.apply(Task.objects.filter(id=self.task.id), "blocked", self.follower), 0)
+        statements = [query["sql"].split()[0] for query in queries]
+        self.assertEqual([statement for statement in statements if statement in ("SELECT", "UPDATE")], ["UPDATE"])
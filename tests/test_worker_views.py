@@ -1,6 +1,14 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.db import DatabaseError
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import deactivation, progress
+from task_manager.deletion import can_be_deleted
+from task_manager.models import Project, ProjectProgress, Task, TaskType
 
 WORKER_LIST_VIEW = "/workers/"
 WORKER_CREATE_VIEW = "/workers/create/"
@@ -121,11 +129,161 @@ class PrivateWorkerTests(TestCase):
         self.assertEqual(response.status_code, 200)
 
     def test_toggle_is_active(self):
-        # Test deactivating user profile
+        # Test deactivating user profile, which is done on the deactivation page
+        self.assertEqual(self.client.get(WORKER_TOGGLE_IS_ACTIVE_VIEW).status_code, 405)
+        response = self.client.post(WORKER_TOGGLE_IS_ACTIVE_VIEW)
+        self.assertRedirects(response, reverse("task_manager:worker-deactivate", args=[1]))
         self.assertTrue(get_user_model().objects.get(id=1).is_active)
-        self.client.get(WORKER_TOGGLE_IS_ACTIVE_VIEW)
+        self.client.post(reverse("task_manager:worker-deactivate", args=[1]))
         self.assertFalse(get_user_model().objects.get(id=1).is_active)
 
         # Test re-activating user profile
-        self.client.get(WORKER_TOGGLE_IS_ACTIVE_VIEW)
+        self.client.post(WORKER_TOGGLE_IS_ACTIVE_VIEW)
         self.assertTrue(get_user_model().objects.get(id=1).is_active)
+
+
+class WorkerDeletionEligibilityTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.newcomer = get_user_model().objects.create_user(
+            username="jane.smith",
+            first_name="Jane",
+            last_name="Smith",
+            password="WP9ctvh5yCtwgH"
+        )
+        Project.objects.create(name="Mate Academy - Android App", author=cls.author)
+
+    def setUp(self) -> None:
+        self.client.force_login(self.newcomer)
+
+    def test_author_of_a_project_can_not_be_deleted(self):
+        response = self.client.get(reverse("task_manager:worker-detail", args=[self.author.id]))
+        self.assertFalse(response.context["can_be_deleted"])
+        self.assertFalse(can_be_deleted(self.author))
+
+    def test_worker_without_references_can_be_deleted(self):
+        response = self.client.get(reverse("task_manager:worker-detail", args=[self.newcomer.id]))
+        self.assertTrue(response.context["can_be_deleted"])
+        self.assertTrue(can_be_deleted(self.newcomer))
+
+    def test_worker_list_checks_all_workers_in_the_list_query(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("task_manager:worker-list"))
+        self.assertEqual(
+            {worker.username: worker.can_be_deleted for worker in response.context["worker_list"]},
+            {"john.doe": False, "jane.smith": True}
+        )
+
+
+class WorkerDeactivationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = get_user_model().objects.create_user(
+            username="john.doe",
+            first_name="John",
+            last_name="Doe",
+            password="C3MhYzYotrurMi"
+        )
+        cls.worker = get_user_model().objects.create_user(
+            username="jack.rogers",
+            first_name="Jack",
+            last_name="Rogers",
+            password="xgE7YjV4DBzrRH"
+        )
+        cls.replacement = get_user_model().objects.create_user(
+            username="erika.rogers",
+            first_name="Erika",
+            last_name="Rogers",
+            password="vkrCHt7eTUMxh7"
+        )
+        task_type = TaskType.objects.create(name="Marketing")
+        cls.project = Project.objects.create(name="Mate Academy - Android App", author=cls.manager)
+        cls.project.assignees.add(cls.manager, cls.worker)
+        cls.own_project = Project.objects.create(name="Mate Academy - Website", author=cls.worker)
+        cls.own_project.assignees.add(cls.worker)
+
+        def create_task(name, project, author, is_completed=False):
+            task = Task.objects.create(
+                name=name,
+                project=project,
+                deadline=timezone.now(),
+                description="",
+                author=author,
+                responsible=cls.worker,
+                task_type=task_type,
+                is_completed=is_completed
+            )
+            task.followers.add(author, cls.worker)
+            return task
+
+        cls.open_tasks = [create_task(f"Task #{number}", cls.project, cls.manager) for number in range(5)]
+        cls.completed_task = create_task("Completed task", cls.project, cls.manager, is_completed=True)
+        cls.own_task = create_task("Own task", cls.own_project, cls.worker)
+        progress.rebuild()
+
+    def setUp(self) -> None:
+        self.client.force_login(self.manager)
+
+    def test_open_tasks_go_to_the_project_authors(self):
+        result = deactivation.deactivate(self.worker, chunk_size=2)
+
+        self.assertEqual(result, deactivation.DeactivationResult(reassigned=5, unfollowed=5, unassigned=1))
+        self.assertFalse(get_user_model().objects.get(id=self.worker.id).is_active)
+        self.assertEqual(list(self.manager.tasks_to_do.order_by("id")), self.open_tasks)
+        self.assertEqual(
+            set(self.worker.followed_tasks.all()),
+            {self.completed_task, self.own_task}
+        )
+        self.assertEqual(list(self.worker.all_projects.all()), [self.own_project])
+        self.assertEqual(
+            ProjectProgress.objects.get(project=self.project, worker=self.worker).num_tasks, 1
+        )
+
+    def test_deactivation_page_hands_tasks_over_to_the_replacement(self):
+        url = reverse("task_manager:worker-deactivate", args=[self.worker.id])
+        self.assertEqual(self.client.get(url).context["num_open_tasks"], 6)
+
+        response = self.client.post(url, {"replacement": self.replacement.id})
+
+        self.assertRedirects(response, reverse("task_manager:worker-detail", args=[self.worker.id]))
+        self.assertEqual(
+            set(self.replacement.tasks_to_do.all()), set(self.open_tasks) | {self.own_task}
+        )
+        self.assertEqual(set(self.replacement.all_projects.all()), {self.project, self.own_project})
+        self.assertEqual(
+            ProjectProgress.objects.get(project=self.project, worker=self.replacement).num_tasks, 5
+        )
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_interrupted_deactivation_is_finished_by_running_it_again(self):
+        with mock.patch("task_manager.deactivation.leave_projects", side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                deactivation.deactivate(self.worker, chunk_size=2)
+
+        self.assertTrue(get_user_model().objects.get(id=self.worker.id).is_active)
+        self.assertEqual(list(self.worker.all_projects.order_by("id")), [self.project, self.own_project])
+        url = reverse("task_manager:worker-deactivate", args=[self.worker.id])
+        self.assertEqual(self.client.get(url).context["num_open_tasks"], 1)
+
+        result = deactivation.deactivate(self.worker, chunk_size=2)
+
+        self.assertEqual(result, deactivation.DeactivationResult(reassigned=0, unfollowed=0, unassigned=1))
+        self.assertFalse(get_user_model().objects.get(id=self.worker.id).is_active)
+        self.assertEqual(list(self.manager.tasks_to_do.order_by("id")), self.open_tasks)
+        self.assertEqual(list(self.worker.all_projects.all()), [self.own_project])
+
+    def test_worker_can_not_replace_themselves(self):
+        response = self.client.post(
+            reverse("task_manager:worker-deactivate", args=[self.worker.id]),
+            {"replacement": self.worker.id}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("replacement", response.context["form"].errors)
+        self.assertTrue(get_user_model().objects.get(id=self.worker.id).is_active)